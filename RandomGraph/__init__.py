@@ -4,3 +4,9 @@ from .undirectional_graph import UndirectionalGraph
 from .dense_graph import DenseGraph
 from .algorithms import make_dfs_tree, make_dfs_trees, find_articulation_points
 from .ifaces import IGraph, ProcessEdge, ProcessVertex, IUndirectionalGraph, EdgeType, IDirectionalGraph
+from .csr_graph import CSRGraph, ImmutableGraphError
+from .biconnected import BiconnectedComponents
+from .condensation import Condensation
+from .storage import load_graph
+from .bfs import BreadthFirstSearch
+from .matching import Matching
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import io
+from typing import Optional
+
 import graphviz
 import numpy as np
 from overrides import overrides
 
+from .condensation import Condensation
 from .directional_graph import DirectionalGraph
+from .dot_writer import NodeLabel
+from .loaders import IntTokenReader, Source
+from .sampling import Seed, make_rng
+from .storage import save_graph, read_graph
 
 
 class AgenciGraph(DirectionalGraph):
@@ -12,43 +20,44 @@ class AgenciGraph(DirectionalGraph):
 
     @staticmethod
     def CreateFromString(s: str, shift_by_one: bool = True) -> AgenciGraph:
-        lines = s.splitlines()
-        n_nodes = int(lines[0])
-        n_agents = int(lines[1])
-
-        agents = {}
-
-        for i in range(n_agents):
-            agent, cost = map(int, lines[i + 2].split())
-            agents[agent] = cost
+        return AgenciGraph.CreateFromFile(io.BytesIO(s.encode()), shift_by_one=shift_by_one)
 
+    @staticmethod
+    def CreateFromFile(source: Source, shift_by_one: bool = True) -> AgenciGraph:
+        """
+        Reads the format of __str__ from a path or a binary file object in chunks, without holding the whole file
+        in memory.
+        :param shift_by_one: if True, the file numbers the nodes from 1 and they are renumbered from 0.
+        """
+        shift = 1 if shift_by_one else 0
         ans = AgenciGraph()
+        with IntTokenReader(source) as reader:
+            ans.add_nodes(range(reader.read_int()))  # nodes without any connection still need to be covered
+            n_agents = reader.read_int()
+            agents = reader.read(2 * n_agents).reshape(n_agents, 2)
 
-        n_connections = int(lines[n_agents + 2])
-        for i in range(n_connections):
-            i, j = map(int, lines[i + n_agents + 3].split())
-            if shift_by_one:
-                i -= 1
-                j -= 1
-            ans.push_connection(i, j)
-
-        for i, cost in agents.items():
-            if shift_by_one:
-                ans.add_agent(i - 1, cost)
-            else:
-                ans.add_agent(i, cost)
+            n_connections = reader.read_int()
+            for edges in reader.read_edges(n_connections):
+                edges = edges - shift
+                ans.push_connections(edges[:, 0], edges[:, 1])
+
+        for i, cost in zip((agents[:, 0] - shift).tolist(), agents[:, 1].tolist()):
+            ans.add_agent(i, cost)
 
         return ans
 
     @staticmethod
     def CreateRandom(N: int, link_density_factor: float = 0.5, agent_ratio: float = 0.7,
-                     agent_dist_param: float = 10):
-        random = DirectionalGraph.CreateRandom(N=N, link_density_factor=link_density_factor)
-        ans = AgenciGraph
+                     agent_dist_param: float = 10, seed: Seed = None) -> AgenciGraph:
+        rng = make_rng(seed)
+        random = DirectionalGraph.CreateRandom(N=N, link_density_factor=link_density_factor, seed=rng)
+        ans = AgenciGraph()
         ans._graph = random._graph
         ans._reverse_graph = random._reverse_graph
-        agents = {i: 5 * int(np.random.exponential(agent_dist_param)) for i in
-                  np.random.choice(N, size=int(N * agent_ratio), replace=False)}
+        ans._nodes = random._nodes
+        agents = {i: 5 * int(cost) for i, cost in
+                  zip(rng.choice(N, size=int(N * agent_ratio), replace=False).tolist(),
+                      rng.exponential(agent_dist_param, size=int(N * agent_ratio)).tolist())}
         ans.agents = agents
         return ans
 
@@ -57,10 +66,45 @@ class AgenciGraph(DirectionalGraph):
         self.agents = {}
 
     def add_agent(self, node: int, cost: int):
+        self._mutated()
         self.agents[node] = cost
         if node not in self.get_nodes():
             self.add_node(node)
 
+    def agent_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: tuple of (agent nodes, their costs) as aligned arrays.
+        """
+        return (np.fromiter(self.agents.keys(), dtype=np.int64, count=len(self.agents)),
+                np.fromiter(self.agents.values(), dtype=np.int64, count=len(self.agents)))
+
+    def solve(self) -> tuple[bool, int]:
+        """
+        Solves the "agenci" problem in O(N+M): bribing an agent reveals every node reachable from it,
+        find the cheapest set of agents that reveals all the nodes.
+
+        Every node is revealed iff every source component of the condensation contains an agent, and then
+        the optimum bribes the cheapest agent of each source component.
+        :return: tuple (True, minimum total cost) if all the nodes can be revealed,
+          otherwise (False, smallest node that no agent reaches).
+        """
+        return solve_agenci(self.condensation(), *self.agent_arrays())
+
+    def save(self, path: str):
+        """
+        Saves the graph together with the agents and their costs, see DirectionalGraph.save.
+        """
+        agents, costs = self.agent_arrays()
+        extra = {"agents": agents, "agent_costs": costs}
+        save_graph(path, type(self).__name__, self.freeze(), extra=extra)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> AgenciGraph:
+        _, csr, _, extra = read_graph(path, mmap=mmap)
+        ans = csr.thaw_into(AgenciGraph())
+        ans.agents = dict(zip(extra["agents"].tolist(), extra["agent_costs"].tolist()))
+        return ans
+
     def __str__(self):
         ans = f"{len(self._graph)}\n" \
               f"{len(self.agents)}\n"
@@ -76,22 +120,22 @@ class AgenciGraph(DirectionalGraph):
         ans += "\n".join(conn)
         return ans
 
+    def _dot_node_label(self) -> Optional[NodeLabel]:
+        return lambda node: f"{node + 1} ({self.agents[node]})" if node in self.agents else f"{node + 1}"
+
     @overrides
     def plot(self, show_stronly_connected: bool = True) -> graphviz.Digraph:
         out = graphviz.Digraph()
 
         if show_stronly_connected:
-            cg = self.strongly_connected_components()
+            scc = self.strongly_connected_component_labels()
+            component = scc.as_dict()
+            sizes = scc.sizes
         else:
-            cg = None
+            component = None
 
-        flag_cg = False
         for node in self.get_nodes():
-            flag_cg = False
-            if show_stronly_connected:
-                if node in cg.get_nodes():
-                    if len(cg.get_children(node)) > 1:
-                        flag_cg = True
+            flag_cg = show_stronly_connected and sizes[component[node]] > 1
 
             if node in self.agents:
                 if flag_cg:
@@ -106,7 +150,7 @@ class AgenciGraph(DirectionalGraph):
 
         for node in self.get_nodes():
             for child in self.get_children(node):
-                if show_stronly_connected and child in cg.get_children(node):
+                if show_stronly_connected and component[child] == component[node]:
                     if node in self.get_children(child):
                         if node < child:
                             continue
@@ -117,3 +161,31 @@ class AgenciGraph(DirectionalGraph):
                 else:
                     out.edge(str(node), str(child), arrowhead="normal", arrowtail="none")
         return out
+
+
+def solve_agenci(condensation: Condensation, agent_nodes: np.ndarray, agent_costs: np.ndarray) -> tuple[bool, int]:
+    """
+    AgenciGraph.solve on the condensation of the graph and aligned arrays of the agents and their costs.
+    """
+    components = condensation.components
+    agent_components = components.component_id[np.searchsorted(components.nodes, agent_nodes)]
+
+    cheapest = np.full(len(condensation), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(cheapest, agent_components, agent_costs)
+    sources = condensation.sources()
+    bribable = cheapest[sources] != np.iinfo(np.int64).max
+    if np.all(bribable):
+        return True, int(cheapest[sources].sum())
+
+    # Components come in topological order, so one forward sweep propagates the reachability
+    reached = np.zeros(len(condensation), dtype=bool)
+    reached[agent_components] = True
+    reached = reached.tolist()
+    indptr = condensation.dag.indptr.tolist()
+    indices = condensation.dag.indices.tolist()
+    for c in range(len(condensation)):
+        if reached[c]:
+            for child in indices[indptr[c]:indptr[c + 1]]:
+                reached[child] = True
+    reached = np.array(reached, dtype=bool)
+    return False, int(components.nodes[~reached[components.component_id]].min())
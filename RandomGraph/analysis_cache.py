@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+ANALYSES: dict[str, Callable[..., Any]] = {}  # name -> function(graph, *params)
+CSR_ANALYSES: set[str] = set()  # names of the analyses that also run on a frozen CSRGraph
+
+DEFAULT_MAX_ENTRIES = 16
+
+
+def register_analysis(name: str, csr: bool = True) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that registers a function(graph, *params) as an analysis, so graph.analysis(name, *params)
+    memoizes its result.
+    :param csr: whether the function also accepts a frozen CSRGraph, as batch.analyze_batch requires
+    """
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        if name in ANALYSES and ANALYSES[name] is not function:
+            raise ValueError(f"Analysis {name} is already registered")
+        ANALYSES[name] = function
+        if csr:
+            CSR_ANALYSES.add(name)
+        return function
+    return decorator
+
+
+class AnalysisCache:
+    """Per-graph memo of the results of the registered analyses.
+
+    Results are keyed by (analysis name, parameters, mutation version of the graph), so a result computed before
+    a mutation is never returned after it. Entries of older versions are dropped as soon as a newer one is stored
+    and at most max_entries results are kept, evicting the least recently used.
+    """
+
+    _entries: OrderedDict[tuple[str, tuple, int], Any]
+    max_entries: int
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, graph, name: str, params: tuple[Hashable, ...], version: int) -> Any:
+        """
+        :return: the result of the analysis name for the graph at the given version, computed if not cached yet.
+        """
+        key = (name, params, version)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if name not in ANALYSES:
+            raise ValueError(f"Unknown analysis {name}")
+        result = ANALYSES[name](graph, *params)
+        for stale in [k for k in self._entries if k[2] != version]:
+            del self._entries[stale]
+        self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterable, Optional, Union
+
+import numpy as np
+
+from .analysis_cache import ANALYSES, CSR_ANALYSES
+from .condensation import Condensation
+from .csr_graph import CSRGraph
+from .ifaces import IGraph
+from .storage import aligned, pack_graph_arrays, read_graph, unpack_graph_arrays
+
+BatchAnalysis = Callable[..., Any]  # function(frozen graph, extra arrays, *params)
+BATCH_ANALYSES: dict[str, BatchAnalysis] = {}
+
+Layout = dict[str, tuple[str, tuple[int, ...], int]]  # array name -> (dtype, shape, offset in the block)
+
+
+def register_batch_analysis(name: str) -> Callable[[BatchAnalysis], BatchAnalysis]:
+    """
+    Decorator that registers a function(frozen graph, extra arrays, *params) for analyze_batch. The extra arrays
+    are those the graph class saves besides the adjacency, e.g. the agents of an AgenciGraph.
+    Analyses registered with analysis_cache.register_analysis are available as well.
+    """
+    def decorator(function: BatchAnalysis) -> BatchAnalysis:
+        if name in BATCH_ANALYSES and BATCH_ANALYSES[name] is not function:
+            raise ValueError(f"Batch analysis {name} is already registered")
+        BATCH_ANALYSES[name] = function
+        return function
+    return decorator
+
+
+@register_batch_analysis("articulation_points")
+def _articulation_points(graph: CSRGraph, extra: dict[str, np.ndarray]) -> set[int]:
+    return set(graph.biconnected_components().articulation_points)
+
+
+@register_batch_analysis("agenci")
+def _agenci(graph: CSRGraph, extra: dict[str, np.ndarray]) -> tuple[bool, int]:
+    from .agenci_graph import solve_agenci
+    return solve_agenci(Condensation.CreateFromCSR(graph), extra["agents"], extra["agent_costs"])
+
+
+def _run(name: str, graph: CSRGraph, extra: dict[str, np.ndarray], params: tuple) -> Any:
+    if name in BATCH_ANALYSES:
+        return BATCH_ANALYSES[name](graph, extra, *params)
+    return graph.analysis(name, *params)
+
+
+def _graph_arrays(graph: IGraph) -> tuple[CSRGraph, dict[str, np.ndarray]]:
+    """
+    :return: tuple of (frozen adjacency, extra arrays) of a graph. The frozen adjacency is memoized by the graph,
+      so it is only built once until the graph changes.
+    """
+    from .agenci_graph import AgenciGraph
+    extra = {}
+    if isinstance(graph, AgenciGraph):
+        extra["agents"], extra["agent_costs"] = graph.agent_arrays()
+    return graph.analysis("frozen"), extra
+
+
+def _file_arrays(path: str) -> tuple[CSRGraph, dict[str, np.ndarray]]:
+    _, csr, _, extra = read_graph(path)
+    return csr, extra
+
+
+class SharedGraphs:
+    """The arrays of many frozen graphs packed into a single block of shared memory.
+
+    Worker processes attach the block by its name and view the graphs without copying them, so only
+    the small layout is ever pickled.
+    """
+
+    _memory: SharedMemory
+    layouts: list[tuple[bool, Layout]]  # (directed, layout of the arrays) of every graph
+
+    def __init__(self, graphs: Iterable[tuple[CSRGraph, dict[str, np.ndarray]]]):
+        graphs = list(graphs)
+        self.layouts = []
+        offset = 0
+        packed = []
+        for csr, extra in graphs:
+            arrays = {name: np.asarray(array) for name, array in pack_graph_arrays(csr, extra).items()}
+            layout = {}
+            for name, array in arrays.items():
+                layout[name] = (array.dtype.str, array.shape, offset)
+                offset = aligned(offset + array.nbytes)
+            self.layouts.append((csr.directed, layout))
+            packed.append(arrays)
+        self._memory = SharedMemory(create=True, size=max(offset, 1))
+        for arrays, (_, layout) in zip(packed, self.layouts):
+            for name, array in arrays.items():
+                dtype, shape, start = layout[name]
+                np.ndarray(shape, dtype=dtype, buffer=self._memory.buf, offset=start)[...] = array
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def close(self):
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def view_graph(buffer, directed: bool, layout: Layout) -> tuple[CSRGraph, dict[str, np.ndarray]]:
+    """
+    :return: tuple of (frozen graph, extra arrays) of SharedGraphs, as read-only views of the buffer.
+    """
+    arrays = {}
+    for name, (dtype, shape, offset) in layout.items():
+        array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+    return unpack_graph_arrays(arrays, directed)
+
+
+_worker: dict = {}  # state of a worker process of analyze_batch
+
+
+def _attach(name: str, layouts: list[tuple[bool, Layout]], analysis: str, params: tuple):
+    # Pool workers share the resource tracker of the parent, which unlinks the block
+    _worker.update(memory=SharedMemory(name=name), layouts=layouts, analysis=analysis, params=params)
+
+
+def _analyze(k: int) -> Any:
+    directed, layout = _worker["layouts"][k]
+    graph, extra = view_graph(_worker["memory"].buf, directed, layout)
+    return _run(_worker["analysis"], graph, extra, _worker["params"])
+
+
+def _analyze_file(path: str, analysis: str, params: tuple) -> Any:
+    graph, extra = _file_arrays(path)
+    return _run(analysis, graph, extra, params)
+
+
+def _analyze_file_star(task: tuple[str, str, tuple]) -> Any:
+    return _analyze_file(*task)
+
+
+def analyze_batch(graphs: Union[Iterable[IGraph], str, os.PathLike], analysis: str, *params,
+                  processes: Optional[int] = None, chunksize: int = 1) -> list:
+    """
+    Runs an analysis on many graphs in a pool of processes.
+
+    The workers of a corpus memory-map its files themselves, so the parent process only lists the directory.
+    Graphs in memory are frozen in this process, one after the other (a memoized graph.analysis("frozen") is
+    reused), and their arrays are copied once into shared memory, which the workers read without any copy.
+    This serial freeze is the part that does not scale with the processes, so prefer corpora for large batches.
+    :param graphs: the graphs, or the directory of a corpus written by ensemble.write_corpus
+    :param analysis: name of an analysis registered with register_batch_analysis ("articulation_points",
+      "agenci", ...) or with analysis_cache.register_analysis ("strongly_connected_components", "condensation",
+      "biconnected_components", ...). The workers only see frozen graphs, so analyses registered with csr=False
+      (e.g. "reversed_graph") raise ValueError.
+    :param params: hashable parameters of the analysis
+    :param processes: number of worker processes, os.cpu_count() by default; 0 runs in this process
+    :return: results of the analysis, in the order of the graphs.
+    """
+    if analysis not in BATCH_ANALYSES and analysis not in ANALYSES:
+        raise ValueError(f"Unknown analysis {analysis}")
+    if analysis not in BATCH_ANALYSES and analysis not in CSR_ANALYSES:
+        raise ValueError(f"Analysis {analysis} does not run on frozen graphs")
+    if isinstance(graphs, (str, os.PathLike)):
+        from .ensemble import corpus_files
+        tasks = [(path, analysis, params) for path in corpus_files(graphs)]
+        if processes == 0:
+            return [_analyze_file(*task) for task in tasks]
+        with multiprocessing.Pool(processes) as pool:
+            return pool.map(_analyze_file_star, tasks, chunksize=chunksize)
+
+    arrays = [_graph_arrays(graph) for graph in graphs]
+    if processes == 0:
+        return [_run(analysis, graph, extra, params) for graph, extra in arrays]
+
+    with SharedGraphs(arrays) as shared:
+        del arrays
+        with multiprocessing.Pool(processes, initializer=_attach,
+                                  initargs=(shared.name, shared.layouts, analysis, params)) as pool:
+            return pool.map(_analyze, range(len(shared)), chunksize=chunksize)
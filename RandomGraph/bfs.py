@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+Start = Union[int, Iterable[int]]  # a single node or many nodes
+
+
+def expand_frontier(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param frontier: positions of the nodes to expand
+    :return: tuple of (src, dst) positions of all the edges leaving the frontier, grouped by the source.
+    """
+    frontier = np.asarray(frontier, dtype=np.int64)
+    starts = indptr[frontier].astype(np.int64)
+    counts = indptr[frontier + 1].astype(np.int64) - starts
+    total = int(counts.sum())
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return np.repeat(frontier, counts), indices[offsets].astype(np.int64)
+
+
+def frontier_bfs(indptr: np.ndarray, indices: np.ndarray, sources: np.ndarray, max_depth: Optional[int] = None,
+                 targets: Optional[np.ndarray] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Level-synchronous breadth-first search on CSR arrays. Every level is expanded by a few array operations,
+    so the Python overhead is per level, not per edge.
+    :param sources: positions of the start nodes, all at distance 0
+    :param max_depth: nodes further than this are not visited
+    :param targets: optional boolean mask over the positions; the search stops after the first level that
+      reaches any of them, so all the nearest targets are found
+    :return: tuple of (distance, parent) arrays over the positions. Distance is -1 for the unreached nodes,
+      parent is -1 for them and for the sources.
+    """
+    n = len(indptr) - 1
+    distance = np.full(n, -1, dtype=np.int64)
+    parent = np.full(n, -1, dtype=np.int64)
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    distance[frontier] = 0
+    depth = 0
+    while len(frontier) > 0 and (max_depth is None or depth < max_depth):
+        if targets is not None and targets[frontier].any():
+            break
+        src, dst = expand_frontier(indptr, indices, frontier)
+        new = distance[dst] < 0
+        dst, first = np.unique(dst[new], return_index=True)
+        depth += 1
+        distance[dst] = depth
+        parent[dst] = src[new][first]
+        frontier = dst
+    return distance, parent
+
+
+class BreadthFirstSearch:
+    """Distances from the start nodes and the breadth-first search tree, aligned with the sorted node ids.
+
+    Obtain it with bfs() of any graph.
+    """
+
+    nodes: np.ndarray  # sorted node ids
+    distance: np.ndarray  # number of edges from the nearest start node, -1 if not reached
+    parent: np.ndarray  # position of the parent in the BFS tree, -1 for the start nodes and the unreached nodes
+
+    def __init__(self, nodes: np.ndarray, distance: np.ndarray, parent: np.ndarray):
+        self.nodes = nodes
+        self.distance = distance
+        self.parent = parent
+
+    @staticmethod
+    def CreateFromCSR(graph: CSRGraph, start: Start, max_depth: Optional[int] = None,
+                      targets: Iterable[int] = None, reverse: bool = False) -> BreadthFirstSearch:
+        """
+        :param start: the start node or an iterable of start nodes
+        :param reverse: if True, edges of a directed graph are followed backwards, so distance is the distance
+          to the start nodes
+        """
+        starts = [start] if isinstance(start, (int, np.integer)) else start
+        sources = np.fromiter((graph.position(i) for i in starts), dtype=np.int64)
+        mask = None
+        if targets is not None:
+            mask = np.zeros(len(graph), dtype=bool)
+            mask[np.fromiter((graph.position(i) for i in targets), dtype=np.int64)] = True
+        if reverse and graph.directed:
+            indptr, indices = graph.reverse_indptr, graph.reverse_indices
+        else:
+            indptr, indices = graph.indptr, graph.indices
+        distance, parent = frontier_bfs(indptr, indices, sources, max_depth=max_depth, targets=mask)
+        return BreadthFirstSearch(graph.nodes, distance, parent)
+
+    def _position(self, i: int) -> int:
+        k = int(np.searchsorted(self.nodes, i))
+        if k == len(self.nodes) or self.nodes[k] != i:
+            raise ValueError(f"Vertex {i} does not exist")
+        return k
+
+    def reached(self) -> np.ndarray:
+        """
+        :return: sorted ids of the reached nodes, including the start nodes.
+        """
+        return self.nodes[self.distance >= 0]
+
+    def distance_to(self, i: int) -> Optional[int]:
+        """
+        :return: number of edges on the shortest path from the start nodes to i, None if i was not reached.
+        """
+        distance = int(self.distance[self._position(i)])
+        return None if distance < 0 else distance
+
+    def path_to(self, i: int) -> list[int]:
+        """
+        :return: a shortest path from one of the start nodes to i, both inclusive; empty if i was not reached.
+        """
+        k = self._position(i)
+        if self.distance[k] < 0:
+            return []
+        path = [k]
+        while self.parent[path[-1]] >= 0:
+            path.append(int(self.parent[path[-1]]))
+        return self.nodes[path[::-1]].tolist()
+
+    def as_dict(self) -> dict[int, int]:
+        """
+        :return: dictionary from every reached node to its distance.
+        """
+        reached = self.distance >= 0
+        return dict(zip(self.nodes[reached].tolist(), self.distance[reached].tolist()))
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+def biconnected_components_arrays(indptr: np.ndarray, indices: np.ndarray, with_separated_sizes: bool = False) \
+        -> tuple[np.ndarray, np.ndarray, list[np.ndarray], Optional[dict[int, list[int]]]]:
+    """
+    Iterative Hopcroft-Tarjan low-link algorithm over a symmetric CSR adjacency. One pass, O(N+M),
+    without Python recursion. Self-loops are ignored.
+    :param indptr: CSR row pointers of the N nodes
+    :param indices: CSR column indices; every undirected edge must be stored in both directions
+    :param with_separated_sizes: if True, also returns the sizes of the parts that removing each articulation
+      point would create. They come from the DFS subtree sizes, so it costs nothing extra.
+    :return: tuple of (articulation, bridges, blocks, separated_sizes), all in positions rather than node ids:
+      articulation - sorted array of the articulation points,
+      bridges - array of shape (B, 2) with the bridges, smaller endpoint first,
+      blocks - list of arrays with the nodes of each biconnected component (isolated nodes belong to none),
+      separated_sizes - None, or a dict mapping each articulation point to the sizes of the connected parts
+      its removal leaves of its connected component: one per separated DFS child subtree, followed by
+      the remainder containing the DFS root (absent when the articulation point is the root itself).
+    """
+    n = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    discovered = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    next_child = indptr[:-1]
+    is_articulation = [False] * n
+    bridges = []
+    blocks = []
+    edge_stack = []
+    separated = {} if with_separated_sizes else None
+    time = 0
+
+    for root in range(n):
+        if discovered[root] != -1:
+            continue
+        discovered[root] = low[root] = time
+        time += 1
+        root_children = 0
+        tree_cut_candidates = []
+        stack = [root]
+        while stack:
+            v = stack[-1]
+            p = next_child[v]
+            end = indptr[v + 1]
+            while p < end:
+                w = indices[p]
+                p += 1
+                if discovered[w] == -1:
+                    next_child[v] = p
+                    parent[w] = v
+                    discovered[w] = low[w] = time
+                    time += 1
+                    edge_stack.append((v, w))
+                    stack.append(w)
+                    break
+                if w != parent[v] and discovered[w] < discovered[v]:  # back edge to an ancestor
+                    if discovered[w] < low[v]:
+                        low[v] = discovered[w]
+                    edge_stack.append((v, w))
+            else:
+                next_child[v] = p
+                stack.pop()
+                if not stack:
+                    continue
+                u = stack[-1]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+                if low[v] >= discovered[u]:
+                    # v's subtree hangs on u only: the edges pushed since (u, v) form a biconnected component
+                    block = set()
+                    while True:
+                        a, b = edge_stack.pop()
+                        block.add(a)
+                        block.add(b)
+                        if a == u and b == v:
+                            break
+                    blocks.append(np.fromiter(block, dtype=np.int64, count=len(block)))
+                    if low[v] > discovered[u]:
+                        bridges.append((min(u, v), max(u, v)))
+                    if separated is not None:
+                        # discovery times are consecutive within a subtree, so this is the size of v's subtree
+                        if u not in separated:
+                            separated[u] = []
+                            tree_cut_candidates.append(u)
+                        separated[u].append(time - discovered[v])
+                    if u == root:
+                        root_children += 1
+                    else:
+                        is_articulation[u] = True
+        if root_children > 1:
+            is_articulation[root] = True
+        if separated is not None:
+            component_size = time - discovered[root]
+            for u in tree_cut_candidates:
+                if not is_articulation[u]:
+                    del separated[u]  # the root with a single DFS child
+                    continue
+                remainder = component_size - 1 - sum(separated[u])
+                if remainder > 0:
+                    separated[u].append(remainder)
+
+    articulation = np.flatnonzero(is_articulation)
+    bridges = np.array(bridges, dtype=np.int64).reshape(-1, 2)
+    return articulation, bridges, blocks, separated
+
+
+class BiconnectedComponents:
+    """Articulation points, bridges and biconnected components (blocks) of an undirected graph, in node ids."""
+
+    articulation_points: set[int]
+    bridges: set[tuple[int, int]]  # (smaller node, larger node)
+    components: list[set[int]]  # nodes of each block; isolated nodes belong to none
+    # articulation point -> sizes of the parts of its connected component that removing it creates,
+    # see biconnected_components_arrays. None unless requested.
+    separated_sizes: Optional[dict[int, list[int]]]
+
+    def __init__(self, articulation_points: set[int], bridges: set[tuple[int, int]], components: list[set[int]],
+                 separated_sizes: Optional[dict[int, list[int]]] = None):
+        self.articulation_points = articulation_points
+        self.bridges = bridges
+        self.components = components
+        self.separated_sizes = separated_sizes
+
+    @staticmethod
+    def CreateFromCSR(nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                      with_separated_sizes: bool = False) -> BiconnectedComponents:
+        articulation, bridges, blocks, separated = biconnected_components_arrays(indptr, indices,
+                                                                                 with_separated_sizes)
+        bridges = nodes[bridges]
+        if separated is not None:
+            separated = {int(nodes[u]): sizes for u, sizes in separated.items()}
+        return BiconnectedComponents(set(nodes[articulation].tolist()),
+                                     {(min(i, j), max(i, j)) for i, j in bridges.tolist()},
+                                     [set(nodes[block].tolist()) for block in blocks], separated)
+
+    def block_cut_tree(self):
+        """
+        :return: the block-cut tree (a forest for disconnected graphs) as an UndirectionalGraph.
+          Block k (the k-th element of components) is the node k and the articulation point a
+          is the node len(components) + cut_vertices().index(a).
+        """
+        from .undirectional_graph import UndirectionalGraph
+        cut_vertices = self.cut_vertices()
+        cut_node = {a: len(self.components) + k for k, a in enumerate(cut_vertices)}
+        src = []
+        dst = []
+        for k, block in enumerate(self.components):
+            for a in block:
+                if a in cut_node:
+                    src.append(k)
+                    dst.append(cut_node[a])
+        ans = UndirectionalGraph()
+        ans.add_nodes(range(len(self.components) + len(cut_vertices)))
+        ans.push_connections(src, dst)
+        return ans
+
+    def cut_vertices(self) -> list[int]:
+        """
+        :return: sorted list of the articulation points, in the order used by block_cut_tree.
+        """
+        return sorted(self.articulation_points)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .csr_graph import CSRGraph, index_dtype
+from .scc import StronglyConnectedComponents
+
+
+class Condensation:
+    """Condensation of a directed graph: one node per strongly connected component, with the deduplicated
+    edges between different components. It is a DAG.
+
+    Components are the nodes 0..C-1 of dag, numbered in a topological order (see tarjan_labels),
+    so topological_order is simply 0..C-1.
+    """
+
+    components: StronglyConnectedComponents  # node -> component mapping
+    dag: CSRGraph  # edges between the components, without duplicates and self-loops
+    weights: np.ndarray  # sum of the node weights of each component
+    topological_order: np.ndarray  # component ids, every edge goes forward in this order
+
+    def __init__(self, components: StronglyConnectedComponents, dag: CSRGraph, weights: np.ndarray):
+        self.components = components
+        self.dag = dag
+        self.weights = weights
+        self.topological_order = np.arange(len(components), dtype=components.component_id.dtype)
+
+    @staticmethod
+    def CreateFromCSR(graph: CSRGraph) -> Condensation:
+        """
+        Condenses a frozen directed graph in O(N+M), apart from the sorts of the edges between the components.
+        """
+        assert graph.directed
+        components = graph.strongly_connected_component_labels()
+        component_id = components.component_id.astype(np.int64)
+        n_components = len(components)
+
+        src = np.repeat(component_id, np.diff(graph.indptr))
+        dst = component_id[graph.indices]
+        between = src != dst
+        src, dst = src[between], dst[between]
+        # Sorting by (src, dst) makes the duplicates adjacent
+        order = np.argsort(src * max(n_components, 1) + dst, kind="stable")
+        src, dst = src[order], dst[order]
+        unique = np.ones(len(src), dtype=bool)
+        unique[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst = src[unique], dst[unique]
+        reverse = np.argsort(dst, kind="stable")  # by (dst, src), as src is sorted already
+
+        index_type = index_dtype(n_components)
+        indptr = np.zeros(n_components + 1, dtype=index_dtype(len(src)))
+        np.cumsum(np.bincount(src, minlength=n_components), out=indptr[1:])
+        reverse_indptr = np.zeros(n_components + 1, dtype=index_dtype(len(src)))
+        np.cumsum(np.bincount(dst, minlength=n_components), out=reverse_indptr[1:])
+        dag = CSRGraph(np.arange(n_components, dtype=np.int64), indptr, dst.astype(index_type), directed=True,
+                       reverse_indptr=reverse_indptr, reverse_indices=src[reverse].astype(index_type))
+
+        if graph.node_weights is None:
+            weights = components.sizes.astype(np.int64)
+        else:
+            weights = np.bincount(component_id, weights=graph.node_weights, minlength=n_components).astype(np.int64)
+        return Condensation(components, dag, weights)
+
+    def __len__(self):
+        return len(self.components)
+
+    def component_of(self, i: int) -> int:
+        return self.components.component_of(i)
+
+    def sources(self) -> np.ndarray:
+        """
+        :return: components without incoming edges from other components.
+        """
+        return np.flatnonzero(np.diff(self.dag.reverse_indptr) == 0)
+
+    def sinks(self) -> np.ndarray:
+        """
+        :return: components without outgoing edges to other components.
+        """
+        return np.flatnonzero(np.diff(self.dag.indptr) == 0)
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+from typing import AbstractSet, Iterable, Optional
+
+import graphviz
+import numpy as np
+from overrides import overrides
+
+from .analysis_cache import register_analysis
+from .bfs import BreadthFirstSearch, Start
+from .biconnected import BiconnectedComponents
+from .ifaces import IGraph, ProcessVertex, ProcessEdge
+from .scc import StronglyConnectedComponents, tarjan_labels
+from .traversal import depth_first_search
+
+
+def index_dtype(n: int) -> type:
+    """
+    :return: the smallest of int32/int64 that can hold values up to n.
+    """
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def build_csr(n: int, src: np.ndarray, dst: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Builds the compressed sparse row layout of edges given as positions in range(n).
+    :return: tuple of (indptr, indices, order), where order is the permutation that sorts the edges by (src, dst),
+      so any per-edge payload can be aligned with indices as payload[order].
+    """
+    order = np.lexsort((dst, src))
+    counts = np.bincount(src, minlength=n)
+    indptr = np.zeros(n + 1, dtype=index_dtype(len(src)))
+    np.cumsum(counts, out=indptr[1:])
+    indices = dst[order].astype(index_dtype(n))
+    return indptr, indices, order
+
+
+class ImmutableGraphError(TypeError):
+    """Raised on an attempt to mutate a frozen graph."""
+
+
+class CSRGraph(IGraph):
+    """Immutable graph, which keeps its adjacency in compressed sparse row (CSR) arrays.
+
+    Nodes are addressed by their ids, just like in the other graphs. Internally node nodes[k] has position k,
+    its children are nodes[indices[indptr[k]:indptr[k + 1]]] and (for the directed graphs) its parents are
+    nodes[reverse_indices[reverse_indptr[k]:reverse_indptr[k + 1]]].
+
+    Obtain it with freeze() of a mutable graph and convert it back with thaw().
+    """
+
+    nodes: np.ndarray  # sorted node ids
+    indptr: np.ndarray
+    indices: np.ndarray  # positions of the children, sorted within each node
+    reverse_indptr: Optional[np.ndarray]  # None for the undirected graphs
+    reverse_indices: Optional[np.ndarray]
+    edge_weights: Optional[np.ndarray]  # aligned with indices; None if all weights are one
+    node_weights: Optional[np.ndarray]  # aligned with nodes; None if all weights are one
+    sides: Optional[np.ndarray]  # aligned with nodes; side of each node of a bipartite DiGraph, None otherwise
+    directed: bool
+    _contiguous: bool  # True if nodes == arange(len(nodes)), so ids are positions
+    _node_set: Optional[frozenset[int]]  # built on the first get_nodes()
+
+    def __init__(self, nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray, directed: bool,
+                 reverse_indptr: np.ndarray = None, reverse_indices: np.ndarray = None,
+                 edge_weights: np.ndarray = None, node_weights: np.ndarray = None, sides: np.ndarray = None):
+        super().__init__()
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.directed = directed
+        self.reverse_indptr = reverse_indptr
+        self.reverse_indices = reverse_indices
+        self.edge_weights = edge_weights
+        self.node_weights = node_weights
+        self.sides = sides
+        n = len(nodes)
+        self._contiguous = n == 0 or (int(nodes[0]) == 0 and int(nodes[-1]) == n - 1)
+        self._node_set = None
+
+    @staticmethod
+    def CreateFromEdgeArrays(nodes, src, dst, directed: bool = True,
+                             edge_weights=None, node_weights=None, sides=None) -> CSRGraph:
+        """
+        :param nodes: ids of all the nodes, in any order
+        :param src: ids of the edge sources
+        :param dst: ids of the edge targets. Undirected graphs must list every edge in both directions.
+        :param edge_weights: optional weight of each edge
+        :param node_weights: optional weight of each node, aligned with nodes
+        :param sides: optional side of each node, aligned with nodes (bipartite graphs only)
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        order = np.argsort(nodes, kind="stable")
+        nodes = nodes[order]
+        if node_weights is not None:
+            node_weights = np.asarray(node_weights, dtype=np.int64)[order]
+        if sides is not None:
+            sides = np.asarray(sides, dtype=np.int8)[order]
+        n = len(nodes)
+        src = np.searchsorted(nodes, np.asarray(src, dtype=np.int64))
+        dst = np.searchsorted(nodes, np.asarray(dst, dtype=np.int64))
+        indptr, indices, edge_order = build_csr(n, src, dst)
+        if edge_weights is not None:
+            edge_weights = np.asarray(edge_weights, dtype=np.int64)[edge_order]
+        if directed:
+            reverse_indptr, reverse_indices, _ = build_csr(n, dst, src)
+        else:
+            reverse_indptr, reverse_indices = None, None
+        return CSRGraph(nodes, indptr, indices, directed, reverse_indptr=reverse_indptr,
+                        reverse_indices=reverse_indices, edge_weights=edge_weights, node_weights=node_weights,
+                        sides=sides)
+
+    def position(self, i: int) -> int:
+        """
+        :return: position of the node i in the CSR arrays.
+        """
+        if self._contiguous:
+            if 0 <= i < len(self.nodes):
+                return i
+        else:
+            k = int(np.searchsorted(self.nodes, i))
+            if k < len(self.nodes) and self.nodes[k] == i:
+                return k
+        raise ValueError(f"Vertex {i} does not exist")
+
+    def _ids(self, positions: np.ndarray) -> list[int]:
+        if self._contiguous:
+            return positions.tolist()
+        return self.nodes[positions].tolist()
+
+    def children_array(self, i: int) -> np.ndarray:
+        """
+        :return: sorted array of positions of the children of the node i.
+        """
+        k = self.position(i)
+        return self.indices[self.indptr[k]:self.indptr[k + 1]]
+
+    @property
+    def edge_count(self) -> int:
+        """
+        :return: number of stored edges. Undirected edges are stored (and counted) twice.
+        """
+        return len(self.indices)
+
+    def edge_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: tuple of (src, dst) arrays of node ids, one entry per stored edge, aligned with edge_weights.
+        """
+        src = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        return self.nodes[src], self.nodes[self.indices]
+
+    @overrides
+    def get_children(self, i: int) -> set[int]:
+        return set(self._ids(self.children_array(i)))
+
+    def parents(self, i: int) -> set[int]:
+        if not self.directed:
+            return self.get_children(i)
+        k = self.position(i)
+        return set(self._ids(self.reverse_indices[self.reverse_indptr[k]:self.reverse_indptr[k + 1]]))
+
+    @overrides
+    def get_nodes(self) -> AbstractSet[int]:
+        if self._node_set is None:
+            self._node_set = frozenset(self.nodes.tolist())
+        return self._node_set
+
+    @overrides
+    def nodes_array(self) -> np.ndarray:
+        return self.nodes
+
+    @overrides
+    def __len__(self):
+        return len(self.nodes)
+
+    @overrides
+    def __contains__(self, i: int):
+        try:
+            self.position(i)
+        except ValueError:
+            return False
+        return True
+
+    @property
+    @overrides
+    def all_node_weights_must_be_one(self) -> bool:
+        return self.node_weights is None
+
+    @property
+    @overrides
+    def all_edge_weights_must_be_one(self) -> bool:
+        return self.edge_weights is None
+
+    @overrides
+    def get_node_weight(self, i: int) -> int:
+        if self.node_weights is None:
+            return 1
+        return int(self.node_weights[self.position(i)])
+
+    @overrides
+    def get_connection_weight(self, i: int, j: int) -> int:
+        k = self.position(i)
+        start, end = int(self.indptr[k]), int(self.indptr[k + 1])
+        slot = start + int(np.searchsorted(self.indices[start:end], self.position(j)))
+        if slot == end or self.indices[slot] != self.position(j):
+            raise ValueError(f"Edge {i} -> {j} does not exist")
+        if self.edge_weights is None:
+            return 1
+        return int(self.edge_weights[slot])
+
+    @overrides
+    def dfs(self, start: int, discovered: dict[int, int] = None,
+            processed: dict[int, int] = None,
+            parents: dict[int, int] = None,
+            process_vertex_early: ProcessVertex = None, process_edge: ProcessEdge = None,
+            process_vertex_late: ProcessVertex = None) -> int:
+        return depth_first_search(start, lambda node: self._ids(self.children_array(node)), self.directed,
+                                  discovered=discovered, processed=processed, parents=parents,
+                                  process_vertex_early=process_vertex_early, process_edge=process_edge,
+                                  process_vertex_late=process_vertex_late)
+
+    @overrides
+    def bfs(self, start: Start, max_depth: Optional[int] = None, targets: Iterable[int] = None,
+            reverse: bool = False) -> BreadthFirstSearch:
+        return BreadthFirstSearch.CreateFromCSR(self, start, max_depth=max_depth, targets=targets, reverse=reverse)
+
+    def strongly_connected_component_labels(self) -> StronglyConnectedComponents:
+        """
+        :return: strongly connected components computed by the iterative Tarjan's algorithm in O(N+M).
+        """
+        component_id, sizes = tarjan_labels(self.indptr, self.indices)
+        return StronglyConnectedComponents(self.nodes, component_id, sizes)
+
+    def biconnected_components(self, with_separated_sizes: bool = False) -> BiconnectedComponents:
+        """
+        :param with_separated_sizes: if True, also fill separated_sizes, the sizes of the parts that removing
+          each articulation point would create
+        :return: articulation points, bridges and biconnected components of an undirected graph,
+          computed by the iterative low-link algorithm in O(N+M).
+        """
+        assert not self.directed
+        return BiconnectedComponents.CreateFromCSR(self.nodes, self.indptr, self.indices, with_separated_sizes)
+
+    def freeze(self) -> CSRGraph:
+        """
+        :return: the graph itself, as it is frozen already. Lets the registered analyses run on it.
+        """
+        return self
+
+    def thaw(self) -> IGraph:
+        """
+        :return: mutable copy of the graph: a DiGraph if the graph is bipartite, otherwise
+          a DirectionalGraph or an UndirectionalGraph.
+        """
+        if self.sides is not None:
+            from .digraph import DiGraph
+            return self.thaw_into(DiGraph())
+        if not self.directed:
+            from .undirectional_graph import UndirectionalGraph
+            return self.thaw_into(UndirectionalGraph())
+        from .directional_graph import DirectionalGraph
+        return self.thaw_into(DirectionalGraph(all_node_weights_equal_one=self.node_weights is None,
+                                               all_edge_weights_equal_one=self.edge_weights is None,
+                                               edge_weights_are_symmetrical=False))
+
+    def thaw_into(self, graph: IGraph) -> IGraph:
+        """
+        Adds all the nodes and edges to an empty mutable graph of the matching kind
+        (DiGraph, UndirectionalGraph or DirectionalGraph including its subclasses).
+        :return: graph
+        """
+        if self.sides is not None:
+            for side in (0, 1):
+                graph.add_nodes(self.nodes[self.sides == side], side)
+        else:
+            graph.add_nodes(self.nodes, self.node_weights)
+        src, dst = self.edge_arrays()
+        graph.push_connections(src, dst, costs=self.edge_weights)
+        return graph
+
+    def save(self, path: str):
+        """
+        Saves the arrays into a binary file, see storage.write_arrays.
+        """
+        from .storage import save_graph
+        save_graph(path, type(self).__name__, self)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> CSRGraph:
+        """
+        Loads the adjacency saved by the save() of any graph class (except DenseGraph).
+        :param mmap: if True, the arrays are memory-mapped instead of read into memory, so loading is instant.
+        """
+        from .storage import read_graph
+        _, csr, _, _ = read_graph(path, mmap=mmap)
+        if csr is None:
+            raise ValueError(f"{path} does not contain an adjacency")
+        return csr
+
+    @overrides
+    def __str__(self):
+        src, dst = self.edge_arrays()
+        if not self.directed:
+            keep = src < dst
+            src, dst = src[keep], dst[keep]
+        ans = f"{len(self.nodes)}\n"
+        if len(self.nodes) > 0:
+            ans += "\n".join(str(i) for i in self.nodes.tolist())
+            ans += "\n"
+        ans += f"{len(src)}\n"
+        ans += "\n".join(f"{i} {j}" for i, j in zip(src.tolist(), dst.tolist()))
+        return ans
+
+    @overrides
+    def __eq__(self, other: IGraph):
+        if not isinstance(other, CSRGraph):
+            return False
+        if self.directed != other.directed:
+            return False
+        for mine, theirs in ((self.nodes, other.nodes), (self.indptr, other.indptr), (self.indices, other.indices),
+                             (self.edge_weights, other.edge_weights), (self.node_weights, other.node_weights),
+                             (self.sides, other.sides)):
+            if (mine is None) != (theirs is None):
+                return False
+            if mine is not None and not np.array_equal(mine, theirs):
+                return False
+        return True
+
+    @overrides
+    def plot(self) -> graphviz.Digraph:
+        out = graphviz.Digraph()
+        for i in self.nodes.tolist():
+            out.node(str(i))
+        src, dst = self.edge_arrays()
+        for i, j in zip(src.tolist(), dst.tolist()):
+            if self.directed:
+                out.edge(str(i), str(j), arrowhead="normal")
+            elif i < j:
+                out.edge(str(i), str(j), arrowhead="none")
+        return out
+
+    @overrides
+    def push_connection(self, i: int, j: int, tag: Optional[str] = None, cost: int = 1):
+        raise ImmutableGraphError("CSRGraph is immutable, thaw() it first")
+
+    @overrides
+    def add_node(self, i: int, weight: int = 1):
+        raise ImmutableGraphError("CSRGraph is immutable, thaw() it first")
+
+    @overrides
+    def remove_node(self, i: int):
+        raise ImmutableGraphError("CSRGraph is immutable, thaw() it first")
+
+    @overrides
+    def remove_connection(self, i: int, j: int):
+        raise ImmutableGraphError("CSRGraph is immutable, thaw() it first")
+
+    @overrides
+    def remove_unconnected_nodes(self):
+        raise ImmutableGraphError("CSRGraph is immutable, thaw() it first")
+
+
+@register_analysis("frozen")
+def _frozen(graph: IGraph) -> CSRGraph:
+    return graph.freeze()
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import AbstractSet, Iterable, Optional
 
 import graphviz
+import numpy as np
 from overrides import overrides
 
+from .bfs import BreadthFirstSearch, Start
+from .edge_arrays import as_int_array
 from .ifaces import IGraph, ProcessVertex, ProcessEdge
+from .storage import save_graph, read_graph
 
 
 class DenseGraph(IGraph):
     """Graph where we assume every node is connected to every other node in a group of n nodes.
+
+    The groups are kept in an array-backed disjoint-set forest (union by size with path compression).
+    Every node has a slot; _parent[slot] is the slot of its parent in the forest, roots point to themselves.
+    Explicit sets of group members are only built on demand and cached until the next mutation.
+    A removed node only marks its slot dead, which stays in the forest as an internal node, so removal is O(1).
     """
 
-    _groups: list[set[int]]
-    _group_id: dict[int, int]  # maps node to group id
+    _index: dict[int, int]  # maps node to its slot
+    _ids: np.ndarray  # maps slot to node; only the first _count slots are used
+    _parent: np.ndarray  # parent slot of each slot
+    _size: np.ndarray  # number of live nodes in the tree, valid for the roots only
+    _dead: np.ndarray  # True for the slots of removed nodes
+    _count: int
+    _groups_cache: Optional[dict[int, set[int]]]  # root slot -> nodes of the group
 
     @overrides
     def get_node_weight(self, i: int) -> int:
@@ -29,9 +43,148 @@ class DenseGraph(IGraph):
     def all_edge_weights_must_be_one(self) -> bool:
         return True
 
-    def __init__(self):
-        self._groups = []
-        self._group_id = {}
+    def __init__(self, capacity: int = 16):
+        super().__init__()
+        self._index = {}
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._parent = np.empty(capacity, dtype=np.int64)
+        self._size = np.empty(capacity, dtype=np.int64)
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._count = 0
+        self._groups_cache = None
+
+    @staticmethod
+    def CreateFromGroups(nodes, groups) -> DenseGraph:
+        """
+        :param nodes: node ids
+        :param groups: group label of each node; nodes with equal labels are connected
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        ans = DenseGraph(capacity=max(len(nodes), 16))
+        _, first, inverse = np.unique(np.asarray(groups), return_index=True, return_inverse=True)
+        n = len(nodes)
+        ans._ids[:n] = nodes
+        ans._parent[:n] = first[inverse]
+        ans._size[:n] = np.bincount(ans._parent[:n], minlength=n)
+        ans._count = n
+        ans._index = dict(zip(nodes.tolist(), range(n)))
+        return ans
+
+    @overrides
+    def _mutated(self):
+        super()._mutated()
+        self._groups_cache = None
+
+    def _slot(self, i: int) -> int:
+        """
+        :return: slot of the node i, adding it as a singleton group if it is not in the graph yet.
+        """
+        slot = self._index.get(i)
+        if slot is not None:
+            return slot
+        if self._count == len(self._parent):
+            capacity = 2 * len(self._parent)
+            for name in ("_ids", "_parent", "_size"):
+                array = np.empty(capacity, dtype=np.int64)
+                array[:self._count] = getattr(self, name)[:self._count]
+                setattr(self, name, array)
+            dead = np.zeros(capacity, dtype=bool)
+            dead[:self._count] = self._dead[:self._count]
+            self._dead = dead
+        slot = self._count
+        self._count += 1
+        self._ids[slot] = i
+        self._parent[slot] = slot
+        self._size[slot] = 1
+        self._index[i] = slot
+        self._mutated()
+        return slot
+
+    def _find(self, slot: int) -> int:
+        parent = self._parent
+        root = slot
+        while parent[root] != root:
+            root = parent[root]
+        while parent[slot] != root:
+            parent[slot], slot = root, parent[slot]
+        return int(root)
+
+    def _union(self, slot1: int, slot2: int):
+        root1 = self._find(slot1)
+        root2 = self._find(slot2)
+        if root1 == root2:
+            return
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size[root2]
+        self._mutated()
+
+    def _compress(self) -> np.ndarray:
+        """
+        Points every slot straight at its root by pointer jumping.
+        :return: view of the parent array of the used slots, which now holds the root of every slot.
+        """
+        parent = self._parent[:self._count]
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent[:] = grandparent
+
+    @overrides
+    def push_connections(self, src, dst, costs=None, tags=None):
+        """
+        Connects the groups of src[k] and dst[k] for every k in a few vectorized passes.
+        """
+        assert costs is None or np.all(np.asarray(costs) == 1)
+        src = np.fromiter((self._slot(i) for i in as_int_array(src).tolist()), dtype=np.int64)
+        dst = np.fromiter((self._slot(j) for j in as_int_array(dst).tolist()), dtype=np.int64)
+        if len(src) == 0:
+            return
+        while True:
+            roots = self._compress()
+            root1, root2 = roots[src], roots[dst]
+            differ = root1 != root2
+            if not np.any(differ):
+                break
+            src, dst, root1, root2 = src[differ], dst[differ], root1[differ], root2[differ]
+            # Hook every larger root onto the smallest root it is connected to. This never creates a cycle.
+            np.minimum.at(self._parent, np.maximum(root1, root2), np.minimum(root1, root2))
+        self._size[:self._count] = np.bincount(roots[self._live()], minlength=self._count)
+        self._mutated()
+
+    def _live(self) -> np.ndarray:
+        """
+        :return: the used slots of the nodes that were not removed.
+        """
+        return np.flatnonzero(~self._dead[:self._count])
+
+    def _groups(self) -> dict[int, set[int]]:
+        if self._groups_cache is None:
+            roots = self._compress()
+            live = self._live()
+            order = live[np.argsort(roots[live], kind="stable")]
+            sorted_roots = roots[order]
+            boundaries = np.flatnonzero(sorted_roots[1:] != sorted_roots[:-1]) + 1
+            ids = self._ids[order].tolist()
+            starts = [0] + boundaries.tolist()
+            ends = boundaries.tolist() + [len(order)]
+            self._groups_cache = {int(sorted_roots[start]): set(ids[start:end]) for start, end in zip(starts, ends)
+                                  if end > start}
+        return self._groups_cache
+
+    def groups(self) -> list[set[int]]:
+        """
+        :return: list of the groups. The sets must not be modified.
+        """
+        return list(self._groups().values())
+
+    def group(self, i: int) -> set[int]:
+        """
+        :return: all the nodes in the group of the node i, including i. The set must not be modified.
+        """
+        return self._groups()[self._find(self._index[i])]
 
     @overrides
     def dfs(self, start: int, discovered: dict[int, int] = None, processed: dict[int, int] = None,
@@ -39,15 +192,44 @@ class DenseGraph(IGraph):
             process_edge: ProcessEdge = None, process_vertex_late: ProcessVertex = None) -> int:
         raise NotImplementedError()
 
+    @overrides
+    def bfs(self, start: Start, max_depth: Optional[int] = None, targets: Iterable[int] = None,
+            reverse: bool = False) -> BreadthFirstSearch:
+        """
+        Every node is one edge away from the other nodes of its group, so the distances follow from the roots
+        of the groups without any traversal.
+        """
+        starts = [start] if isinstance(start, (int, np.integer)) else list(start)
+        for i in starts:
+            if i not in self._index:
+                raise ValueError(f"Vertex {i} does not exist")
+        roots = self._compress()
+        live = self._live()
+        live = live[np.argsort(self._ids[live], kind="stable")]
+        nodes = self._ids[live]
+        group = roots[live]
+        sources = np.searchsorted(nodes, np.asarray(starts, dtype=np.int64))
+        distance = np.full(len(nodes), -1, dtype=np.int64)
+        parent = np.full(len(nodes), -1, dtype=np.int64)
+        distance[sources] = 0
+        if max_depth != 0 and (targets is None or set(starts).isdisjoint(targets)):
+            first_source = np.full(self._count, -1, dtype=np.int64)
+            first_source[group[sources][::-1]] = sources[::-1]
+            candidate = first_source[group]
+            reached = (candidate >= 0) & (distance < 0)
+            distance[reached] = 1
+            parent[reached] = candidate[reached]
+        return BreadthFirstSearch(nodes, distance, parent)
+
     @overrides
     def __len__(self):
-        return len(self._group_id)
+        return len(self._index)
 
     @overrides
     def __str__(self) -> str:
         ans = f"{len(self)}\n"
-        for group in self._groups:
-            ans += f"{len(group)} {' '.join(str(group))}"
+        for group in self._groups().values():
+            ans += f"{len(group)} {' '.join(str(i) for i in sorted(group))}\n"
         return ans
 
     @overrides
@@ -57,32 +239,7 @@ class DenseGraph(IGraph):
     @overrides
     def push_connection(self, i: int, j: int, tag: Optional[str] = None, cost: int = 1):
         assert cost == 1
-        if i in self._group_id:
-            group_id1 = self._group_id[i]
-            group1 = self._groups[group_id1]
-
-            if j in self._group_id:
-                group_id2 = self._group_id[j]
-                group2 = self._groups[group_id2]
-                if group_id1 != group_id2:
-                    group1.update(group2)
-                    for node in group2:
-                        self._group_id[node] = group_id1
-                    del self._groups[group_id2]
-            else:
-                group1.add(j)
-                self._group_id[j] = group_id1
-        else:
-            if j in self._group_id:
-                group_id2 = self._group_id[j]
-                group2 = self._groups[group_id2]
-                group2.add(i)
-                self._group_id[i] = group_id2
-            else:
-                group_id = len(self._groups)
-                self._groups.append({i, j})
-                self._group_id[i] = group_id
-                self._group_id[j] = group_id
+        self._union(self._slot(i), self._slot(j))
 
     @overrides
     def get_connection_weight(self, i: int, j: int) -> int:
@@ -92,18 +249,20 @@ class DenseGraph(IGraph):
     @overrides
     def add_node(self, i: int, weight: int = 1):
         assert weight == 1
-        if i not in self._group_id:
-            self._groups.append({i})
-            self._group_id[i] = len(self._groups) - 1
+        self._slot(i)
+
+    @overrides
+    def add_nodes(self, ids, weights=None):
+        assert weights is None or np.all(np.asarray(weights) == 1)
+        for i in as_int_array(ids).tolist():
+            self._slot(i)
 
     @overrides
     def remove_node(self, i: int):
-        group_id = self._group_id[i]
-        group = self._groups[group_id]
-        group.remove(i)
-        del self._group_id[i]
-        if len(group) == 0:
-            del self._groups[group_id]
+        slot = self._index.pop(i)
+        self._dead[slot] = True
+        self._size[self._find(slot)] -= 1
+        self._mutated()
 
     @overrides
     def remove_connection(self, i: int, j: int):
@@ -111,46 +270,53 @@ class DenseGraph(IGraph):
 
     @overrides
     def remove_unconnected_nodes(self):
-        for group_id, group in enumerate(self._groups):
-            if len(group) == 0:
-                del self._groups[group_id]
+        pass  # groups never become empty
 
     @overrides
     def plot(self) -> graphviz.Digraph:
         out = graphviz.Digraph()
         for i in self.get_nodes():
             out.node(str(i))
-        for group_id in set(self._group_id.values()):
-            items = list(self._groups[group_id])
-            items.sort()
-            if len(items) == 0:
-                continue
+        for group in self._groups().values():
+            items = sorted(group)
             anchor = items[0]
-            for i in range(1, len(items)):
-                element = items[i]
-                if element != anchor:
-                    out.edge(str(anchor), str(element), arrowhead="none")
+            for element in items[1:]:
+                out.edge(str(anchor), str(element), arrowhead="none")
         return out
 
     @overrides
     def __contains__(self, i: int):
-        return i in self._group_id
+        return i in self._index
 
     @overrides
     def get_children(self, i: int) -> set[int]:
-        group_id = self._group_id[i]
-        group = self._groups[group_id]
-        return group - {i}
+        return self.group(i) - {i}
+
+    @overrides
+    def get_nodes(self) -> AbstractSet[int]:
+        return self._index.keys()
 
     @overrides
-    def get_nodes(self) -> set[int]:
-        return set(self._group_id.keys())
+    def nodes_array(self) -> np.ndarray:
+        return self._ids[self._live()]
+
+    def save(self, path: str):
+        """
+        Saves the nodes and the group of each node into a compact binary file, see storage.write_arrays.
+        """
+        roots = self._compress()
+        live = self._live()
+        save_graph(path, type(self).__name__, None, extra={"nodes": self._ids[live], "groups": roots[live]})
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> DenseGraph:
+        _, _, _, extra = read_graph(path, mmap=mmap)
+        return DenseGraph.CreateFromGroups(extra["nodes"], extra["groups"])
 
     @overrides
     def __eq__(self, other: IGraph):
         if not isinstance(other, DenseGraph):
             return False
-        for item in self.get_nodes():
-            if self.get_children(item) != other.get_children(item):
-                return False
-        return True
+        mine = {frozenset(group) for group in self._groups().values()}
+        theirs = {frozenset(group) for group in other._groups().values()}
+        return mine == theirs
@@ -1,23 +1,276 @@
-from typing import Optional
+from __future__ import annotations
+
+from typing import AbstractSet, Callable, Optional, Union
 
 import graphviz
+import numpy as np
 from overrides import overrides
 
 from . import IGraph, ProcessVertex, ProcessEdge
 from .ifaces import IDirectionalGraph
 
+from .csr_graph import CSRGraph
 from .directional_graph import DirectionalGraph
+from .edge_arrays import as_int_array
+from .matching import BipartiteArrays, Matching
+from .node_index import NodeIndex
+from .sampling import Seed, make_rng, sample_positions
+from .storage import save_graph, read_graph
+
+COMPACT_MIN = 1024  # buffered or removed edges that are never worth merging into the arrays
+
+# (low, high) of uniform integer costs in [low, high), or function(rng, size) -> array of costs
+CostDistribution = Union[tuple[int, int], Callable[[np.random.Generator, int], np.ndarray]]
 
 
 class DiGraph(IDirectionalGraph):
-    _edges: dict[tuple[int, int], int]  # Connection -> its cost
-    _left_edges: dict[int, set[int]]  # What are the edges that start from the left edge key?
-    _right_edges: dict[int, set[int]]  # What are the edges that start from the right edge key?
+    """Bipartite graph, whose edges go from the left side (0) to the right side (1) and carry integer costs.
+
+    The vertices of each side have dense positions in their own NodeIndex. The edges are kept in CSR arrays over
+    those positions: the right neighbours of the left vertex at position u are _indices[_indptr[u]:_indptr[u + 1]],
+    sorted, with their costs aligned in _costs. The right-to-left CSR is derived when needed.
+
+    Edges pushed one at a time wait in a buffer of rows and edges removed one at a time are only marked
+    (tombstones), so both take O(log degree) and lookups see them without touching the arrays. The buffer and
+    the tombstones are merged into the arrays by a single sort once they reach a quarter of the edges, or
+    when the whole arrays are needed (freeze, edge_arrays, parents, ...). Removing nodes rebuilds the arrays
+    in O(V + E), so remove many nodes with one remove_nodes().
+    """
+
+    _left: NodeIndex  # vertices of the left side
+    _right: NodeIndex  # vertices of the right side
+    _nodes: NodeIndex  # vertices of both sides
+    _indptr: np.ndarray  # may be shorter than len(_left) + 1 until _compact(), the missing rows are empty
+    _indices: np.ndarray  # right positions, sorted within each row
+    _costs: np.ndarray  # aligned with _indices
+    _pending: dict[int, dict[int, int]]  # left position -> right position -> cost, of the edges not merged yet
+    _pending_count: int  # number of the edges in _pending
+    _removed: Optional[np.ndarray]  # aligned with _indices, True for the removed edges; None if there are none
+    _removed_count: int
+    _edge_count: int
+    planted_assignment: Optional[Matching]  # the matching planted by CreateRandom, not updated by the mutators
+    _reverse: Optional[tuple[np.ndarray, np.ndarray]]  # (indptr, edge numbers) of the right-to-left CSR
 
     def __init__(self):
-        self._edges = {}
-        self._left_edges = {}
-        self._right_edges = {}
+        super().__init__()
+        self.planted_assignment = None
+        self._left = NodeIndex()
+        self._right = NodeIndex()
+        self._nodes = NodeIndex()
+        self._pending = {}
+        self._pending_count = 0
+        self._set_edges(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    @staticmethod
+    def CreateFromCostMatrix(costs, mask=None, left=None, right=None) -> DiGraph:
+        """
+        Builds the graph of an assignment problem without looking at the edges one by one.
+        :param costs: integer matrix of shape (n_left, n_right), costs[u, v] is the cost of the edge from the u-th
+          left vertex to the v-th right vertex
+        :param mask: optional boolean matrix of the same shape, True where there is an edge. By default every entry
+          is an edge.
+        :param left: ids of the left vertices, range(n_left) by default
+        :param right: ids of the right vertices, range(n_left, n_left + n_right) by default
+        """
+        costs = np.asarray(costs, dtype=np.int64)
+        assert costs.ndim == 2
+        n_left, n_right = costs.shape
+        ans = DiGraph()
+        ans._add_side_nodes(np.arange(n_left) if left is None else left, 0)
+        ans._add_side_nodes(np.arange(n_left, n_left + n_right) if right is None else right, 1)
+        assert len(ans._left) == n_left and len(ans._right) == n_right, "Vertex ids must be unique"
+        if mask is None:
+            indptr = np.arange(0, n_left * n_right + 1, max(n_right, 1), dtype=np.int64)[:n_left + 1]
+            indices = np.tile(np.arange(n_right, dtype=np.int64), n_left)
+            ans._set_edges(indptr, indices, costs.ravel())
+            return ans
+        mask = np.asarray(mask, dtype=bool)
+        assert mask.shape == costs.shape
+        flat = np.flatnonzero(mask)  # row-major, so the edges are already sorted
+        indptr = np.zeros(n_left + 1, dtype=np.int64)
+        np.cumsum(np.count_nonzero(mask, axis=1), out=indptr[1:])
+        ans._set_edges(indptr, flat % n_right, costs.ravel()[flat])
+        return ans
+
+    @staticmethod
+    def CreateRandom(n_left: int, n_right: int, density: float = 0.1, cost_distribution: CostDistribution = (1, 100),
+                     seed: Seed = None, perfect: bool = False, planted: bool = False) -> DiGraph:
+        """
+        Creates a random bipartite graph, in which every pair of a left and a right vertex is an edge with
+        probability density. Edges and costs are sampled in bulk, so the cost is proportional to the number of edges
+        (plus the vertices, for the planted matching). Left vertices are range(n_left), right vertices are
+        range(n_left, n_left + n_right).
+        :param cost_distribution: (low, high) for costs uniform in [low, high), or function(rng, size) returning
+          size integer costs
+        :param seed: integer seed or numpy Generator; the same seed always yields the same graph.
+        :param perfect: if True, the graph contains a random matching of every vertex of the smaller side to
+          distinct vertices of the other side, which is kept in planted_assignment
+        :param planted: like perfect, and the costs make that matching the only optimal assignment. Sampled costs
+          are shifted by random dual potentials of the vertices, so the planted edges are not simply the cheapest
+          ones of their rows or columns. planted_assignment.cost is the optimum.
+        """
+        rng = make_rng(seed)
+
+        def draw(size: int) -> np.ndarray:
+            if callable(cost_distribution):
+                ans = np.asarray(cost_distribution(rng, size), dtype=np.int64)
+            else:
+                ans = rng.integers(*cost_distribution, size=size, dtype=np.int64)
+            assert ans.shape == (size,)
+            return ans
+
+        positions = sample_positions(n_left * n_right, density, rng)  # position of the edge (u, v) is u * n_right + v
+        if perfect or planted:
+            k = min(n_left, n_right)
+            partners = np.stack((rng.permutation(n_left)[:k], rng.permutation(n_right)[:k]))
+            partners = partners[:, np.argsort(partners[0] * n_right + partners[1])]
+            matched = partners[0] * n_right + partners[1]
+            where = np.searchsorted(positions, matched)
+            present = np.zeros(k, dtype=bool)
+            if len(positions) > 0:
+                present = positions[np.minimum(where, len(positions) - 1)] == matched
+            positions = np.insert(positions, where[~present], matched[~present])
+        costs = draw(len(positions))
+        src, dst = np.divmod(positions, max(n_right, 1))
+        if planted and len(positions) > 0:
+            # Costs are lowest + the potentials of both ends + a slack, which is 0 on the planted edges and at least
+            # 1 elsewhere. Every maximum matching covers the smaller side, whose potentials are >= 0; on the other
+            # side only the planted partners have potentials, all <= 0. So any other maximum matching costs more.
+            lowest = int(costs.min())
+            slack = costs - lowest + 1
+            slack[np.searchsorted(positions, matched)] = 0
+            potential = [np.zeros(n_left, dtype=np.int64), np.zeros(n_right, dtype=np.int64)]
+            smaller = 0 if n_left <= n_right else 1
+            up = draw(k)
+            down = draw(k)
+            potential[smaller][partners[smaller]] = up - up.min()
+            potential[1 - smaller][partners[1 - smaller]] = down.min() - down
+            costs = lowest + potential[0][src] + potential[1][dst] + slack
+
+        ans = DiGraph()
+        ans._add_side_nodes(np.arange(n_left), 0)
+        ans._add_side_nodes(np.arange(n_left, n_left + n_right), 1)
+        indptr = np.zeros(n_left + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n_left), out=indptr[1:])
+        ans._set_edges(indptr, dst, costs)
+        if perfect or planted:
+            cost = int(costs[np.searchsorted(positions, matched)].sum())
+            ans.planted_assignment = Matching(partners[0], partners[1] + n_left, cost)
+        return ans
+
+    @staticmethod
+    def CreateFromEdgeArrays(src, dst, costs=None, left=None, right=None) -> DiGraph:
+        """
+        :param src: ids of the left ends of the edges
+        :param dst: ids of the right ends of the edges
+        :param costs: optional cost of each edge, 1 by default. Of repeated edges the last one counts.
+        :param left: optional ids of the left vertices, including those without edges
+        :param right: optional ids of the right vertices, including those without edges
+        """
+        ans = DiGraph()
+        if left is not None:
+            ans._add_side_nodes(left, 0)
+        if right is not None:
+            ans._add_side_nodes(right, 1)
+        ans.push_connections(src, dst, costs=costs)
+        return ans
+
+    def _add_side_nodes(self, ids, side: int) -> np.ndarray:
+        """
+        Adds the vertices, that are not in the graph yet, to a side.
+        :return: positions of the ids within their side.
+        """
+        index, other = (self._left, self._right) if side == 0 else (self._right, self._left)
+        unique, inverse = np.unique(as_int_array(ids), return_inverse=True)
+        unique = unique.tolist()
+        if any(i in other for i in unique):
+            raise ValueError("Edges must go from the left side to the right side")
+        index.add_many(unique)
+        self._nodes.add_many(unique)
+        position = index.position
+        return np.array([position(i) for i in unique], dtype=np.int64)[inverse]
+
+    def _set_edges(self, indptr: np.ndarray, indices: np.ndarray, costs: np.ndarray):
+        self._indptr = indptr
+        self._indices = indices
+        self._costs = costs
+        self._reverse = None
+        self._removed = None
+        self._removed_count = 0
+        self._edge_count = len(indices) + self._pending_count
+
+    def _sources(self) -> np.ndarray:
+        """
+        :return: left position of every edge, aligned with _indices.
+        """
+        return np.repeat(np.arange(len(self._indptr) - 1, dtype=np.int64), np.diff(self._indptr))
+
+    def _merge(self, src: np.ndarray, dst: np.ndarray, costs: np.ndarray):
+        """
+        Adds edges given by their positions. A repeated edge keeps the cost that comes last.
+        """
+        src = np.concatenate((self._sources(), src))
+        dst = np.concatenate((self._indices, dst))
+        costs = np.concatenate((self._costs, costs))
+        order = np.lexsort((dst, src))  # stable, so repeated edges stay in the order they came
+        src, dst, costs = src[order], dst[order], costs[order]
+        last = np.ones(len(src), dtype=bool)
+        last[:-1] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        indptr = np.zeros(len(self._left) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src[last], minlength=len(self._left)), out=indptr[1:])
+        self._set_edges(indptr, dst[last], costs[last])
+
+    def _keep_edges(self, keep: np.ndarray):
+        indptr = np.zeros(len(self._indptr), dtype=np.int64)
+        np.cumsum(np.bincount(self._sources()[keep], minlength=len(self._indptr) - 1), out=indptr[1:])
+        self._set_edges(indptr, self._indices[keep], self._costs[keep])
+
+    def _compact(self):
+        """
+        Merges the buffered edges and drops the removed ones from the arrays, and gives every left vertex its row.
+        """
+        src = [u for u, row in self._pending.items() for _ in row]
+        dst = [v for row in self._pending.values() for v in row]
+        costs = [cost for row in self._pending.values() for cost in row.values()]
+        self._pending = {}
+        self._pending_count = 0
+        if self._removed is not None:
+            self._keep_edges(~self._removed)
+        if src:
+            self._merge(np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), np.array(costs, dtype=np.int64))
+        elif len(self._indptr) <= len(self._left):
+            missing = len(self._left) + 1 - len(self._indptr)
+            self._indptr = np.concatenate((self._indptr, np.full(missing, self._indptr[-1], dtype=np.int64)))
+
+    def _maybe_compact(self):
+        if self._pending_count + self._removed_count > max(COMPACT_MIN, len(self._indices) // 4):
+            self._compact()
+
+    def _find(self, u: int, v: int) -> int:
+        """
+        :return: number of the edge between the positions u and v in the arrays, -1 if there is none or it is removed.
+        """
+        if u + 1 >= len(self._indptr):
+            return -1
+        start, end = int(self._indptr[u]), int(self._indptr[u + 1])
+        k = start + int(np.searchsorted(self._indices[start:end], v))
+        if k == end or self._indices[k] != v or (self._removed is not None and self._removed[k]):
+            return -1
+        return k
+
+    def _cost(self, i: int, j: int) -> Optional[int]:
+        """
+        :return: cost of the edge from i to j, None if there is none.
+        """
+        if i not in self._left or j not in self._right:
+            return None
+        u = self._left.position(i)
+        v = self._right.position(j)
+        row = self._pending.get(u)
+        if row is not None and v in row:
+            return row[v]
+        k = self._find(u, v)
+        return None if k < 0 else int(self._costs[k])
 
     def vertex_side(self, i: int) -> int:
         """
@@ -25,40 +278,72 @@ class DiGraph(IDirectionalGraph):
         :param i: vertex id
         :return: side of the vertex; 0 - left side, 1 - right side
         """
-        if i in self._left_edges:
+        if i in self._left:
             return 0
-        elif i in self._right_edges:
+        elif i in self._right:
             return 1
         else:
             raise ValueError(f"Vertex {i} does not exist")
 
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    @overrides
+    def get_node_weight(self, i: int) -> int:
+        return 1
+
+    @property
+    @overrides
+    def all_node_weights_must_be_one(self) -> bool:
+        return True
+
+    @property
+    @overrides
+    def all_edge_weights_must_be_one(self) -> bool:
+        self._compact()
+        return bool(np.all(self._costs == 1))
+
     @overrides
     def push_connection(self, i: int, j: int, tag: Optional[str] = None, cost: int = 1):
         """
         :return Pushes a connection between from vertex i to j.
         """
         assert tag is None
+        if i in self._right or j in self._left or i == j:
+            raise ValueError("Edges must go from the left side to the right side")
+        self._mutated()
+        if self._cost(i, j) is None:
+            self._edge_count += 1
+        self._nodes.add(i)
+        self._nodes.add(j)
+        row = self._pending.setdefault(self._left.add(i), {})
+        v = self._right.add(j)
+        if v not in row:
+            self._pending_count += 1
+        row[v] = cost
+        self._maybe_compact()
 
-        if i in self._left_edges:
-            right_set = self._left_edges[i]
-        else:
-            right_set = set()
-            self._left_edges[i] = right_set
-
-        if j in self._right_edges:
-            left_set = self._right_edges[j]
-        else:
-            left_set = set()
-            self._right_edges[j] = left_set
-
-        right_set.add(j)
-        left_set.add(i)
-
-        self._edges[(i, j)] = cost
+    @overrides
+    def push_connections(self, src, dst, costs=None, tags=None):
+        """
+        Vectorized push_connection, which merges the edges into the arrays at once.
+        """
+        assert tags is None
+        self._mutated()
+        src = self._add_side_nodes(src, 0)
+        dst = self._add_side_nodes(dst, 1)
+        costs = np.ones(len(src), dtype=np.int64) if costs is None else as_int_array(costs)
+        assert len(src) == len(dst) == len(costs)
+        self._compact()
+        self._merge(src, dst, costs)
 
     @overrides
     def get_connection_weight(self, i: int, j: int) -> int:
-        return self._edges[(i, j)]
+        cost = self._cost(i, j)
+        if cost is None:
+            raise KeyError((i, j))
+        return cost
 
     @overrides
     def remove_node(self, i: int):
@@ -67,95 +352,218 @@ class DiGraph(IDirectionalGraph):
         :param i:
         :return:
         """
-        side = self.vertex_side(i)
-
-        if side == 0:
-            edge_set = self._left_edges[i]
-        else:
-            edge_set = self._right_edges[i]
+        self.remove_nodes([i])
 
-        for j in edge_set:
-            if (i, j) in self._edges:
-                self.remove_connection(i, j)
-            if (j, i) in self._edges:
-                self.remove_connection(j, i)
+    def remove_nodes(self, ids):
+        """
+        Removes the nodes along with all their connections in a single O(V + E) rebuild of the arrays.
+        The remaining nodes of each side keep their order.
+        """
+        ids = as_int_array(ids).tolist()
+        for i in ids:
+            self.vertex_side(i)
+        self._mutated()
+        self._compact()
+        removed_left = np.zeros(len(self._left), dtype=bool)
+        removed_right = np.zeros(len(self._right), dtype=bool)
+        for i in ids:
+            if i in self._left:
+                removed_left[self._left.position(i)] = True
+            else:
+                removed_right[self._right.position(i)] = True
+            if i in self._nodes:
+                self._nodes.remove(i)
+
+        keep = ~(removed_left[self._sources()] | removed_right[self._indices])
+        self._keep_edges(keep)
+        # Positions only shift down, so the rows stay sorted. The rows of the removed vertices are empty now.
+        indptr = np.concatenate(([0], self._indptr[1:][~removed_left]))
+        right_position = np.cumsum(~removed_right) - 1
+        self._set_edges(indptr, right_position[self._indices], self._costs)
+        self._left = self._kept_nodes(self._left, removed_left)
+        self._right = self._kept_nodes(self._right, removed_right)
+
+    @staticmethod
+    def _kept_nodes(index: NodeIndex, removed: np.ndarray) -> NodeIndex:
+        ans = NodeIndex()
+        ans.add_many(index.array()[~removed].tolist())
+        return ans
 
     @overrides
     def remove_connection(self, i: int, j: int):
         """
         :return: Removes connection from i to j. "i" does not need to be on left side of the graph.
         """
-        del self._edges[(i, j)]
-
-        if j in self._left_edges and i in self._right_edges:
+        if i in self._right and j in self._left:
             i, j = j, i
         # from now on, i is on the left, and j is on the right
-
-        self._left_edges[i].remove(j)
-        self._right_edges[j].remove(i)
+        if self._cost(i, j) is None:
+            raise KeyError((i, j))
+        self._mutated()
+        u = self._left.position(i)
+        v = self._right.position(j)
+        row = self._pending.get(u)
+        if row is not None and row.pop(v, None) is not None:
+            self._pending_count -= 1
+        k = self._find(u, v)  # the edge may be in the arrays as well, with an older cost
+        if k >= 0:
+            if self._removed is None:
+                self._removed = np.zeros(len(self._indices), dtype=bool)
+            self._removed[k] = True
+            self._removed_count += 1
+        self._edge_count -= 1
+        self._maybe_compact()
 
     @overrides
     def remove_unconnected_nodes(self):
-        items_to_delete = set()
-        for key, items in self._left_edges.items():
-            if len(items) == 0:
-                items_to_delete.add(key)
-
-        for key, items in self._right_edges.items():
-            if len(items) > 0 and key in items_to_delete:
-                items_to_delete.remove(key)
-
-        for key in items_to_delete:
-            del self._right_edges[key]
-            del self._left_edges[key]
+        self._compact()
+        lonely_left = self._left.array()[np.diff(self._indptr) == 0]
+        lonely_right = self._right.array()[np.bincount(self._indices, minlength=len(self._right)) == 0]
+        lonely = np.concatenate((lonely_left, lonely_right))
+        if len(lonely) > 0:
+            self.remove_nodes(lonely)
 
     @overrides
     def get_children(self, i: int) -> set[int]:
         """
         :return: Returns all the children of vertex i.
         """
-        if i in self._left_edges:
-            return self._left_edges[i]
-        else:
+        if i not in self._left:
             return set()
+        u = self._left.position(i)
+        right = self._right.array()
+        children = set()
+        if u + 1 < len(self._indptr):
+            start, end = int(self._indptr[u]), int(self._indptr[u + 1])
+            row = self._indices[start:end]
+            if self._removed is not None:
+                row = row[~self._removed[start:end]]
+            children.update(right[row].tolist())
+        children.update(right[list(self._pending.get(u, ()))].tolist())
+        return children
+
+    def parents(self, i: int) -> set[int]:
+        """
+        :return: all the left vertices connected to the vertex i. The first call after a change merges the
+          buffered edges and builds the right-to-left CSR in O(E).
+        """
+        if i not in self._right:
+            return set()
+        self._compact()
+        if self._reverse is None or len(self._reverse[0]) != len(self._right) + 1:
+            order = np.argsort(self._indices, kind="stable")
+            indptr = np.zeros(len(self._right) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self._indices, minlength=len(self._right)), out=indptr[1:])
+            self._reverse = indptr, order
+        indptr, order = self._reverse
+        v = self._right.position(i)
+        return set(self._left.array()[self._sources()[order[indptr[v]:indptr[v + 1]]]].tolist())
 
     @overrides
     def __len__(self):
-        return len(self._left_edges) + len(self._right_edges)
+        return len(self._nodes)
 
     @overrides
     def __contains__(self, i: int, j: int):
-        return (i, j) in self._edges
+        return self._cost(i, j) is not None
 
     @overrides
     def __str__(self):
-        ans = [f"{i} {j} {k}" for (i, j), k in self._edges.items()]
+        src, dst = self.edge_arrays()
+        ans = [f"{i} {j} {k}" for i, j, k in zip(src.tolist(), dst.tolist(), self._costs.tolist())]
         return "\n".join(ans)
 
     @overrides
-    def get_nodes(self) -> set[int]:
-        ans = {i for i in self._left_edges.keys()}
-        ans.update({i for i in self._right_edges.keys()})
-        return ans
+    def get_nodes(self) -> AbstractSet[int]:
+        return self._nodes.view()
+
+    @overrides
+    def nodes_array(self) -> np.ndarray:
+        return self._nodes.array()
 
     @overrides(check_signature=False)
     def add_node(self, i: int, side: int):
         assert side in (0, 1)
-        assert i not in self._left_edges and i not in self._right_edges
+        assert i not in self._nodes
+        self._mutated()
 
         if side == 0:
-            self._left_edges[i] = set()
+            self._left.add(i)
         else:
-            self._right_edges[i] = set()
+            self._right.add(i)
+        self._nodes.add(i)
+
+    @overrides(check_signature=False)
+    def add_nodes(self, ids, side: int):
+        assert side in (0, 1)
+        self._mutated()
+        ids = as_int_array(ids).tolist()
+        for i in ids:
+            assert i not in self._nodes
+        self._add_side_nodes(ids, side)
+
+    def edge_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :return: tuple of (src, dst) arrays of the ids of the edge ends, ordered like the costs of
+          bipartite_arrays().
+        """
+        self._compact()
+        return self._left.array()[self._sources()], self._right.array()[self._indices]
+
+    def bipartite_arrays(self) -> BipartiteArrays:
+        """
+        :return: read-only view of the arrays, which the matching algorithms use directly.
+        """
+        self._compact()
+        arrays = [self._left.array().copy(), self._right.array().copy(), self._indptr, self._indices, self._costs]
+        for array in arrays:
+            array.flags.writeable = False
+        return BipartiteArrays(*arrays)
+
+    def maximum_matching(self) -> Matching:
+        """
+        :return: a maximum-cardinality matching, found by the Hopcroft-Karp algorithm in O(E sqrt(V)).
+          It is memoized until the next mutation.
+        """
+        return self.analysis("maximum_matching")
+
+    def min_cost_assignment(self, perfect: bool = False) -> Matching:
+        """
+        :param perfect: if True, raise ValueError unless every vertex of both sides can be matched
+        :return: the cheapest among the maximum-cardinality matchings, found by successive shortest paths
+          with potentials. It is memoized until the next mutation.
+        """
+        return self.analysis("min_cost_assignment", perfect)
 
     def make_directional_graph(self)-> DirectionalGraph:
         """
         :return: Returns a directional graph and discards all the weights.
         """
         ans = DirectionalGraph()
-        for (i, j) in self._edges.keys():
-            ans.push_connection(i, j)
+        ans.push_connections(*self.edge_arrays())
         return ans
+
+    def freeze(self) -> CSRGraph:
+        """
+        :return: immutable CSR copy of the graph. Edges go from the left to the right side, costs become edge weights
+          and the side of each vertex is kept in the sides array.
+        """
+        src, dst = self.edge_arrays()
+        nodes = np.concatenate((self._left.array(), self._right.array()))
+        sides = np.repeat(np.array([0, 1], dtype=np.int8), [len(self._left), len(self._right)])
+        return CSRGraph.CreateFromEdgeArrays(nodes, src, dst, directed=True, edge_weights=self._costs, sides=sides)
+
+    def save(self, path: str):
+        """
+        Saves the graph into a compact binary file (see storage.write_arrays), which load() can memory-map.
+        """
+        save_graph(path, type(self).__name__, self.freeze())
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "DiGraph":
+        _, csr, _, _ = read_graph(path, mmap=mmap)
+        return csr.thaw_into(DiGraph())
+
     @overrides
     def dfs(self, start: int, discovered: dict[int, int] = None, processed: dict[int, int] = None,
             parents: dict[int, int] = None, process_vertex_early: ProcessVertex = None,
@@ -164,7 +572,9 @@ class DiGraph(IDirectionalGraph):
 
     @overrides
     def __eq__(self, other: IGraph):
-        raise NotImplementedError
+        if not isinstance(other, DiGraph):
+            return False
+        return self.freeze() == other.freeze()
 
     @overrides
     def plot(self) -> graphviz.Digraph:
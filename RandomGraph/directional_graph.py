@@ -1,125 +1,132 @@
 from __future__ import annotations
 
+import io
 from collections import defaultdict
+from typing import AbstractSet, Iterable, Optional
 
 import graphviz
 import numpy as np
 from overrides import overrides
 
+from .analysis_cache import register_analysis
+from .condensation import Condensation
 from .dense_graph import DenseGraph
+from .dot_writer import EdgeAttributes, NodeLabel, Sink, write_dot
+from .csr_graph import CSRGraph
+from .incremental_scc import IncrementalSCC
+from .edge_arrays import group_by_source, adjacency_to_edge_arrays, as_int_array
+from .loaders import IntTokenReader, Source
+from .node_index import NodeIndex
 from .ifaces import IDirectionalGraph, ProcessVertex, IGraph, ProcessEdge
+from .traversal import depth_first_search, reachable
+from .weights import WeightArray
+from .sampling import Seed, make_rng, sample_directed_edges
+from .scc import StronglyConnectedComponents
+from .storage import save_graph, read_graph
 
 
 class DirectionalGraph(IDirectionalGraph):
     _graph: dict[int, set[int]]  # for each node contains a list of children
     _reverse_graph: dict[int, set[int]]  # for each node contains a list of parents
-    _node_weights: dict[int, int]  # weight for each node
-    _edge_weights: dict[tuple[int, int], int]
-    _edge_weights_are_symmetrical: bool
+    _nodes: NodeIndex
+    _node_weights: Optional[WeightArray]  # weight of each node by its dense id in _nodes; None if all are one
+    _edge_weights: Optional[WeightArray]  # weight of each edge by its slot; None if all are one
+    _edge_slots: dict[int, dict[int, int]]  # parent -> child -> slot in _edge_weights; only (min, max) if symmetrical
+    _edge_weights_are_symmetrical: bool  # if True, i -> j and j -> i share a single weight
+    _incremental_scc: Optional[IncrementalSCC]  # kept up to date by the mutators once enabled
 
     @staticmethod
     def CreateFromString(s: str,
                          no_edge_weights: bool = True, no_node_weights: bool = True,
                          edge_weights_are_symmetrical: bool = True) -> DirectionalGraph:
         """ Ignores the weights """
+        return DirectionalGraph.CreateFromFile(io.BytesIO(s.encode()), no_edge_weights=no_edge_weights,
+                                               no_node_weights=no_node_weights,
+                                               edge_weights_are_symmetrical=edge_weights_are_symmetrical)
+
+    @staticmethod
+    def CreateFromFile(source: Source,
+                       no_edge_weights: bool = True, no_node_weights: bool = True,
+                       edge_weights_are_symmetrical: bool = True) -> DirectionalGraph:
+        """
+        Reads the format of __str__ from a path or a binary file object in chunks, without holding the whole file
+        in memory. The edges are inserted in blocks straight from the parsed arrays. Ignores the weights.
+        """
         assert no_edge_weights
         assert no_node_weights
         assert edge_weights_are_symmetrical
-        lines = s.splitlines()
         ans = DirectionalGraph()
-        n = int(lines[0])
-        for i in range(n):
-            ans._graph[i] = set()
-            ans._reverse_graph[i] = set()
-
-        m = int(lines[n + 1])
-        for i in range(m):
-            i, j = [int(el) for el in lines[i + n + 2].split()]
-            ans.push_connection(i, j)
+        with IntTokenReader(source) as reader:
+            n = reader.read_int()
+            ans.add_nodes(reader.read(n))
+
+            m = reader.read_int()
+            for edges in reader.read_edges(m):
+                ans.push_connections(edges[:, 0], edges[:, 1])
         return ans
 
     @overrides
     def __eq__(self, other: IGraph):
         if not isinstance(other, DirectionalGraph):
             return False
-        ans1 = self._graph == other._graph
-        ans2 = self._node_weights == other._node_weights
-        ans3 = self._edge_weights == other._edge_weights
-        return ans1 and ans2 and ans3
+        if self._graph != other._graph:
+            return False
+        if any(self.get_node_weight(i) != other.get_node_weight(i) for i in self.get_nodes()):
+            return False
+        return all(self.get_connection_weight(i, j) == other.get_connection_weight(i, j)
+                   for i, children in self._graph.items() for j in children)
 
     @staticmethod
-    def CreateRandom(N: int, link_density_factor: float = 0.5) -> DirectionalGraph:
-
+    def CreateRandom(N: int, link_density_factor: float = 0.5, seed: Seed = None) -> DirectionalGraph:
+        """
+        Creates a random G(N, p) graph with p = link_density_factor / 2.
+        Edges are sampled in bulk, so the cost is proportional to the number of edges rather than N².
+        :param seed: integer seed or numpy Generator; the same seed always yields the same graph.
+        """
         ans = DirectionalGraph()
 
         if N == 0:
             return ans
         p = min(1., link_density_factor / 2)
-        p = [p, 1 - p]
-        for i in range(N):
-            for j in range(N):
-                if i != j and np.random.choice([True, False], p=p):
-                    ans.push_connection(i, j)
+        src, dst = sample_directed_edges(N, p, make_rng(seed))
+        ans.add_nodes(np.arange(N))
+        ans.push_connections(src, dst)
 
         return ans
 
     def __init__(self, all_node_weights_equal_one: bool = True,
                  all_edge_weights_equal_one: bool = True, edge_weights_are_symmetrical: bool = True):
+        super().__init__()
         self._graph = defaultdict(set)
         self._reverse_graph = defaultdict(set)
-        if all_node_weights_equal_one:
-            self._node_weights = defaultdict(lambda: 1)
-        else:
-            self._node_weights = {}
-
-        if all_edge_weights_equal_one:
-            self._edge_weights = defaultdict(lambda: 1)
-        else:
-            self._edge_weights = {}
-
+        self._nodes = NodeIndex()
+        self._node_weights = None if all_node_weights_equal_one else WeightArray()
+        self._edge_weights = None if all_edge_weights_equal_one else WeightArray()
+        self._edge_slots = {}
         self._edge_weights_are_symmetrical = edge_weights_are_symmetrical
+        self._incremental_scc = None
 
     @overrides
     def __len__(self):
-        return len(self._node_weights)
-        # return len(set(self._graph.keys()).union(self._reverse_graph.keys()))
+        return len(self._nodes)
 
     @property
     @overrides
     def all_node_weights_must_be_one(self) -> bool:
-        if isinstance(self._node_weights, defaultdict):
-            return True
-        ans = all(weight == 1 for weight in self._node_weights.values())
-        if ans:
-            self._node_weights = defaultdict(lambda: 1)
-        return ans
+        return self._node_weights is None
 
     @property
     @overrides
     def all_edge_weights_must_be_one(self) -> bool:
-        if isinstance(self._edge_weights, defaultdict):
-            return True
-        ans = all(weight == 1 for weight in self._edge_weights.values())
-        if ans:
-            self._edge_weights = defaultdict(lambda: 1)
-        return ans
+        return self._edge_weights is None
 
     @property
     def reversed_graph(self) -> DirectionalGraph:
-        ans = DirectionalGraph(all_node_weights_equal_one=True,
-                               all_edge_weights_equal_one=True,
-                               edge_weights_are_symmetrical=self._edge_weights_are_symmetrical)
-        ans._graph = self._reverse_graph
-        ans._reverse_graph = self._graph
-        ans._node_weights = self._node_weights
-        if self.all_node_weights_must_be_one:
-            ans._edge_weights = defaultdict(lambda: 1)
-        else:
-            if self.all_edge_weights_must_be_one:
-                ans._edge_weights = defaultdict(lambda: 1)
-            else:
-                ans._edge_weights = {(edge2, edge1) for (edge1, edge2), weight in self._node_weights.items()}
-        return ans
+        """
+        :return: the graph with all the edges reversed. It shares the adjacency with this graph, is memoized
+          until the next mutation and must not be modified.
+        """
+        return self.analysis("reversed_graph")
 
     @overrides
     def get_children(self, i: int) -> set[int]:
@@ -143,7 +150,7 @@ class DirectionalGraph(IDirectionalGraph):
             ans = f"{len(nodes)}\n"
             ans += "\n".join(nodes)
 
-            conn = [f"{i} {j} {self.get_connection_weight[(i, j)]}" for i in range(len(self._graph)) for j in self._graph[i]]
+            conn = [f"{i} {j} {self.get_connection_weight(i, j)}" for i in range(len(self._graph)) for j in self._graph[i]]
             ans += f"\n{len(conn)}\n"
             ans += "\n".join(conn)
         return ans
@@ -151,56 +158,129 @@ class DirectionalGraph(IDirectionalGraph):
     def __contains__(self, i: int, j: int):
         return j in self._graph[i]
 
+    def _edge_slot(self, i: int, j: int) -> int:
+        if self._edge_weights_are_symmetrical and j < i:
+            return self._edge_slots[j][i]
+        return self._edge_slots[i][j]
+
+    def _set_edge_weight(self, i: int, j: int, cost: int):
+        if self._edge_weights_are_symmetrical and j < i:
+            i, j = j, i
+        slots = self._edge_slots.get(i)
+        if slots is None:
+            slots = self._edge_slots[i] = {}
+        slot = slots.get(j)
+        if slot is None:
+            slots[j] = self._edge_weights.allocate(cost)
+        else:
+            self._edge_weights[slot] = cost
+
+    def _release_edge_weight(self, i: int, j: int):
+        if self._edge_weights_are_symmetrical and j < i:
+            i, j = j, i
+        slots = self._edge_slots.get(i)
+        slot = None if slots is None else slots.pop(j, None)
+        if slot is not None:
+            self._edge_weights.release(slot)
+
+    def _reserve_node_weights(self):
+        if self._node_weights is not None:
+            self._node_weights.reserve(len(self._nodes))
+
     def push_connection(self, i: int, j: int, tag: str = None, cost: int = 1):
-        if self.all_node_weights_must_be_one:
+        if self.all_edge_weights_must_be_one:
             assert cost == 1
         assert tag is None
+        self._mutated()
+        is_new = i not in self._graph or j not in self._graph[i]
+        self._nodes.add(i)
+        self._nodes.add(j)
+        self._reserve_node_weights()
         self._graph[i].add(j)
         if j not in self._graph:
             self._graph[j] = set()
 
         self._reverse_graph[j].add(i)
         if i not in self._reverse_graph:
-            self._reverse_graph[j] = set()
+            self._reverse_graph[i] = set()
+
+        if self._edge_weights is not None:
+            self._set_edge_weight(i, j, cost)
+        if self._incremental_scc is not None and is_new:
+            self._incremental_scc.add_edge(i, j)
 
-        if not self.all_edge_weights_must_be_one:
+    @overrides
+    def push_connections(self, src, dst, costs=None, tags=None):
+        """
+        Vectorized push_connection: every adjacency set is updated once per call, not once per edge.
+        """
+        assert tags is None
+        self._mutated()
+        src = as_int_array(src)
+        dst = as_int_array(dst)
+        unweighted = self.all_edge_weights_must_be_one
+        if unweighted:
+            assert costs is None or np.all(np.asarray(costs) == 1)
+        if self._incremental_scc is not None:
+            new_edges = list(dict.fromkeys((i, j) for i, j in zip(src.tolist(), dst.tolist())
+                                           if i not in self._graph or j not in self._graph[i]))
+
+        add_node = self._nodes.add
+        for i, children in group_by_source(src, dst):
+            add_node(i)
+            self._graph[i].update(children)
+            if i not in self._reverse_graph:
+                self._reverse_graph[i] = set()
+        for j, parents in group_by_source(dst, src):
+            add_node(j)
+            self._reverse_graph[j].update(parents)
+            if j not in self._graph:
+                self._graph[j] = set()
+        self._reserve_node_weights()
+
+        if not unweighted:
             if self._edge_weights_are_symmetrical:
-                if i < j:
-                    self._edge_weights[(i, j)] = cost
-                else:
-                    self._edge_weights[(j, i)] = cost
+                src, dst = np.minimum(src, dst), np.maximum(src, dst)
+            edge_slots = self._edge_slots
+            allocate = self._edge_weights.allocate
+            slots = []
+            for i, j in zip(src.tolist(), dst.tolist()):
+                children = edge_slots.get(i)
+                if children is None:
+                    children = edge_slots[i] = {}
+                slot = children.get(j)
+                if slot is None:
+                    slot = children[j] = allocate(1)
+                slots.append(slot)
+            self._edge_weights.put(slots, np.ones(len(slots), dtype=np.int64) if costs is None else costs)
+
+        if self._incremental_scc is not None:
+            if len(new_edges) > len(self._nodes):
+                self._incremental_scc.rebuild()  # a batch this large is cheaper to redo in O(N+M)
             else:
-                self._edge_weights[(i, j)] = cost
+                for i, j in new_edges:
+                    self._incremental_scc.add_edge(i, j)
 
     @overrides
     def get_connection_weight(self, i: int, j: int) -> int:
-        assert i in self
-        if self.all_edge_weights_must_be_one:
+        assert j in self._graph[i]
+        if self._edge_weights is None:
             return 1
-        if self._edge_weights_are_symmetrical:
-            if i < j:
-                return self._edge_weights[(i, j)]
-            else:
-                return self._edge_weights[(j, i)]
-        else:
-            return self._edge_weights[(i, j)]
+        return self._edge_weights[self._edge_slot(i, j)]
 
     @overrides
     def plot(self, show_stronly_connected: bool = True) -> graphviz.Digraph:
         out = graphviz.Digraph()
 
         if show_stronly_connected:
-            cg = self.strongly_connected_components2()
+            scc = self.strongly_connected_component_labels()
+            component = scc.as_dict()
+            sizes = scc.sizes
         else:
-            cg = None
-        flag_cg = False
-
-        for node in range(len(self)):
-            flag_cg = False
-            if show_stronly_connected:
-                if node in cg.get_nodes():
-                    if len(cg.get_children(node)) > 1:
-                        flag_cg = True
+            component = None
+
+        for node in self.get_nodes():
+            flag_cg = show_stronly_connected and node in component and sizes[component[node]] > 1
             node_label = f"{node}" if self.all_node_weights_must_be_one else f"{node} ({self.get_node_weight(node)})"
             if flag_cg:
                 out.node(str(node), label=node_label, style="filled", color="gray")
@@ -213,7 +293,7 @@ class DirectionalGraph(IDirectionalGraph):
                     edge_label = None
                 else:
                     edge_label = f"{self.get_connection_weight(node, child)}"
-                if show_stronly_connected and child in cg.get_children(node):
+                if show_stronly_connected and component[child] == component[node]:
                     if node in self.get_children(child):
                         if node < child:
                             continue
@@ -226,23 +306,37 @@ class DirectionalGraph(IDirectionalGraph):
                     out.edge(str(node), str(child), arrowhead="normal", arrowtail="none", label=edge_label)
         return out
 
+    def write_dot(self, out: Sink, collapse_components: bool = False, around: Iterable[int] = None, hops: int = 1):
+        """
+        Streams the graph as DOT into a path or a text file object, see dot_writer.write_dot. Draws the same
+        picture as plot(), but scales to large graphs.
+        :param collapse_components: if True, every strongly connected component becomes a single node
+        :param around: if given, only the nodes at most hops edges away from these nodes are written
+        """
+        write_dot(out, self.analysis("frozen"), condensation=self.condensation(),
+                  collapse_components=collapse_components, around=around, hops=hops, node_label=self._dot_node_label(),
+                  edge_attributes=self._dot_edge_attributes())
+
+    def _dot_node_label(self) -> Optional[NodeLabel]:
+        if self.all_node_weights_must_be_one:
+            return None
+        return lambda node: f"{node} ({self.get_node_weight(node)})"
+
+    def _dot_edge_attributes(self) -> Optional[EdgeAttributes]:
+        if self.all_edge_weights_must_be_one:
+            return None
+        return lambda node, child: f'label="{self.get_connection_weight(node, child)}"'
+
+    @overrides
+    def get_nodes(self) -> AbstractSet[int]:
+        return self._nodes.view()
+
     @overrides
-    def get_nodes(self) -> set[int]:
-        return set(self._graph.keys()).union(set(self._reverse_graph.keys()))
+    def nodes_array(self) -> np.ndarray:
+        return self._nodes.array()
 
     def _dfs(self, i: int, visited: set = None) -> set[int]:
-        if visited is None:
-            visited = set()
-        visited.add(i)
-        for child in self.get_children(i):
-            if child not in visited:
-                self._dfs(child, visited)
-        return visited
-
-    def _dfs2(self, i: int) -> dict[int, int]:
-        visited = {}
-        self.dfs(start=i, discovered=visited)
-        return visited
+        return reachable(i, self._graph.__getitem__, visited)
 
     @overrides
     def dfs(self, start: int, discovered: dict[int, int] = None,
@@ -251,151 +345,123 @@ class DirectionalGraph(IDirectionalGraph):
             process_vertex_early: ProcessVertex = None, process_edge: ProcessEdge = None,
             process_vertex_late: ProcessVertex = None) -> int:
 
-        if discovered is None:
-            discovered = {}
-        if processed is None:
-            processed = {}
-
-        parents = {}
-
-        time = 0
-
-        def _dfs(node: int) -> bool:
-            nonlocal time, discovered, processed, parents
-            time += 1
-            discovered[node] = time
-
-            if process_vertex_early:
-                finish = process_vertex_early(node)
-
-                if finish:
-                    return True
-
-            children = list(self.get_children(node))
-            children.sort()
-
-            for child in children:
-                if child not in discovered:
-                    parents[child] = node
-                    if process_edge:
-                        finish = process_edge(parent=node, child=child)
-                        if finish:
-                            return True
-                    finish = _dfs(child)
-                    if finish:
-                        return True
-                else:
-                    if process_edge:
-                        finish = process_edge(parent=node, child=child)
-                        if finish:
-                            return True
-            if process_vertex_late:
-                finish = process_vertex_late(node)
-                if finish:
-                    return True
-            time += 1
-            processed[node] = time
-            return False
+        return depth_first_search(start, self._graph.__getitem__, directed=True,
+                                  discovered=discovered, processed=processed, parents=parents,
+                                  process_vertex_early=process_vertex_early, process_edge=process_edge,
+                                  process_vertex_late=process_vertex_late)
+
+    def freeze(self) -> CSRGraph:
+        """
+        :return: immutable CSR copy of the graph with both the forward and the reverse adjacency.
+        """
+        nodes = self.nodes_array()
+        src, dst = adjacency_to_edge_arrays(self._graph)
+        edge_weights = None
+        if self._edge_weights is not None:
+            edge_slot = self._edge_slot
+            edge_weights = self._edge_weights.take([edge_slot(i, j) for i, j in zip(src.tolist(), dst.tolist())])
+        node_weights = None
+        if self._node_weights is not None:
+            node_weights = self._node_weights.head(len(nodes))
+        return CSRGraph.CreateFromEdgeArrays(nodes, src, dst, directed=True,
+                                             edge_weights=edge_weights, node_weights=node_weights)
+
+    def save(self, path: str):
+        """
+        Saves the graph into a compact binary file (see storage.write_arrays), which load() can memory-map.
+        """
+        save_graph(path, type(self).__name__, self.freeze(),
+                   meta={"edge_weights_are_symmetrical": self._edge_weights_are_symmetrical})
 
-        _dfs(start)
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> DirectionalGraph:
+        _, csr, meta, _ = read_graph(path, mmap=mmap)
+        ans = DirectionalGraph(all_node_weights_equal_one=csr.node_weights is None,
+                               all_edge_weights_equal_one=csr.edge_weights is None,
+                               edge_weights_are_symmetrical=meta.get("edge_weights_are_symmetrical", True))
+        return csr.thaw_into(ans)
 
     def _dfs_reversed(self, i: int, visited: set = None) -> set[int]:
-        if visited is None:
-            visited = set()
-        visited.add(i)
-        for j in self._reverse_graph[i]:
-            if j not in visited:
-                self._dfs_reversed(j, visited)
-        return visited
+        return reachable(i, self._reverse_graph.__getitem__, visited)
+
+    def strongly_connected_component_labels(self) -> StronglyConnectedComponents:
+        """
+        :return: strongly connected components as a label array, computed by the iterative Tarjan's algorithm
+          in O(N+M). Components are numbered in a topological order of the condensation.
+          With the incremental SCC enabled they are read from it instead.
+        """
+        if self._incremental_scc is not None:
+            return self._incremental_scc.labels()
+        return self.analysis("strongly_connected_components")
+
+    def enable_incremental_scc(self) -> IncrementalSCC:
+        """
+        Starts maintaining the strongly connected components incrementally: from now on every mutation of the graph
+        updates them, so component queries are O(1) and no full recomputation is ever needed.
+        Meant for workflows that interleave many small mutations with SCC queries.
+        :return: the maintained components.
+        """
+        if self._incremental_scc is None:
+            self._incremental_scc = IncrementalSCC(self)
+        return self._incremental_scc
+
+    def disable_incremental_scc(self):
+        self._incremental_scc = None
 
-    def _dfs_reversed2(self, i: int) -> dict[int, int]:
-        visited = {}
-        reversed = self.reversed_graph
-        reversed.dfs(start=i, discovered=visited)
-        return visited
-
-    def strongly_connected_components(self) -> DenseGraph:
-        # Kosaraju's algorithm
-        ans = DenseGraph()
-        all_visited = set()
-        for i in self.get_nodes():
-            if i in all_visited:
-                continue
-
-            visited1 = set(self._dfs2(i).keys())
-
-            visited2 = set(self._dfs_reversed2(i).keys())
+    @property
+    def incremental_scc(self) -> Optional[IncrementalSCC]:
+        return self._incremental_scc
 
-            visited2.intersection_update(visited1)
-            all_visited.update(visited2)
+    def condensation(self) -> Condensation:
+        """
+        :return: the DAG of the strongly connected components with the node -> component mapping, the component
+          weights and their topological order, computed in O(N+M). The result is cached until the next mutation
+          of the graph and must not be modified.
+        """
+        return self.analysis("condensation")
 
-            for j in visited2:
-                for k in self._graph[i]:
-                    if k in visited2:
-                        ans.push_connection(j, k)
-                else:
-                    ans.add_node(j)
-
-        return ans
+    def strongly_connected_components(self) -> DenseGraph:
+        return self.strongly_connected_component_labels().as_dense_graph()
 
     def strongly_connected_components2(self) -> DenseGraph:
-        # Kosaraju's algorithm
-        ans = DenseGraph()
-        all_visited = set()
-        visited_stack = []
-
-        def visit(i: int):
-            if i in all_visited:
-                return
-            all_visited.add(i)
-            for j in self._graph[i]:
-                visit(j)
-            visited_stack.append(i)
-
-        for i in self.get_nodes():
-            if i in all_visited:
-                continue
-            visit(i)
-
-        def assign(i: int, root: int, ans: DenseGraph):
-            if i in ans:
-                return
-            ans.push_connection(i, root)
-            for j in self._reverse_graph[i]:
-                assign(j, root, ans)
-
-        for i in reversed(visited_stack):
-            assign(i, i, ans)
-
-        return ans
+        return self.strongly_connected_component_labels().as_dense_graph()
 
     @overrides
     def remove_node(self, i: int):
+        self._mutated()
+        if self._edge_weights is not None:
+            for j in self._graph[i]:
+                self._release_edge_weight(i, j)
+            for j in self._reverse_graph[i]:
+                self._release_edge_weight(j, i)
         for j in self._graph[i]:
-            if (i, j) in self._edge_weights:
-                del self._edge_weights[(i, j)]
-            if (j, i) in self._edge_weights:
-                del self._edge_weights[(j, i)]
             self._reverse_graph[j].remove(i)
         for j in self._reverse_graph[i]:
             self._graph[j].remove(i)
         del self._graph[i]
         del self._reverse_graph[i]
-        del self._node_weights[i]
+        position, last = self._nodes.remove(i)
+        if self._node_weights is not None:
+            self._node_weights.move(last, position)
+        if self._incremental_scc is not None:
+            self._incremental_scc.remove_node(i)
 
 
     @overrides
     def get_node_weight(self, i: int) -> int:
-        return self._node_weights[i]
+        if self._node_weights is None:
+            return 1
+        return self._node_weights[self._nodes.position(i)]
 
     @overrides
     def remove_connection(self, i: int, j: int):
-        if (i, j) in self._edge_weights:
-            del self._edge_weights[(i, j)]
-        if (j, i) in self._edge_weights:
-            del self._edge_weights[(j, i)]
+        self._mutated()
         self._graph[i].remove(j)
         self._reverse_graph[j].remove(i)
+        if self._edge_weights is not None and not (self._edge_weights_are_symmetrical and i in self._graph[j]):
+            self._release_edge_weight(i, j)
+        if self._incremental_scc is not None:
+            self._incremental_scc.remove_edge(i, j)
 
     @overrides
     def remove_unconnected_nodes(self):
@@ -405,19 +471,82 @@ class DirectionalGraph(IDirectionalGraph):
 
     @overrides
     def add_node(self, i: int, weight: int = 1):
-        self._graph[i] = set()
-        self._reverse_graph[i] = set()
-        if self.all_node_weights_must_be_one:
+        self._mutated()
+        position = self._nodes.add(i)
+        if i not in self._graph:
+            self._graph[i] = set()
+        if i not in self._reverse_graph:
+            self._reverse_graph[i] = set()
+        if self._node_weights is None:
             assert weight == 1
         else:
-            self._node_weights[i] = weight
+            self._node_weights.reserve(position + 1)
+            self._node_weights[position] = weight
+        if self._incremental_scc is not None:
+            self._incremental_scc.add_node(i)
+
+    @overrides
+    def add_nodes(self, ids, weights=None):
+        self._mutated()
+        ids = as_int_array(ids).tolist()
+        self._nodes.add_many(ids)
+        for i in ids:
+            if i not in self._graph:
+                self._graph[i] = set()
+            if i not in self._reverse_graph:
+                self._reverse_graph[i] = set()
+        if self._node_weights is None:
+            assert weights is None or np.all(np.asarray(weights) == 1)
+        else:
+            self._reserve_node_weights()
+            if weights is not None:
+                position = self._nodes.position
+                self._node_weights.put([position(i) for i in ids], as_int_array(weights))
+        if self._incremental_scc is not None:
+            for i in ids:
+                self._incremental_scc.add_node(i)
 
     def find_cut_nodes(self) -> set[int]:
-        ans = set()
-        for i in self.get_nodes():
-            if len(self.get_children(i)) > 1:
-                continue
-            if len(self._reverse_graph[i]) > 1:
-                continue
-            ans.add(i)
-        return ans
+        """
+        :return: nodes with at most one child and at most one parent.
+        """
+        nodes, out_degree, in_degree = self.analysis("degrees")
+        return set(nodes[(out_degree <= 1) & (in_degree <= 1)].tolist())
+
+
+@register_analysis("reversed_graph", csr=False)
+def _reversed_graph(graph: DirectionalGraph) -> DirectionalGraph:
+    ans = DirectionalGraph(all_node_weights_equal_one=True,
+                           all_edge_weights_equal_one=True,
+                           edge_weights_are_symmetrical=graph._edge_weights_are_symmetrical)
+    ans._graph = graph._reverse_graph
+    ans._reverse_graph = graph._graph
+    ans._nodes = graph._nodes
+    ans._node_weights = graph._node_weights
+    ans._edge_weights = graph._edge_weights
+    if graph._edge_weights is None or graph._edge_weights_are_symmetrical:
+        ans._edge_slots = graph._edge_slots
+    else:
+        for i, children in graph._edge_slots.items():
+            for j, slot in children.items():
+                ans._edge_slots.setdefault(j, {})[i] = slot
+    return ans
+
+
+@register_analysis("strongly_connected_components")
+def _strongly_connected_components(graph: DirectionalGraph) -> StronglyConnectedComponents:
+    return graph.analysis("frozen").strongly_connected_component_labels()
+
+
+@register_analysis("condensation")
+def _condensation(graph: DirectionalGraph) -> Condensation:
+    return Condensation.CreateFromCSR(graph.analysis("frozen"))
+
+
+@register_analysis("degrees")
+def _degrees(graph: DirectionalGraph) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :return: tuple of (nodes, number of children, number of parents), all aligned with the sorted nodes.
+    """
+    frozen = graph.analysis("frozen")
+    return frozen.nodes, np.diff(frozen.indptr), np.diff(frozen.reverse_indptr)
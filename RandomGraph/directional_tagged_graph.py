@@ -1,9 +1,13 @@
 from typing import Optional
 
 import graphviz
+import numpy as np
 
 from .directional_graph import DirectionalGraph
-from .ifaces import IGraph
+from .dot_writer import EdgeAttributes
+from .edge_arrays import as_int_array
+from .ifaces import IGraph, as_list
+from .storage import save_graph, read_graph
 
 
 class DirectionalTaggedGraph(DirectionalGraph):
@@ -22,12 +26,48 @@ class DirectionalTaggedGraph(DirectionalGraph):
         else:
             self.tags[(j, i)] = tag
 
+    def push_connections(self, src, dst, costs=None, tags=None):
+        assert costs is None or np.all(np.asarray(costs) == 1)
+        src = as_int_array(src)
+        dst = as_int_array(dst)
+        super().push_connections(src, dst)
+        tags = [None] * len(src) if tags is None else as_list(tags)
+        self.tags.update(zip(zip(np.minimum(src, dst).tolist(), np.maximum(src, dst).tolist()), tags))
+
     def get_tag(self, i: int, j: int) -> Optional[str]:
         if i < j:
             return self.tags.get((i, j), None)
         else:
             return self.tags.get((j, i), None)
 
+    def save(self, path: str):
+        """
+        Saves the graph together with its tags, see DirectionalGraph.save.
+        """
+        names = sorted({tag for tag in self.tags.values() if tag is not None})
+        codes = {name: code for code, name in enumerate(names)}
+        codes[None] = -1
+        extra = {"tag_src": np.fromiter((i for i, _ in self.tags.keys()), dtype=np.int64, count=len(self.tags)),
+                 "tag_dst": np.fromiter((j for _, j in self.tags.keys()), dtype=np.int64, count=len(self.tags)),
+                 "tag_codes": np.fromiter((codes[tag] for tag in self.tags.values()), dtype=np.int32,
+                                          count=len(self.tags))}
+        save_graph(path, type(self).__name__, self.freeze(), meta={"tag_names": names}, extra=extra)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "DirectionalTaggedGraph":
+        _, csr, meta, extra = read_graph(path, mmap=mmap)
+        ans = csr.thaw_into(DirectionalTaggedGraph())
+        names = meta["tag_names"]
+        ans.tags = {(i, j): names[code] if code >= 0 else None for i, j, code in
+                    zip(extra["tag_src"].tolist(), extra["tag_dst"].tolist(), extra["tag_codes"].tolist())}
+        return ans
+
+    def _dot_edge_attributes(self) -> Optional[EdgeAttributes]:
+        def attributes(node: int, child: int) -> str:
+            tag = self.get_tag(node, child)
+            return "" if tag is None else f'style="{tag}"'
+        return attributes
+
     def plot(self, **kwargs):
         out = graphviz.Digraph()
         for node in self.get_nodes():
@@ -50,3 +90,4 @@ class DirectionalTaggedGraph(DirectionalGraph):
             return False
         if self.tags != other.tags:
             return False
+        return True
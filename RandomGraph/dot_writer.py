@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import contextlib
+import os
+from typing import Callable, Iterable, Optional, TextIO, Union
+
+import numpy as np
+
+from .bfs import expand_frontier
+from .condensation import Condensation
+from .csr_graph import CSRGraph
+from .scc import StronglyConnectedComponents
+
+Sink = Union[str, os.PathLike, TextIO]
+NodeLabel = Callable[[int], str]  # node id -> label
+EdgeAttributes = Callable[[int, int], str]  # (parent id, child id) -> extra DOT attributes, e.g. 'style="dotted"'
+
+LINE_BLOCK = 1 << 16  # lines written at once
+
+
+def _quote(text: str) -> str:
+    return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def has_edges(indptr: np.ndarray, indices: np.ndarray, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    Vectorized binary search of every dst in the sorted CSR row of its src.
+    :return: boolean mask, True where the edge src[k] -> dst[k] exists.
+    """
+    low = indptr[src].astype(np.int64)
+    high = indptr[src + 1].astype(np.int64)
+    while True:
+        active = low < high
+        if not np.any(active):
+            break
+        middle = (low + high) // 2
+        below = active & (indices[np.minimum(middle, len(indices) - 1)] < dst)
+        low = np.where(below, middle + 1, low)
+        high = np.where(active & ~below, middle, high)
+    found = low < indptr[src + 1]
+    found[found] = indices[low[found]] == dst[found]
+    return found
+
+
+def neighbourhood(graph: CSRGraph, around: Iterable[int], hops: int) -> np.ndarray:
+    """
+    :param around: ids of the central nodes
+    :param hops: how far to go; edges are followed in both directions
+    :return: boolean mask over graph.nodes of the nodes at most hops edges away from any of the central nodes.
+    """
+    selected = np.zeros(len(graph), dtype=bool)
+    frontier = np.fromiter((graph.position(i) for i in around), dtype=np.int64)
+    selected[frontier] = True
+    for _ in range(hops):
+        _, found = expand_frontier(graph.indptr, graph.indices, frontier)
+        if graph.directed:
+            _, parents = expand_frontier(graph.reverse_indptr, graph.reverse_indices, frontier)
+            found = np.concatenate((found, parents))
+        frontier = np.unique(found[~selected[found]])
+        if len(frontier) == 0:
+            break
+        selected[frontier] = True
+    return selected
+
+
+class DotWriter:
+    """Writes a graph in the DOT language line by line, straight from its frozen CSR arrays.
+
+    Unlike plot(), the edges are converted and written one block of CSR rows at a time, so apart from a few
+    flags per node only a block of edges is ever held as Python objects, and it scales to graphs with millions
+    of edges. It draws the same edges as DirectionalGraph.plot: nodes of non-trivial strongly connected
+    components are filled gray, edges inside a component have no arrows and a pair of opposite edges is drawn
+    as a single edge.
+    """
+
+    _out: TextIO
+    _lines: list[str]
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._lines = []
+
+    def _write(self, line: str):
+        self._lines.append(line)
+        if len(self._lines) >= LINE_BLOCK:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._out.write("\n".join(self._lines))
+            self._out.write("\n")
+            self._lines = []
+
+    def write_graph(self, graph: CSRGraph, components: Optional[StronglyConnectedComponents] = None,
+                    selected: Optional[np.ndarray] = None, node_label: NodeLabel = None,
+                    edge_attributes: EdgeAttributes = None):
+        """
+        :param components: components of a directed graph; nodes of the non-trivial ones are filled gray
+          and the edges inside them are drawn without arrows
+        :param selected: optional boolean mask over graph.nodes; only the subgraph induced by it is written
+        :param node_label: label of each node, the node id by default
+        :param edge_attributes: extra attributes of each edge
+        """
+        nodes = graph.nodes
+        n = len(nodes)
+        self._write("digraph {" if graph.directed else "graph {")
+        if selected is None:
+            selected = np.ones(n, dtype=bool)
+        gray = None
+        if components is not None:
+            gray = components.sizes[components.component_id] > 1
+
+        for start in range(0, n, LINE_BLOCK):
+            block = np.flatnonzero(selected[start:start + LINE_BLOCK]) + start
+            for k, i in zip(block.tolist(), nodes[block].tolist()):
+                attributes = [] if node_label is None else [f"label={_quote(node_label(i))}"]
+                if gray is not None and gray[k]:
+                    attributes.append('style="filled" color="gray"')
+                self._write(f"{i} [{' '.join(attributes)}]" if attributes else f"{i}")
+
+        start = 0
+        while start < n:
+            # Rows up to the one that reaches LINE_BLOCK edges, at least one row
+            end = max(int(np.searchsorted(graph.indptr, graph.indptr[start] + LINE_BLOCK, side="right")) - 1,
+                      start + 1)
+            end = min(end, n)
+            self._write_edges(graph, start, end, selected, components, edge_attributes)
+            start = end
+        self._write("}")
+        self.flush()
+
+    def _write_edges(self, graph: CSRGraph, start: int, end: int, selected: np.ndarray,
+                     components: Optional[StronglyConnectedComponents], edge_attributes: EdgeAttributes):
+        """
+        Writes the edges of the rows range(start, end) of the CSR.
+        """
+        nodes = graph.nodes
+        src = np.repeat(np.arange(start, end, dtype=np.int64), np.diff(graph.indptr[start:end + 1]))
+        dst = graph.indices[graph.indptr[start]:graph.indptr[end]].astype(np.int64)
+        keep = selected[src] & selected[dst]
+        src, dst = src[keep], dst[keep]
+        if not graph.directed:
+            keep = src <= dst
+            src, dst = src[keep], dst[keep]
+            mutual = np.zeros(len(src), dtype=bool)
+            same = np.zeros(len(src), dtype=bool)
+        else:
+            # Like plot(): an edge inside a component has no arrows and of a mutual pair only one edge is drawn,
+            # the one from the larger node inside a component and from the smaller one between components
+            reverse = has_edges(graph.indptr, graph.indices, dst, src)
+            same = np.zeros(len(src), dtype=bool) if components is None else \
+                components.component_id[src] == components.component_id[dst]
+            mutual = reverse & ~same & (src != dst)
+            keep = np.where(same, ~reverse | (src >= dst), ~mutual | (src < dst))
+            src, dst, mutual, same = src[keep], dst[keep], mutual[keep], same[keep]
+
+        arrow = " -> " if graph.directed else " -- "
+        for u, v, is_mutual, is_same in zip(nodes[src].tolist(), nodes[dst].tolist(), mutual.tolist(),
+                                            same.tolist()):
+            attributes = []
+            if is_same:
+                attributes.append('dir="both" arrowhead="none" arrowtail="none"')
+            elif is_mutual:
+                attributes.append('dir="both" arrowhead="normal" arrowtail="normal"')
+            if edge_attributes is not None:
+                extra = edge_attributes(u, v)
+                if extra:
+                    attributes.append(extra)
+            self._write(f"{u}{arrow}{v} [{' '.join(attributes)}]" if attributes else f"{u}{arrow}{v}")
+
+    def write_condensation(self, condensation: Condensation, node_label: NodeLabel = None):
+        """
+        Writes one node per strongly connected component and the edges of the condensation.
+        Components are named c0, c1, ... in topological order; a trivial component keeps the label of its node.
+        """
+        components = condensation.components
+        self._write("digraph {")
+        representative = np.zeros(len(components), dtype=np.int64)
+        representative[components.component_id] = components.nodes
+        for c, (size, i) in enumerate(zip(components.sizes.tolist(), representative.tolist())):
+            if size == 1:
+                label = str(i) if node_label is None else node_label(i)
+                self._write(f"c{c} [label={_quote(label)}]")
+            else:
+                self._write(f'c{c} [label="{size} nodes" shape="box" style="filled" color="gray"]')
+
+        src, dst = condensation.dag.edge_arrays()
+        for a, b in zip(src.tolist(), dst.tolist()):
+            self._write(f"c{a} -> c{b}")
+        self._write("}")
+        self.flush()
+
+
+@contextlib.contextmanager
+def _open(out: Sink):
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "w") as f:
+            yield f
+    else:
+        yield out
+
+
+def write_dot(out: Sink, graph: CSRGraph, components: Optional[StronglyConnectedComponents] = None,
+              condensation: Optional[Condensation] = None, collapse_components: bool = False,
+              around: Iterable[int] = None, hops: int = 1, node_label: NodeLabel = None,
+              edge_attributes: EdgeAttributes = None):
+    """
+    Streams a frozen graph as DOT to a path or a text file object.
+    :param components: strongly connected components of a directed graph, computed if needed and not given
+    :param condensation: condensation of a directed graph, computed if needed and not given
+    :param collapse_components: if True, every strongly connected component becomes a single node
+    :param around: if given, only the nodes at most hops edges away from these nodes are written
+    :param node_label: label of each node, the node id by default
+    :param edge_attributes: extra DOT attributes of each edge
+    """
+    if collapse_components and not graph.directed:
+        raise ValueError("Only the strongly connected components of a directed graph can be collapsed")
+    if collapse_components and condensation is None:
+        condensation = Condensation.CreateFromCSR(graph)
+    if graph.directed and components is None:
+        components = condensation.components if condensation is not None else \
+            graph.strongly_connected_component_labels()
+    with _open(out) as f:
+        writer = DotWriter(f)
+        if collapse_components:
+            writer.write_condensation(condensation, node_label=node_label)
+            return
+        selected = None if around is None else neighbourhood(graph, around, hops)
+        writer.write_graph(graph, components, selected=selected, node_label=node_label,
+                           edge_attributes=edge_attributes)
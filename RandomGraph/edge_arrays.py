@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterator
+
+import numpy as np
+
+
+def group_by_source(src: np.ndarray, dst: np.ndarray) -> Iterator[tuple[int, list[int]]]:
+    """
+    Groups an edge list by its source node.
+    :param src: array of source nodes
+    :param dst: array of target nodes, the same length as src
+    :return: iterator of (source node, list of its targets), in increasing order of the source node.
+    """
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    assert src.shape == dst.shape
+    if len(src) == 0:
+        return
+    if np.any(src[1:] < src[:-1]):
+        order = np.argsort(src, kind="stable")
+        src = src[order]
+        dst = dst[order]
+    boundaries = np.flatnonzero(src[1:] != src[:-1]) + 1
+    starts = [0] + boundaries.tolist()
+    ends = boundaries.tolist() + [len(src)]
+    keys = src[starts].tolist()
+    targets = dst.tolist()
+    for key, start, end in zip(keys, starts, ends):
+        yield key, targets[start:end]
+
+
+def adjacency_to_edge_arrays(adjacency: dict[int, set[int]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flattens a dict-of-sets adjacency into an edge list.
+    :return: tuple of (src, dst) int64 arrays, one entry per (key, element of its set).
+    """
+    lengths = [len(children) for children in adjacency.values()]
+    src = np.repeat(np.fromiter(adjacency.keys(), dtype=np.int64, count=len(adjacency)), lengths)
+    dst = np.fromiter(chain.from_iterable(adjacency.values()), dtype=np.int64, count=sum(lengths))
+    return src, dst
+
+
+def as_int_array(values) -> np.ndarray:
+    """
+    :return: values (a NumPy array or any iterable of integers) as an int64 array.
+    """
+    if isinstance(values, np.ndarray):
+        return values.astype(np.int64, copy=False)
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    return np.array(values, dtype=np.int64)
+
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from .ifaces import IGraph
+from .storage import dumps_graph, load_graph
+
+EnsembleSeed = Union[None, int, np.random.SeedSequence]
+CORPUS_FILE_NAME = "graph_{:06d}.bin"
+
+
+class GraphSpec:
+    """Recipe of a random graph: a graph class and the arguments of its CreateRandom, except the seed.
+
+    Example: GraphSpec(AgenciGraph, N=1000, link_density_factor=0.01, agent_ratio=0.5).
+    """
+
+    graph_class: type
+    params: dict
+
+    def __init__(self, graph_class: type, **params):
+        assert hasattr(graph_class, "CreateRandom")
+        self.graph_class = graph_class
+        self.params = params
+
+    def create(self, seed: np.random.SeedSequence) -> IGraph:
+        return self.graph_class.CreateRandom(**self.params, seed=seed)
+
+    def __repr__(self):
+        params = ", ".join(f"{name}={value!r}" for name, value in self.params.items())
+        return f"GraphSpec({self.graph_class.__name__}, {params})"
+
+
+def ensemble_seeds(seed: EnsembleSeed, count: int) -> list[np.random.SeedSequence]:
+    """
+    :return: independent seeds of the graphs of an ensemble. The k-th seed only depends on seed and k,
+      so the first graphs of a larger ensemble are the same as those of a smaller one.
+    """
+    base = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return base.spawn(count)
+
+
+def _generate(spec: GraphSpec, seed: np.random.SeedSequence) -> bytes:
+    return dumps_graph(spec.create(seed))
+
+
+def _generate_star(task: tuple[GraphSpec, np.random.SeedSequence]) -> bytes:
+    return _generate(*task)
+
+
+def _generate_into(spec: GraphSpec, seed: np.random.SeedSequence, path: str) -> str:
+    spec.create(seed).save(path)
+    return path
+
+
+def generate_ensemble(spec: GraphSpec, count: int, seed: EnsembleSeed = None, processes: Optional[int] = None,
+                      chunksize: int = 1) -> Iterator[bytes]:
+    """
+    Generates count random graphs in a pool of processes, every graph with its own child of the seed.
+    :param processes: number of worker processes, os.cpu_count() by default; 0 generates in this process
+    :param chunksize: number of graphs a worker generates per task; raise it for many small graphs
+    :return: iterator over the graphs in the order of their seeds, each in the compact binary form of
+      storage.dumps_graph. Turn them into graphs with storage.loads_graph.
+    """
+    seeds = ensemble_seeds(seed, count)
+    if processes == 0:
+        for child in seeds:
+            yield _generate(spec, child)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(_generate_star, [(spec, child) for child in seeds], chunksize=chunksize)
+
+
+def write_corpus(spec: GraphSpec, count: int, directory: Union[str, os.PathLike], seed: EnsembleSeed = None,
+                 processes: Optional[int] = None, chunksize: int = 1) -> list[str]:
+    """
+    Like generate_ensemble, but every worker saves its graphs straight into the directory, see load_corpus.
+    :return: paths of the files, in the order of the seeds.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(spec, child, os.path.join(directory, CORPUS_FILE_NAME.format(k)))
+             for k, child in enumerate(ensemble_seeds(seed, count))]
+    if processes == 0:
+        return [_generate_into(*task) for task in tasks]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(_generate_into, tasks, chunksize=chunksize)
+
+
+def corpus_files(directory: Union[str, os.PathLike]) -> list[str]:
+    """
+    :return: sorted paths of the graph files of a corpus written by write_corpus.
+    """
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith("graph_") and name.endswith(".bin"))
+
+
+def load_corpus(directory: Union[str, os.PathLike], mmap: bool = True) -> Iterator[IGraph]:
+    """
+    :return: iterator over the graphs of a corpus written by write_corpus.
+    """
+    for path in corpus_files(directory):
+        yield load_graph(path, mmap=mmap)
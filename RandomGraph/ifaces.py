@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from abc import abstractmethod, ABC
 from enum import Enum
-from typing import Callable, Protocol, Optional, Iterator
+from typing import AbstractSet, Callable, Iterable, Protocol, Optional, Iterator
 
 import graphviz
+import numpy as np
+
+from .analysis_cache import AnalysisCache
+from .bfs import BreadthFirstSearch, Start
 
 
 class EdgeType(Enum):
@@ -14,6 +18,15 @@ class EdgeType(Enum):
     CROSS = 3
 
 
+def as_list(values) -> list:
+    """
+    :return: values (a NumPy array or any iterable) as a list of Python objects.
+    """
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return list(values)
+
+
 def fun(int, str) -> int:
     pass
 
@@ -43,11 +56,48 @@ class ProcessEdge(Protocol):
 
 
 class IGraph(ABC):
+    _version: int  # mutation counter, bumped by every mutator
+    _analyses: AnalysisCache
+
+    def __init__(self):
+        self._version = 0
+        self._analyses = AnalysisCache()
+
+    @property
+    def version(self) -> int:
+        """
+        :return: number of mutations of the graph so far. Equal versions mean an unchanged graph.
+        """
+        return self._version
+
+    def _mutated(self):
+        self._version += 1
+
+    def analysis(self, name: str, *params):
+        """
+        :return: result of the registered analysis name (see analysis_cache.register_analysis) with the given
+          hashable parameters. It is memoized until the next mutation of the graph and must not be modified.
+        """
+        return self._analyses.get(self, name, params, self._version)
+
 
     @abstractmethod
     def push_connection(self, i: int, j: int, tag: Optional[str] = None, cost:int = 1):
         pass
 
+    def push_connections(self, src, dst, costs=None, tags=None):
+        """
+        Pushes many connections at once: src[k] -> dst[k] with cost costs[k] and tag tags[k].
+        All the arguments are NumPy arrays or iterables of the same length; costs and tags are optional.
+        Graphs override it with a vectorized implementation, this fallback calls push_connection for every edge.
+        """
+        src = as_list(src)
+        dst = as_list(dst)
+        costs = [1] * len(src) if costs is None else as_list(costs)
+        tags = [None] * len(src) if tags is None else as_list(tags)
+        for i, j, cost, tag in zip(src, dst, costs, tags):
+            self.push_connection(i, j, tag=tag, cost=cost)
+
     @abstractmethod
     def get_connection_weight(self, i: int, j: int) -> int:
         pass
@@ -91,9 +141,19 @@ class IGraph(ABC):
     def __len__(self):
         pass
 
-    # @abstractmethod
-    # def bfs(self, start: int, process_vertex: ProcessVertex, process_edge: Optional[ProcessEdge] = None):
-    #     pass
+    def bfs(self, start: Start, max_depth: Optional[int] = None, targets: Iterable[int] = None,
+            reverse: bool = False) -> BreadthFirstSearch:
+        """
+        Vectorized breadth-first search from one or many start nodes on the frozen adjacency, which is
+        memoized until the next mutation, so repeated searches do not freeze the graph again.
+        :param start: the start node or an iterable of start nodes
+        :param max_depth: nodes further than this are not visited
+        :param targets: if given, the search stops at the distance of the nearest of these nodes
+        :param reverse: if True, edges of a directed graph are followed backwards
+        :return: distances from the start nodes and the BFS tree.
+        """
+        return BreadthFirstSearch.CreateFromCSR(self.analysis("frozen"), start, max_depth=max_depth,
+                                                targets=targets, reverse=reverse)
 
     @abstractmethod
     def __str__(self):
@@ -104,13 +164,35 @@ class IGraph(ABC):
         pass
 
     @abstractmethod
-    def get_nodes(self) -> set[int]:
+    def get_nodes(self) -> AbstractSet[int]:
+        """
+        :return: the nodes of the graph. Graphs return a cheap read-only set-like view, which must not be iterated
+          while the graph is modified.
+        """
         pass
 
+    def nodes_array(self) -> np.ndarray:
+        """
+        :return: the nodes of the graph as a read-only NumPy array. Graphs with a node index override it
+          without copying.
+        """
+        nodes = self.get_nodes()
+        return np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+
     @abstractmethod
     def add_node(self, i: int, weight: int = 1):
         pass
 
+    def add_nodes(self, ids, weights=None):
+        """
+        Adds many nodes at once. ids and the optional weights are NumPy arrays or iterables of the same length.
+        Graphs override it with a vectorized implementation, this fallback calls add_node for every node.
+        """
+        ids = as_list(ids)
+        weights = [1] * len(ids) if weights is None else as_list(weights)
+        for i, weight in zip(ids, weights):
+            self.add_node(i, weight)
+
     @abstractmethod
     def dfs(self, start: int,
             discovered: dict[int, int] = None,
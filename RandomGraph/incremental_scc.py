@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from .csr_graph import build_csr
+from .scc import StronglyConnectedComponents, tarjan_labels
+
+ORDER_GAP = 1 << 20  # room in the topological order for the parts of a component that splits
+
+
+class IncrementalSCC:
+    """Strongly connected components of a DirectionalGraph, kept up to date as edges come and go.
+
+    Besides the component of every node it keeps the condensation (with the number of original edges behind
+    every edge between two components) and a topological order of the components. An inserted edge that agrees
+    with the order costs O(1). Otherwise the order is repaired by the Pearce-Kelly algorithm, which only visits
+    the components between the two endpoints; if the edge closes a cycle, the components on it are merged.
+    A deleted edge inside a component re-splits just that component with Tarjan's algorithm.
+
+    Every component owns an interval of the order, starting at its position. A component that splits hands
+    its interval out to its parts, so the rest of the order stays untouched; only when an interval is too
+    small are all the positions spread out again.
+
+    Component ids are arbitrary, but stable until the component is merged or split.
+    """
+
+    _graph: DirectionalGraph
+    _component: dict[int, int]  # node -> component id
+    _members: dict[int, set[int]]  # component id -> nodes
+    _order: dict[int, int]  # component id -> position in a topological order (not necessarily contiguous)
+    _width: dict[int, int]  # position -> length of the interval of the order owned by the component there
+    _out: dict[int, dict[int, int]]  # component -> component it has edges to -> number of those edges
+    _in: dict[int, dict[int, int]]  # component -> component it has edges from -> number of those edges
+    _next_id: int
+    _next_order: int
+    _labels: Optional[StronglyConnectedComponents]  # cached labels(), until the next change
+
+    def __init__(self, graph: DirectionalGraph):
+        self._graph = graph
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recomputes everything from scratch in O(N+M).
+        """
+        frozen = self._graph.freeze()
+        component_id, sizes = tarjan_labels(frozen.indptr, frozen.indices)
+        n_components = len(sizes)
+        self._component = dict(zip(frozen.nodes.tolist(), component_id.tolist()))
+        self._members = {c: set() for c in range(n_components)}
+        for i, c in self._component.items():
+            self._members[c].add(i)
+        self._order = {c: c * ORDER_GAP for c in range(n_components)}  # Tarjan's numbering is topological
+        self._width = {c * ORDER_GAP: ORDER_GAP for c in range(n_components)}
+        self._labels = None
+        self._out = {c: {} for c in range(n_components)}
+        self._in = {c: {} for c in range(n_components)}
+
+        component_id = component_id.astype(np.int64)
+        src = np.repeat(component_id, np.diff(frozen.indptr))
+        dst = component_id[frozen.indices]
+        between = src != dst
+        keys, counts = np.unique(src[between] * max(n_components, 1) + dst[between], return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            a, b = divmod(key, n_components)
+            self._out[a][b] = count
+            self._in[b][a] = count
+        self._next_id = n_components
+        self._next_order = n_components * ORDER_GAP
+
+    def _spread(self, wide: Optional[int] = None, room: int = 0):
+        """
+        Gives every component an interval of ORDER_GAP positions again, keeping their order. O(C log C), but only
+        needed after many splits inside the same interval.
+        :param wide: optional component which gets an interval of at least room positions
+        """
+        ranking = sorted(self._order, key=self._order.__getitem__)
+        self._order = {}
+        self._width = {}
+        position = 0
+        for c in ranking:
+            self._order[c] = position
+            self._width[position] = max(ORDER_GAP, room) if c == wide else ORDER_GAP
+            position += self._width[position]
+        self._next_order = position
+
+    def __len__(self):
+        return len(self._members)
+
+    def component_of(self, i: int) -> int:
+        return self._component[i]
+
+    def same_component(self, i: int, j: int) -> bool:
+        return self._component[i] == self._component[j]
+
+    def members(self, component: int) -> set[int]:
+        """
+        :return: nodes of the component. The set must not be modified.
+        """
+        return self._members[component]
+
+    def component_size(self, i: int) -> int:
+        return len(self._members[self._component[i]])
+
+    def labels(self) -> StronglyConnectedComponents:
+        """
+        :return: the components in the format of DirectionalGraph.strongly_connected_component_labels,
+          numbered in the maintained topological order. Needs no traversal of the graph, but sorts
+          the components in O(N + C log C); the result is cached until the next change.
+        """
+        if self._labels is not None:
+            return self._labels
+        ranking = sorted(self._order, key=self._order.__getitem__)
+        rank = dict(zip(ranking, range(len(ranking))))
+        nodes = np.fromiter(self._component.keys(), dtype=np.int64, count=len(self._component))
+        component_id = np.fromiter((rank[c] for c in self._component.values()), dtype=np.int64,
+                                   count=len(self._component))
+        order = np.argsort(nodes, kind="stable")
+        component_id = component_id[order].astype(np.int32 if len(ranking) < 2 ** 31 else np.int64)
+        self._labels = StronglyConnectedComponents(nodes[order], component_id,
+                                                   np.bincount(component_id, minlength=len(ranking)))
+        return self._labels
+
+    def _new_component(self, nodes: set[int], order: int) -> int:
+        c = self._next_id
+        self._next_id += 1
+        self._members[c] = nodes
+        self._order[c] = order
+        self._out[c] = {}
+        self._in[c] = {}
+        for i in nodes:
+            self._component[i] = c
+        return c
+
+    def add_node(self, i: int):
+        if i not in self._component:
+            self._labels = None
+            self._new_component({i}, self._next_order)
+            self._width[self._next_order] = ORDER_GAP
+            self._next_order += ORDER_GAP
+
+    def _link(self, a: int, b: int, count: int = 1):
+        self._out[a][b] = self._out[a].get(b, 0) + count
+        self._in[b][a] = self._in[b].get(a, 0) + count
+
+    def add_edge(self, i: int, j: int):
+        """
+        Updates the components after a new edge i -> j was added to the graph.
+        """
+        self.add_node(i)
+        self.add_node(j)
+        a = self._component[i]
+        b = self._component[j]
+        if a == b:
+            return
+        self._link(a, b)
+        if self._order[a] < self._order[b]:
+            return
+        self._labels = None
+        self._reorder(a, b)
+
+    def _reorder(self, a: int, b: int):
+        """
+        Pearce-Kelly repair of the topological order after the edge a -> b with order[b] < order[a].
+        """
+        lower = self._order[b]
+        upper = self._order[a]
+        forward = {b}
+        stack = [b]
+        while stack:
+            for d in self._out[stack.pop()]:
+                if d not in forward and self._order[d] <= upper:
+                    forward.add(d)
+                    stack.append(d)
+        backward = {a}
+        stack = [a]
+        while stack:
+            for d in self._in[stack.pop()]:
+                if d not in backward and self._order[d] >= lower:
+                    backward.add(d)
+                    stack.append(d)
+
+        # The backward set takes the lowest of the freed positions and the forward set the highest ones,
+        # so the components of the backward set only move down the order and those of the forward set only up.
+        slots = sorted(self._order[c] for c in forward | backward)
+        backward = sorted(backward, key=self._order.__getitem__)
+        forward = sorted(forward, key=self._order.__getitem__)
+        if a in forward:
+            # The new edge closes a cycle through every component on a path b ~> a; it becomes one component,
+            # placed between the two sets
+            cycle = set(forward) & set(backward)
+            backward = [c for c in backward if c not in cycle]
+            forward = [c for c in forward if c not in cycle]
+            merged = self._merge(cycle)
+            self._order[merged] = slots[len(backward)]
+            for slot in slots[len(backward) + 1:len(slots) - len(forward)]:
+                del self._width[slot]  # the intervals of the merged components are not used any more
+        for c, slot in zip(backward, slots):
+            self._order[c] = slot
+        for c, slot in zip(forward, slots[len(slots) - len(forward):]):
+            self._order[c] = slot
+
+    def _merge(self, components: set[int]) -> int:
+        keep = max(components, key=lambda c: len(self._members[c]))
+        for c in components:
+            if c == keep:
+                continue
+            for i in self._members[c]:
+                self._component[i] = keep
+            self._members[keep].update(self._members.pop(c))
+            for d, count in self._out.pop(c).items():
+                if d in self._in:
+                    self._in[d].pop(c, None)
+                if d not in components:
+                    self._link(keep, d, count)
+            for d, count in self._in.pop(c).items():
+                if d in self._out:
+                    self._out[d].pop(c, None)
+                if d not in components:
+                    self._link(d, keep, count)
+            del self._order[c]
+        return keep
+
+    def remove_edge(self, i: int, j: int):
+        """
+        Updates the components after the edge i -> j was removed from the graph.
+        """
+        a = self._component[i]
+        b = self._component[j]
+        if a != b:
+            self._out[a][b] -= 1
+            self._in[b][a] -= 1
+            if self._out[a][b] == 0:
+                del self._out[a][b]
+                del self._in[b][a]
+        elif i != j:
+            self._labels = None
+            self._split(a)
+
+    def remove_node(self, i: int):
+        """
+        Updates the components after the node i was removed from the graph together with its edges.
+        """
+        self._labels = None
+        c = self._component.pop(i)
+        self._members[c].discard(i)
+        if self._members[c]:
+            self._split(c)
+            return
+        for d in self._out.pop(c):
+            self._in[d].pop(c)
+        for d in self._in.pop(c):
+            self._out[d].pop(c)
+        del self._members[c]
+        del self._width[self._order.pop(c)]
+
+    def _split(self, c: int):
+        """
+        Recomputes the strongly connected components among the members of c and the edges of the resulting
+        components. Costs time proportional to the members of c and their edges only, as the parts share
+        the interval of c in the order (see _spread for the rare exception).
+        """
+        members = list(self._members[c])
+        position = dict(zip(members, range(len(members))))
+        src = []
+        dst = []
+        for k, i in enumerate(members):
+            for j in self._graph.get_children(i):
+                p = position.get(j)
+                if p is not None:
+                    src.append(k)
+                    dst.append(p)
+        indptr, indices, _ = build_csr(len(members), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+        part_of, sizes = tarjan_labels(indptr, indices)
+
+        for d in self._out[c]:
+            self._in[d].pop(c)
+        for d in self._in[c]:
+            self._out[d].pop(c)
+        self._out[c] = {}
+        self._in[c] = {}
+
+        parts = [c]
+        if len(sizes) > 1:
+            groups = [set() for _ in sizes]
+            for i, part in zip(members, part_of.tolist()):
+                groups[part].add(i)
+            # The parts are numbered topologically and divide the interval of c in the order
+            if self._width[self._order[c]] < len(sizes):
+                self._spread(c, len(sizes))
+            base = self._order[c]
+            width = self._width[base]
+            step = width // len(sizes)
+            self._members[c] = groups[0]
+            parts += [self._new_component(group, base + k * step) for k, group in enumerate(groups[1:], start=1)]
+            for k in range(len(sizes)):
+                self._width[base + k * step] = step
+            self._width[base + (len(sizes) - 1) * step] = width - (len(sizes) - 1) * step
+
+        part_set = set(parts)
+        for i in members:
+            a = self._component[i]
+            for j in self._graph.get_children(i):
+                b = self._component[j]
+                if a != b:
+                    self._link(a, b)
+            for j in self._graph.parents(i):
+                b = self._component[j]
+                if b not in part_set:
+                    self._link(b, a)
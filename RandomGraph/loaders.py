@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import warnings
+from typing import BinaryIO, Iterator, Union
+
+import numpy as np
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+CHUNK_SIZE = 1 << 24  # bytes read from the file at once
+EDGE_BLOCK = 1 << 22  # edges handed over to the graph at once
+
+
+class IntTokenReader:
+    """Reads whitespace separated integers from a text file, a chunk of bytes at a time.
+
+    Each chunk is converted to a NumPy array in one call, so there is no per-token Python overhead
+    and at most one chunk of text plus one chunk of parsed integers is held in memory.
+    """
+
+    _file: BinaryIO
+    _owns_file: bool
+    _tail: bytes  # incomplete token at the end of the last chunk
+    _buffer: np.ndarray  # parsed, but not yet consumed integers
+    _eof: bool
+
+    def __init__(self, source: Source, chunk_size: int = CHUNK_SIZE):
+        """
+        :param source: path to the file or a binary file object open for reading
+        """
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, "rb")
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+        self._chunk_size = chunk_size
+        self._tail = b""
+        self._buffer = np.empty(0, dtype=np.int64)
+        self._eof = False
+
+    def __enter__(self) -> IntTokenReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def _fill(self) -> bool:
+        """
+        Parses the next chunk of the file into the (empty) buffer.
+        :return: False if there is nothing more to read.
+        """
+        while not self._eof:
+            chunk = self._file.read(self._chunk_size)
+            if len(chunk) == 0:
+                self._eof = True
+                text = self._tail
+                self._tail = b""
+            else:
+                cut = max(chunk.rfind(b" "), chunk.rfind(b"\n"), chunk.rfind(b"\t"), chunk.rfind(b"\r"))
+                if cut < 0:
+                    self._tail += chunk
+                    continue
+                text = self._tail + chunk[:cut]
+                self._tail = chunk[cut:]
+            if not text.strip():
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", DeprecationWarning)
+                try:
+                    parsed = np.fromstring(text, dtype=np.int64, sep=" ")
+                except DeprecationWarning as e:
+                    raise ValueError(str(e)) from e
+            self._buffer = parsed
+            return True
+        return False
+
+    def read(self, count: int) -> np.ndarray:
+        """
+        :return: array with the next count integers.
+        """
+        parts = []
+        missing = count
+        while missing > 0:
+            if len(self._buffer) == 0 and not self._fill():
+                raise ValueError(f"Unexpected end of file: expected {count} integers, got {count - missing}")
+            parts.append(self._buffer[:missing])
+            self._buffer = self._buffer[missing:]
+            missing -= len(parts[-1])
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def read_int(self) -> int:
+        return int(self.read(1)[0])
+
+    def read_edges(self, count: int, columns: int = 2, block: int = EDGE_BLOCK) -> Iterator[np.ndarray]:
+        """
+        Reads count rows of columns integers each.
+        :return: iterator of arrays with shape (rows, columns), at most block rows each.
+        """
+        for start in range(0, count, block):
+            rows = min(block, count - start)
+            yield self.read(rows * columns).reshape(rows, columns)
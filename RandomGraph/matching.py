@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import heapq
+from typing import Optional
+
+import numpy as np
+
+from .analysis_cache import register_analysis
+from .csr_graph import CSRGraph
+
+
+class BipartiteArrays:
+    """Adjacency of a bipartite graph from the left side to the right side in CSR arrays.
+
+    Vertices of each side have local positions 0..n-1; left[k] and right[k] are their ids. The neighbours
+    of the left vertex k are the right positions indices[indptr[k]:indptr[k + 1]], with the edge costs
+    aligned with indices.
+    """
+
+    left: np.ndarray
+    right: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    costs: np.ndarray
+
+    def __init__(self, left: np.ndarray, right: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 costs: np.ndarray):
+        self.left = left
+        self.right = right
+        self.indptr = indptr
+        self.indices = indices
+        self.costs = costs
+
+    @staticmethod
+    def CreateFromCSR(graph: CSRGraph) -> BipartiteArrays:
+        """
+        :param graph: frozen DiGraph, whose edges all go from the side 0 to the side 1
+        """
+        assert graph.sides is not None
+        is_left = graph.sides == 0
+        left_positions = np.flatnonzero(is_left)
+        right_positions = np.flatnonzero(~is_left)
+        local = np.empty(len(graph), dtype=np.int64)
+        local[left_positions] = np.arange(len(left_positions))
+        local[right_positions] = np.arange(len(right_positions))
+        degrees = np.diff(graph.indptr)
+        assert not np.any(degrees[right_positions]), "Edges must go from the left side to the right side"
+        indptr = np.zeros(len(left_positions) + 1, dtype=np.int64)
+        np.cumsum(degrees[left_positions], out=indptr[1:])
+        costs = graph.edge_weights if graph.edge_weights is not None else np.ones(len(graph.indices), dtype=np.int64)
+        # Right vertices have no edges, so the rows of the left ones are already contiguous
+        return BipartiteArrays(graph.nodes[left_positions], graph.nodes[right_positions], indptr,
+                               local[graph.indices], np.asarray(costs, dtype=np.int64))
+
+
+class Matching:
+    """Matched pairs of a bipartite graph: left[k] is matched with right[k]."""
+
+    left: np.ndarray
+    right: np.ndarray
+    cost: Optional[int]  # total cost of the matched edges, None for the unweighted matchings
+
+    def __init__(self, left: np.ndarray, right: np.ndarray, cost: Optional[int] = None):
+        self.left = left
+        self.right = right
+        self.cost = cost
+
+    def __len__(self):
+        return len(self.left)
+
+    def as_dict(self) -> dict[int, int]:
+        """
+        :return: dictionary from every matched left vertex to its right vertex.
+        """
+        return dict(zip(self.left.tolist(), self.right.tolist()))
+
+
+def _matching(graph: BipartiteArrays, match_left: list[int], cost: Optional[int] = None) -> Matching:
+    match_left = np.array(match_left, dtype=np.int64)
+    matched = np.flatnonzero(match_left >= 0)
+    return Matching(graph.left[matched], graph.right[match_left[matched]], cost)
+
+
+def hopcroft_karp(graph: BipartiteArrays) -> Matching:
+    """
+    Maximum-cardinality matching by the Hopcroft-Karp algorithm in O(E sqrt(V)). Every phase layers the graph
+    by a breadth-first search from the free left vertices, which stops at the layer of the nearest free right
+    vertices, and then augments along a maximal set of vertex-disjoint shortest augmenting paths, found by
+    an iterative depth-first search that only ends paths at that layer.
+    """
+    n_left = len(graph.left)
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    match_left = [-1] * n_left
+    match_right = [-1] * len(graph.right)
+
+    # A greedy matching first, the phases then only have to fix what it got wrong
+    for u in range(n_left):
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if match_right[v] < 0:
+                match_left[u] = v
+                match_right[v] = u
+                break
+
+    while True:
+        free = [u for u in range(n_left) if match_left[u] < 0]
+        layer = [-1] * n_left
+        for u in free:
+            layer[u] = 0
+        queue = list(free)
+        limit = -1  # layer of the left vertices next to the nearest free right vertices
+        for u in queue:  # the list grows while it is iterated
+            if 0 <= limit < layer[u]:
+                break
+            next_layer = layer[u] + 1
+            for k in range(indptr[u], indptr[u + 1]):
+                w = match_right[indices[k]]
+                if w < 0:
+                    limit = layer[u]
+                elif layer[w] < 0:
+                    layer[w] = next_layer
+                    queue.append(w)
+        if limit < 0:
+            break
+
+        position = indptr[:-1]  # next edge to try of every left vertex
+        for start in free:
+            stack = [start]
+            via = []  # via[d] is the right vertex between stack[d] and stack[d + 1]
+            while stack:
+                u = stack[-1]
+                end = indptr[u + 1]
+                k = position[u]
+                pushed = False
+                while k < end:
+                    v = indices[k]
+                    k += 1
+                    w = match_right[v]
+                    if w < 0 and layer[u] == limit:
+                        position[u] = k
+                        via.append(v)
+                        for x, y in zip(stack, via):
+                            match_left[x] = y
+                            match_right[y] = x
+                        stack = []
+                        pushed = True
+                        break
+                    if w >= 0 and layer[w] == layer[u] + 1 <= limit:
+                        position[u] = k
+                        via.append(v)
+                        stack.append(w)
+                        pushed = True
+                        break
+                if not pushed:
+                    position[u] = k
+                    layer[u] = -2  # a dead end for the rest of the phase
+                    stack.pop()
+                    if via:
+                        via.pop()
+    return _matching(graph, match_left)
+
+
+def min_cost_assignment(graph: BipartiteArrays, perfect: bool = False) -> Matching:
+    """
+    Minimum-cost maximum-cardinality matching by successive shortest augmenting paths.
+
+    Johnson potentials keep all the reduced costs non-negative, so every augmenting path is found by Dijkstra's
+    algorithm started from all the free left vertices at once and stopped at the first free right vertex. After
+    every search the matching grows along all the vertex-disjoint augmenting paths of zero reduced cost.
+    Costs may be negative.
+    :param perfect: if True, raise ValueError unless every vertex of both sides is matched
+    """
+    n_left = len(graph.left)
+    n_right = len(graph.right)
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    costs = graph.costs.tolist()
+    match_left = [-1] * n_left
+    match_right = [-1] * n_right
+
+    # Reduced cost of the edge u -> v is costs + potential_left[u] - potential_right[v] >= 0. All the free
+    # vertices of a side need equal potentials, so they all start equal; then the potential of a free right
+    # vertex never changes and all the free left vertices change together.
+    potential_left = [0] * n_left
+    potential_right = [min(costs, default=0)] * n_right
+
+    infinity = float("inf")
+    distance_left = [infinity] * n_left
+    distance_right = [infinity] * n_right
+    while True:
+        free = [u for u in range(n_left) if match_left[u] < 0]
+        heap = [(0, u) for u in free]
+        for u in free:
+            distance_left[u] = 0
+        reached_left = list(free)
+        reached_right = []
+        settled_left = []
+        settled_right = []
+        limit = -1
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u >= n_left:
+                v = u - n_left
+                if d > distance_right[v]:
+                    continue
+                settled_right.append(v)
+                w = match_right[v]
+                if w < 0:
+                    limit = d
+                    break
+                if d < distance_left[w]:  # the matched edge back is tight
+                    distance_left[w] = d
+                    reached_left.append(w)
+                    heapq.heappush(heap, (d, w))
+                continue
+            if d > distance_left[u]:
+                continue
+            settled_left.append(u)
+            base = d + potential_left[u]
+            matched = match_left[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if v == matched:
+                    continue
+                candidate = base + costs[k] - potential_right[v]
+                if candidate < distance_right[v]:
+                    if distance_right[v] == infinity:
+                        reached_right.append(v)
+                    distance_right[v] = candidate
+                    heapq.heappush(heap, (candidate, n_left + v))
+        if limit >= 0:
+            for u in settled_left:
+                potential_left[u] += distance_left[u] - limit
+            for v in settled_right:
+                potential_right[v] += distance_right[v] - limit
+        for u in reached_left:
+            distance_left[u] = infinity
+        for v in reached_right:
+            distance_right[v] = infinity
+        if limit < 0:
+            break
+
+        # The shortest paths are tight now. Augment along as many vertex-disjoint tight paths as there are,
+        # which keeps the reduced costs non-negative, before the next search.
+        visited = [False] * n_left
+        for start in free:
+            visited[start] = True
+            stack = [start]
+            via = []  # via[d] is the right vertex between stack[d] and stack[d + 1]
+            position = [indptr[start]]
+            while stack:
+                u = stack[-1]
+                k = position[-1]
+                end = indptr[u + 1]
+                pushed = False
+                while k < end:
+                    v = indices[k]
+                    k += 1
+                    if costs[k - 1] + potential_left[u] != potential_right[v] or v == match_left[u]:
+                        continue
+                    w = match_right[v]
+                    if w < 0:
+                        via.append(v)
+                        for x, y in zip(stack, via):
+                            match_left[x] = y
+                            match_right[y] = x
+                        stack = []
+                        pushed = True
+                        break
+                    if not visited[w]:
+                        visited[w] = True
+                        position[-1] = k
+                        via.append(v)
+                        stack.append(w)
+                        position.append(indptr[w])
+                        pushed = True
+                        break
+                if not pushed:
+                    stack.pop()
+                    position.pop()
+                    if via:
+                        via.pop()
+
+    matched = sum(1 for v in match_left if v >= 0)
+    if perfect and (matched != n_left or matched != n_right):
+        raise ValueError(f"The graph has no perfect matching, the largest one has {matched} edges")
+    cost = 0
+    for u, v in enumerate(match_left):
+        if v >= 0:
+            ks = range(indptr[u], indptr[u + 1])
+            cost += min(costs[k] for k in ks if indices[k] == v)
+    return _matching(graph, match_left, cost)
+
+
+@register_analysis("bipartite_arrays")
+def _bipartite_arrays(graph) -> BipartiteArrays:
+    from .digraph import DiGraph
+    if isinstance(graph, DiGraph):
+        return graph.bipartite_arrays()
+    return BipartiteArrays.CreateFromCSR(graph.analysis("frozen"))
+
+
+@register_analysis("maximum_matching")
+def _maximum_matching(graph) -> Matching:
+    return hopcroft_karp(graph.analysis("bipartite_arrays"))
+
+
+@register_analysis("min_cost_assignment")
+def _min_cost_assignment(graph, perfect: bool = False) -> Matching:
+    return min_cost_assignment(graph.analysis("bipartite_arrays"), perfect)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import KeysView
+
+import numpy as np
+
+
+class NodeIndex:
+    """Incrementally maintained set of the nodes of a graph.
+
+    Every node has a dense id in range(len(index)); ids[dense id] is the node. Removal moves the last node
+    into the freed dense id (swap-remove), so both insertion and removal are O(1). Iteration follows the order
+    of insertion.
+    """
+
+    _position: dict[int, int]  # node -> dense id; keeps the insertion order
+    _ids: np.ndarray  # dense id -> node; only the first len(_position) entries are used
+
+    def __init__(self, capacity: int = 16):
+        self._position = {}
+        self._ids = np.empty(capacity, dtype=np.int64)
+
+    def _reserve(self, count: int):
+        if count > len(self._ids):
+            ids = np.empty(max(count, 2 * len(self._ids)), dtype=np.int64)
+            ids[:len(self._position)] = self._ids[:len(self._position)]
+            self._ids = ids
+
+    def add(self, i: int) -> int:
+        """
+        Adds the node if it is not in the index yet.
+        :return: dense id of the node.
+        """
+        position = self._position.get(i)
+        if position is None:
+            position = len(self._position)
+            self._reserve(position + 1)
+            self._ids[position] = i
+            self._position[i] = position
+        return position
+
+    def add_many(self, ids):
+        """
+        Adds every node of ids (an iterable of ints) that is not in the index yet.
+        """
+        position = self._position
+        new = [i for i in dict.fromkeys(ids) if i not in position]
+        start = len(position)
+        self._reserve(start + len(new))
+        self._ids[start:start + len(new)] = new
+        position.update(zip(new, range(start, start + len(new))))
+
+    def remove(self, i: int) -> tuple[int, int]:
+        """
+        :return: tuple of (freed dense id, last dense id). The node with the last dense id now has the freed one,
+          so data aligned with the dense ids must be moved the same way. Both are equal if nothing moved.
+        """
+        position = self._position.pop(i)
+        last = len(self._position)
+        if position != last:
+            moved = int(self._ids[last])
+            self._ids[position] = moved
+            self._position[moved] = position
+        return position, last
+
+    def position(self, i: int) -> int:
+        """
+        :return: dense id of the node i.
+        """
+        return self._position[i]
+
+    def view(self) -> KeysView[int]:
+        """
+        :return: read-only set-like live view of the nodes.
+        """
+        return self._position.keys()
+
+    def array(self) -> np.ndarray:
+        """
+        :return: read-only array of the nodes ordered by their dense ids. It is only valid until the next change.
+        """
+        ans = self._ids[:len(self._position)]
+        ans.flags.writeable = False
+        return ans
+
+    def __contains__(self, i: int) -> bool:
+        return i in self._position
+
+    def __len__(self):
+        return len(self._position)
+
+    def __iter__(self):
+        return iter(self._position)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+
+Seed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+# Above this edge probability a Bernoulli matrix is cheaper than skip-sampling.
+DENSE_PROBABILITY_THRESHOLD = 0.1
+# Number of Bernoulli trials drawn at once by the dense sampler.
+BLOCK_SIZE = 1 << 22
+
+
+def make_rng(seed: Seed = None) -> np.random.Generator:
+    """
+    :param seed: None, an integer seed, a SeedSequence or an already constructed Generator (returned as is).
+    :return: numpy Generator to draw all the random numbers from.
+    """
+    return np.random.default_rng(seed)
+
+
+def _skip_sample(total: int, p: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns sorted positions in range(total), each chosen independently with probability p.
+    Uses geometric gaps between consecutive successes, so the cost is proportional to the number of successes.
+    """
+    chunks = []
+    position = -1
+    while True:
+        expected = (total - position - 1) * p
+        batch = int(expected + 3 * np.sqrt(expected + 1)) + 16
+        gaps = rng.geometric(p, size=batch)
+        positions = position + np.cumsum(gaps)
+        if positions[-1] >= total:
+            chunks.append(positions[positions < total])
+            break
+        chunks.append(positions)
+        position = int(positions[-1])
+    return np.concatenate(chunks)
+
+
+def _bernoulli_sample(total: int, p: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Same as _skip_sample, but draws one uniform number per position in blocks of BLOCK_SIZE.
+    """
+    chunks = []
+    for start in range(0, total, BLOCK_SIZE):
+        size = min(BLOCK_SIZE, total - start)
+        chunks.append(np.flatnonzero(rng.random(size) < p) + start)
+    if not chunks:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def sample_positions(total: int, p: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Returns sorted int64 positions in range(total), each chosen independently with probability p.
+    """
+    if total <= 0 or p <= 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 1:
+        return np.arange(total, dtype=np.int64)
+    if p < DENSE_PROBABILITY_THRESHOLD:
+        return _skip_sample(total, p, rng).astype(np.int64, copy=False)
+    return _bernoulli_sample(total, p, rng).astype(np.int64, copy=False)
+
+
+def sample_directed_edges(N: int, p: float, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Samples the G(N, p) directed graph without self-loops.
+    :param N: number of nodes, numbered 0..N-1
+    :param p: probability of each ordered pair (i, j), i != j, being connected
+    :param rng: source of randomness
+    :return: tuple of (src, dst) int64 arrays, sorted by src and then by dst.
+    """
+    if N < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    positions = sample_positions(N * (N - 1), p, rng)
+    src, rest = np.divmod(positions, N - 1)
+    dst = rest + (rest >= src)
+    return src, dst
+
+
+def sample_undirected_edges(N: int, p: float, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Samples the G(N, p) undirected graph without self-loops.
+    :param N: number of nodes, numbered 0..N-1
+    :param p: probability of each unordered pair {i, j}, i != j, being connected
+    :param rng: source of randomness
+    :return: tuple of (src, dst) int64 arrays with src < dst, sorted by src and then by dst.
+    """
+    if N < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    positions = sample_positions(N * (N - 1) // 2, p, rng)
+    rows = np.arange(N, dtype=np.int64)
+    row_offsets = rows * (2 * N - rows - 1) // 2  # position of the pair (i, i+1) in the upper triangle
+    src = np.searchsorted(row_offsets, positions, side="right") - 1
+    dst = positions - row_offsets[src] + src + 1
+    return src, dst
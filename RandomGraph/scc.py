@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def tarjan_labels(indptr: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Iterative Tarjan's algorithm over a CSR adjacency, O(N+M) and without Python recursion.
+    :param indptr: CSR row pointers of the N nodes
+    :param indices: CSR column indices (positions of the children)
+    :return: tuple of (component_id, sizes). component_id[k] is the component of the node at position k.
+      Components are numbered in a topological order of the condensation: every edge goes from
+      a component to itself or to a component with a greater id.
+    """
+    n = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [0] * n
+    next_child = indptr[:-1]  # position in indices of the next child to visit, for each node
+    stack = []
+    counter = 0
+    n_components = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        call_stack = [root]
+        while call_stack:
+            v = call_stack[-1]
+            p = next_child[v]
+            end = indptr[v + 1]
+            while p < end:
+                w = indices[p]
+                p += 1
+                if index[w] == -1:
+                    next_child[v] = p
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    call_stack.append(w)
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                next_child[v] = p
+                call_stack.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component[w] = n_components
+                        if w == v:
+                            break
+                    n_components += 1
+                if call_stack and low[v] < low[call_stack[-1]]:
+                    low[call_stack[-1]] = low[v]
+
+    # Tarjan finishes the components in reverse topological order
+    component_id = n_components - 1 - np.array(component, dtype=np.int64)
+    component_id = component_id.astype(np.int32 if n_components < 2 ** 31 else np.int64)
+    sizes = np.bincount(component_id, minlength=n_components)
+    return component_id, sizes
+
+
+class StronglyConnectedComponents:
+    """Strongly connected components of a directed graph as a compact label array.
+
+    component_id is aligned with nodes. Components are numbered in a topological order of the condensation,
+    so every edge goes from a component to itself or to a component with a greater id.
+    """
+
+    nodes: np.ndarray  # sorted node ids
+    component_id: np.ndarray  # component of each node
+    sizes: np.ndarray  # number of nodes in each component
+
+    def __init__(self, nodes: np.ndarray, component_id: np.ndarray, sizes: np.ndarray):
+        self.nodes = nodes
+        self.component_id = component_id
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def component_of(self, i: int) -> int:
+        k = int(np.searchsorted(self.nodes, i))
+        if k == len(self.nodes) or self.nodes[k] != i:
+            raise ValueError(f"Vertex {i} does not exist")
+        return int(self.component_id[k])
+
+    def as_dict(self) -> dict[int, int]:
+        """
+        :return: dictionary node -> its component id.
+        """
+        return dict(zip(self.nodes.tolist(), self.component_id.tolist()))
+
+    def members(self) -> list[np.ndarray]:
+        """
+        :return: list of arrays of node ids, one per component.
+        """
+        order = np.argsort(self.component_id, kind="stable")
+        return np.split(self.nodes[order], np.cumsum(self.sizes)[:-1])
+
+    def as_dense_graph(self) -> DenseGraph:
+        """
+        :return: the components as a DenseGraph, i.e. the format of DirectionalGraph.strongly_connected_components.
+        """
+        from .dense_graph import DenseGraph
+        return DenseGraph.CreateFromGroups(self.nodes, self.component_id)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import struct
+from typing import BinaryIO, Optional, Union
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+Path = Union[str, os.PathLike, BinaryIO]  # a file name or a binary file object
+
+MAGIC = b"RGRAPH\x00\x01"
+ALIGNMENT = 64  # every array starts at a multiple of this, so it can be memory-mapped
+
+
+def aligned(offset: int) -> int:
+    """
+    :return: the first multiple of ALIGNMENT that is >= offset.
+    """
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+@contextlib.contextmanager
+def _open(path: Path, mode: str):
+    if isinstance(path, (str, os.PathLike)):
+        with open(path, mode) as f:
+            yield f
+    else:
+        yield path
+
+
+def write_arrays(path: Path, kind: str, meta: dict, arrays: dict[str, np.ndarray]):
+    """
+    Writes named arrays into a single binary file.
+
+    Layout: MAGIC, little-endian uint64 length of the JSON header, the header itself and then the raw
+    arrays, each aligned to ALIGNMENT bytes. The header keeps kind, meta and the dtype, shape and offset
+    (relative to the end of the header) of each array. A file object is written from its current position.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = aligned(offset + array.nbytes)
+    header = json.dumps({"kind": kind, "meta": meta, "arrays": layout}).encode()
+    data_start = aligned(len(MAGIC) + 8 + len(header))
+
+    with _open(path, "wb") as f:
+        start = f.tell()
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (start + data_start + layout[name]["offset"] - f.tell()))
+            f.write(array.data)
+
+
+def read_arrays(path: Path, mmap: bool = True) -> tuple[str, dict, dict[str, np.ndarray]]:
+    """
+    Reads a file written by write_arrays.
+    :param path: a file name, or a binary file object read from its current position
+    :param mmap: if True, the arrays are read-only memory maps of the file instead of copies in memory.
+      Arrays of a file object are always read into memory.
+    :return: tuple of (kind, meta, arrays).
+    """
+    mmap = mmap and isinstance(path, (str, os.PathLike))
+    with _open(path, "rb") as f:
+        start = f.tell()
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a RandomGraph binary file")
+        (header_length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_length))
+        data_start = aligned(len(MAGIC) + 8 + header_length)
+
+        arrays = {}
+        for name, layout in header["arrays"].items():
+            dtype = np.dtype(layout["dtype"])
+            shape = tuple(layout["shape"])
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + layout["offset"],
+                                         shape=shape)
+            else:
+                f.seek(start + data_start + layout["offset"])
+                array = np.empty(shape, dtype=dtype)
+                f.readinto(array.reshape(-1).view(np.uint8))
+                arrays[name] = array
+    return header["kind"], header["meta"], arrays
+
+
+_CSR_FIELDS = ("nodes", "indptr", "indices", "reverse_indptr", "reverse_indices", "edge_weights", "node_weights",
+               "sides")
+
+
+def pack_graph_arrays(csr: Optional[CSRGraph], extra: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    :return: the arrays of a frozen graph and the extra arrays of its class, by the names save_graph stores.
+    """
+    arrays = {}
+    if csr is not None:
+        for field in _CSR_FIELDS:
+            if getattr(csr, field) is not None:
+                arrays[field] = getattr(csr, field)
+    for name, array in extra.items():
+        arrays["extra_" + name] = array
+    return arrays
+
+
+def unpack_graph_arrays(arrays: dict[str, np.ndarray], directed: Optional[bool]) -> tuple[Optional[CSRGraph],
+                                                                                         dict[str, np.ndarray]]:
+    """
+    :return: tuple of (frozen adjacency or None, extra arrays) of the arrays returned by pack_graph_arrays.
+    """
+    extra = {name[len("extra_"):]: array for name, array in arrays.items() if name.startswith("extra_")}
+    csr = None
+    if "indptr" in arrays:
+        csr = CSRGraph(arrays["nodes"], arrays["indptr"], arrays["indices"], directed,
+                       **{field: arrays.get(field) for field in _CSR_FIELDS[3:]})
+    return csr, extra
+
+
+def save_graph(path: Path, kind: str, csr: Optional[CSRGraph], meta: dict = None,
+               extra: dict[str, np.ndarray] = None):
+    """
+    Saves a graph as its frozen CSR arrays plus any extra arrays of the graph class.
+    :param kind: name of the class that load_graph will create
+    :param csr: frozen adjacency, or None for graphs without one (DenseGraph)
+    """
+    meta = dict(meta or {})
+    if csr is not None:
+        meta["directed"] = csr.directed
+    arrays = pack_graph_arrays(csr, extra or {})
+    write_arrays(path, kind, meta, arrays)
+
+
+def read_graph(path: Path, mmap: bool = True) -> tuple[str, Optional[CSRGraph], dict, dict[str, np.ndarray]]:
+    """
+    :return: tuple of (kind, frozen adjacency or None, meta, extra arrays) saved by save_graph.
+    """
+    kind, meta, arrays = read_arrays(path, mmap=mmap)
+    csr, extra = unpack_graph_arrays(arrays, meta.get("directed"))
+    return kind, csr, meta, extra
+
+
+def load_graph(path: Path, mmap: bool = True):
+    """
+    Loads a graph saved by any of the graphs' save() methods.
+    :return: instance of the class that saved the file.
+    """
+    from .agenci_graph import AgenciGraph
+    from .dense_graph import DenseGraph
+    from .digraph import DiGraph
+    from .directional_graph import DirectionalGraph
+    from .directional_tagged_graph import DirectionalTaggedGraph
+    from .undirectional_graph import UndirectionalGraph
+
+    position = None if isinstance(path, (str, os.PathLike)) else path.tell()
+    kind, _, _, _ = read_graph(path, mmap=True)
+    if position is not None:
+        path.seek(position)
+    classes = {cls.__name__: cls for cls in (AgenciGraph, DenseGraph, DiGraph, DirectionalGraph,
+                                              DirectionalTaggedGraph, UndirectionalGraph, CSRGraph)}
+    if kind not in classes:
+        raise ValueError(f"Unknown graph kind {kind}")
+    return classes[kind].load(path, mmap=mmap)
+
+
+def dumps_graph(graph) -> bytes:
+    """
+    :return: the file that graph.save() would write, as bytes. It is a compact form to send a graph
+      between processes.
+    """
+    buffer = io.BytesIO()
+    graph.save(buffer)
+    return buffer.getvalue()
+
+
+def loads_graph(data: bytes):
+    """
+    :return: the graph serialized by dumps_graph.
+    """
+    return load_graph(io.BytesIO(data), mmap=False)
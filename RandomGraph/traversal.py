@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from .ifaces import ProcessVertex, ProcessEdge, EdgeType
+
+
+def depth_first_search(start: int, children: Callable[[int], Iterable[int]], directed: bool,
+                       discovered: dict[int, int] = None,
+                       processed: dict[int, int] = None,
+                       parents: dict[int, int] = None,
+                       process_vertex_early: ProcessVertex = None, process_edge: ProcessEdge = None,
+                       process_vertex_late: ProcessVertex = None) -> int:
+    """
+    Depth-first search with an explicit stack, shared by all the graphs' dfs methods.
+
+    Implements the contract of IGraph.dfs: discovered/processed receive entry/exit times, parents the DFS tree
+    and the callbacks are called in the usual order; any callback returning True stops the search.
+    When the same dictionaries are passed to several calls, the times keep increasing across the calls.
+
+    :param children: function returning the children of a node; they are visited in the order it yields them.
+    :param directed: if False, the edge back to the DFS parent and the edges to already processed nodes
+      are not reported, because they are the same undirected edges seen from the other end.
+    :return: number of nodes visited by this call.
+    """
+    if discovered is None:
+        discovered = {}
+    if processed is None:
+        processed = {}
+    if parents is None:
+        parents = {}
+
+    time0 = time = len(discovered) + len(processed)
+
+    def edge_classification(parent: int, child: int) -> EdgeType:
+        if parents.get(child) == parent:
+            return EdgeType.TREE
+        if child not in processed:
+            return EdgeType.BACK
+        if discovered[parent] < discovered[child]:
+            return EdgeType.FORWARD
+        return EdgeType.CROSS
+
+    stack = []
+
+    def enter(node: int) -> bool:
+        nonlocal time
+        time += 1
+        discovered[node] = time
+        if process_vertex_early and process_vertex_early(node):
+            return True
+        stack.append((node, iter(children(node))))
+        return False
+
+    if enter(start):
+        return (time - time0) // 2
+    while stack:
+        node, node_children = stack[-1]
+        for child in node_children:
+            if child not in discovered:
+                parents[child] = node
+                if process_edge and process_edge(parent=node, child=child, edge_type=EdgeType.TREE):
+                    return (time - time0) // 2
+                if enter(child):
+                    return (time - time0) // 2
+                break
+            if directed or (child not in processed and parents.get(node) != child):
+                if process_edge and process_edge(parent=node, child=child,
+                                                 edge_type=edge_classification(parent=node, child=child)):
+                    return (time - time0) // 2
+        else:
+            stack.pop()
+            if process_vertex_late and process_vertex_late(node):
+                return (time - time0) // 2
+            time += 1
+            processed[node] = time
+    return (time - time0) // 2
+
+
+def reachable(start: int, children: Callable[[int], Iterable[int]], visited: set[int] = None) -> set[int]:
+    """
+    :return: set of nodes reachable from start (including start), added to visited if given.
+    """
+    if visited is None:
+        visited = set()
+    visited.add(start)
+    stack = [start]
+    while stack:
+        for child in children(stack.pop()):
+            if child not in visited:
+                visited.add(child)
+                stack.append(child)
+    return visited
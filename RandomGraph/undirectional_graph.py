@@ -1,22 +1,38 @@
 from __future__ import annotations
 
+import io
 from collections import defaultdict
-from typing import Optional, Iterator
+from typing import AbstractSet, Iterable, Optional, Iterator
 
 import graphviz
 import numpy as np
 from overrides import overrides
 
-from .ifaces import IUndirectionalGraph, ProcessEdge, ProcessVertex, IGraph, EdgeType
+from .analysis_cache import register_analysis
+from .biconnected import BiconnectedComponents
+from .csr_graph import CSRGraph
+from .dot_writer import Sink, write_dot
+from .edge_arrays import group_by_source, adjacency_to_edge_arrays, as_int_array
+from .loaders import IntTokenReader, Source
+from .node_index import NodeIndex
+from .ifaces import IUndirectionalGraph, ProcessEdge, ProcessVertex, IGraph
+from .sampling import Seed, make_rng, sample_undirected_edges
+from .storage import save_graph, read_graph
+from .traversal import depth_first_search
 
 
 class UndirectionalGraph(IUndirectionalGraph):
     _graph: dict[int, set[int]]
+    _nodes: NodeIndex
 
     @staticmethod
-    def CreateRandom(N: int, link_density_factor: float = 0.5) -> UndirectionalGraph:
+    def CreateRandom(N: int, link_density_factor: float = 0.5, seed: Seed = None) -> UndirectionalGraph:
+        """
+        Creates a random G(N, p) graph with p = link_density_factor / 2.
+        :param seed: integer seed or numpy Generator; the same seed always yields the same graph.
+        """
         out = UndirectionalGraph()
-        out._random_directed_graph(N, link_density_factor)
+        out._random_directed_graph(N, link_density_factor, make_rng(seed))
         return out
 
     @overrides
@@ -35,46 +51,50 @@ class UndirectionalGraph(IUndirectionalGraph):
 
     @staticmethod
     def CreateFromString(s: str) -> UndirectionalGraph:
-        lines = s.splitlines()
-        n = int(lines[0])
-        ans = UndirectionalGraph()
-        for i in range(n):
-            i = int(lines[i + 1])
-            ans._graph[i] = set()
+        return UndirectionalGraph.CreateFromFile(io.BytesIO(s.encode()))
 
-        m = int(lines[n + 1])
-        for i in range(m):
-            i, j = [int(el) for el in lines[i + n + 2].split()]
-            ans.push_connection(i, j)
+    @staticmethod
+    def CreateFromFile(source: Source) -> UndirectionalGraph:
+        """
+        Reads the format of __str__ from a path or a binary file object in chunks, without holding the whole file
+        in memory. The edges are inserted in blocks straight from the parsed arrays.
+        """
+        ans = UndirectionalGraph()
+        with IntTokenReader(source) as reader:
+            n = reader.read_int()
+            ans.add_nodes(reader.read(n))
 
+            m = reader.read_int()
+            for edges in reader.read_edges(m):
+                ans.push_connections(edges[:, 0], edges[:, 1])
         return ans
 
     def __init__(self):
+        super().__init__()
         self._graph = defaultdict(set)
+        self._nodes = NodeIndex()
 
-    def _random_directed_graph(self, N: int, link_density_factor: float):
+    def _random_directed_graph(self, N: int, link_density_factor: float, rng: np.random.Generator):
         if N == 0:
             return
         p = min(1., link_density_factor / 2)
-        p = [p, 1 - p]
-        for i in range(N):
-            for j in range(i, N):
-                if i != j and np.random.choice([True, False], p=p):
-                    self.push_connection(i, j)
+        src, dst = sample_undirected_edges(N, p, rng)
+        self.add_nodes(np.arange(N))
+        self.push_connections(src, dst)
 
     @overrides
     def __len__(self):
-        return len(self._graph)
+        return len(self._nodes)
 
     @overrides
     def __str__(self):
-        nodes = [f"{i}" for i in self._graph.keys()]
+        nodes = [f"{i}" for i in self._nodes]
         ans = f"{len(nodes)}\n"
         if len(nodes) > 0:
             ans += "\n".join(nodes)
             ans += "\n"
 
-        conn = [f"{i} {j}" for i in self._graph.keys() for j in self._graph[i] if i < j]
+        conn = [f"{i} {j}" for i in self._nodes for j in self._graph[i] if i < j]
         ans += f"{len(conn)}\n"
         if len(conn) > 0:
             ans += "\n".join(conn)
@@ -87,84 +107,74 @@ class UndirectionalGraph(IUndirectionalGraph):
             process_vertex_early: ProcessVertex = None, process_edge: ProcessEdge = None,
             process_vertex_late: ProcessVertex = None) -> int:
 
-        if discovered is None:
-            discovered = {}
-        if processed is None:
-            processed = {}
-        if parents is None:
-            parents = {}
-
-        time = 0
-
-        def edge_classification(parent: int, child: int) -> EdgeType:
-            if parents.get(child) == parent:
-                return EdgeType.TREE
-
-            if child in discovered and child not in processed:
-                return EdgeType.BACK
-
-            if child in processed and discovered[parent] < discovered[child]:
-                return EdgeType.FORWARD
-
-            if child in processed and discovered[parent] > discovered[child]:
-                return EdgeType.CROSS
-
-            raise ValueError("Unknown edge type")
-
-        def _dfs(node: int) -> bool:
-            nonlocal time, discovered, processed, parents
-            time += 1
-            discovered[node] = time
-
-            if process_vertex_early:
-                finish = process_vertex_early(node)
-
-                if finish:
-                    return True
-
-            children = list(self.get_children(node))
-            children.sort()
-
-            for child in children:
-                if child not in discovered:
-                    parents[child] = node
-                    if process_edge:
-                        finish = process_edge(parent=node, child=child,
-                                              edge_type=edge_classification(parent=node, child=child))
-                        if finish:
-                            return True
-                    finish = _dfs(child)
-                    if finish:
-                        return True
-                elif not child in processed and parents.get(node) != child:
-                    if process_edge:
-                        finish = process_edge(parent=node, child=child,
-                                              edge_type=edge_classification(parent=node, child=child))
-                        if finish:
-                            return True
-            if process_vertex_late:
-                finish = process_vertex_late(node)
-                if finish:
-                    return True
-            time += 1
-            processed[node] = time
-            return False
+        return depth_first_search(start, self._graph.__getitem__, directed=False,
+                                  discovered=discovered, processed=processed, parents=parents,
+                                  process_vertex_early=process_vertex_early, process_edge=process_edge,
+                                  process_vertex_late=process_vertex_late)
+
+    def freeze(self) -> CSRGraph:
+        """
+        :return: immutable CSR copy of the graph. Every edge is stored in both directions.
+        """
+        nodes = self.nodes_array()
+        src, dst = adjacency_to_edge_arrays(self._graph)
+        return CSRGraph.CreateFromEdgeArrays(nodes, src, dst, directed=False)
+
+    def biconnected_components(self, with_separated_sizes: bool = False) -> BiconnectedComponents:
+        """
+        :return: articulation points, bridges and biconnected components, see CSRGraph.biconnected_components.
+          The result is memoized until the next mutation and must not be modified.
+        """
+        return self.analysis("biconnected_components", with_separated_sizes)
+
+    def save(self, path: str):
+        """
+        Saves the graph into a compact binary file (see storage.write_arrays), which load() can memory-map.
+        """
+        save_graph(path, type(self).__name__, self.freeze())
 
-        _dfs(start)
-        return time // 2
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> UndirectionalGraph:
+        _, csr, _, _ = read_graph(path, mmap=mmap)
+        return csr.thaw_into(UndirectionalGraph())
 
     @overrides
     def push_connection(self, i: int, j: int, tag: Optional[str] = None, cost: int = 1):
         assert cost == 1
         assert tag is None
+        self._mutated()
+        self._nodes.add(i)
+        self._nodes.add(j)
         self._graph[i].add(j)
         self._graph[j].add(i)
 
+    @overrides
+    def push_connections(self, src, dst, costs=None, tags=None):
+        """
+        Vectorized push_connection: every adjacency set is updated once per call, not once per edge.
+        """
+        assert costs is None or np.all(np.asarray(costs) == 1)
+        assert tags is None
+        self._mutated()
+        src = as_int_array(src)
+        dst = as_int_array(dst)
+        add_node = self._nodes.add
+        for i, neighbours in group_by_source(np.concatenate((src, dst)), np.concatenate((dst, src))):
+            add_node(i)
+            self._graph[i].update(neighbours)
+
     @overrides
     def get_connection_weight(self, i: int, j: int) -> int:
         assert i in self
         return 1
 
+    def write_dot(self, out: Sink, around: Iterable[int] = None, hops: int = 1):
+        """
+        Streams the graph as DOT into a path or a text file object, see dot_writer.write_dot.
+        :param around: if given, only the nodes at most hops edges away from these nodes are written
+        """
+        write_dot(out, self.freeze(), around=around, hops=hops)
+
     @overrides
     def plot(self) -> graphviz.Digraph:
         out = graphviz.Digraph()
@@ -178,19 +188,23 @@ class UndirectionalGraph(IUndirectionalGraph):
 
     @overrides
     def __contains__(self, i: int):
-        return i in self._graph
+        return i in self._nodes
 
     @overrides
     def get_children(self, i: int) -> set[int]:
         return self._graph[i]
 
     @overrides
-    def get_nodes(self) -> set[int]:
-        return set(self._graph.keys())
+    def get_nodes(self) -> AbstractSet[int]:
+        return self._nodes.view()
+
+    @overrides
+    def nodes_array(self) -> np.ndarray:
+        return self._nodes.array()
 
     @overrides
     def remove_unconnected_nodes(self):
-        nodes = self.get_nodes()
+        nodes = list(self.get_nodes())
         for node in nodes:
             if len(self.get_children(node)) == 0:
                 self.remove_node(node)
@@ -198,12 +212,15 @@ class UndirectionalGraph(IUndirectionalGraph):
 
     @overrides
     def remove_node(self, i: int):
+        self._mutated()
         for j in self.get_children(i):
             self._graph[j].remove(i)
         del self._graph[i]
+        self._nodes.remove(i)
 
     @overrides
     def remove_connection(self, i: int, j: int):
+        self._mutated()
         self._graph[i].remove(j)
         self._graph[j].remove(i)
 
@@ -216,4 +233,23 @@ class UndirectionalGraph(IUndirectionalGraph):
     @overrides
     def add_node(self, i: int, weight: int = 1):
         assert weight == 1
-        self._graph[i] = set()
+        self._mutated()
+        self._nodes.add(i)
+        if i not in self._graph:
+            self._graph[i] = set()
+
+    @overrides
+    def add_nodes(self, ids, weights=None):
+        assert weights is None or np.all(np.asarray(weights) == 1)
+        self._mutated()
+        ids = as_int_array(ids).tolist()
+        self._nodes.add_many(ids)
+        for i in ids:
+            if i not in self._graph:
+                self._graph[i] = set()
+
+
+@register_analysis("biconnected_components")
+def _biconnected_components(graph: IGraph, with_separated_sizes: bool = False) -> BiconnectedComponents:
+    frozen = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    return frozen.biconnected_components(with_separated_sizes)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class WeightArray:
+    """Growable NumPy array of integer weights addressed by dense slots.
+
+    Node weights use the dense ids of a NodeIndex as slots. Edge weights allocate a slot per edge and return it
+    to a free list when the edge is removed, so the array never holds more than the peak number of edges.
+    Slots that were never written hold the default weight.
+    """
+
+    _values: np.ndarray
+    _count: int  # slots in use or on the free list
+    _free: list[int]
+    default: int
+
+    def __init__(self, capacity: int = 16, default: int = 1):
+        self._values = np.full(capacity, default, dtype=np.int64)
+        self._count = 0
+        self._free = []
+        self.default = default
+
+    def reserve(self, count: int):
+        """
+        Makes slots range(count) addressable.
+        """
+        if count > len(self._values):
+            values = np.full(max(count, 2 * len(self._values)), self.default, dtype=np.int64)
+            values[:len(self._values)] = self._values
+            self._values = values
+        self._count = max(self._count, count)
+
+    def allocate(self, weight: int) -> int:
+        """
+        :return: a free slot, now holding the weight.
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._count
+            self.reserve(slot + 1)
+        self._values[slot] = weight
+        return slot
+
+    def release(self, slot: int):
+        self._values[slot] = self.default
+        self._free.append(slot)
+
+    def move(self, source: int, target: int):
+        """
+        Copies the weight of the slot source into target and resets source to the default. Follows
+        the swap-remove of a NodeIndex.
+        """
+        self._values[target] = self._values[source]
+        self._values[source] = self.default
+
+    def take(self, slots) -> np.ndarray:
+        """
+        :return: weights of the slots (an array or a list of ints) as a new array.
+        """
+        return self._values[np.asarray(slots, dtype=np.int64)]
+
+    def put(self, slots, weights):
+        """
+        Vectorized __setitem__. Of repeated slots the last weight wins.
+        """
+        self._values[np.asarray(slots, dtype=np.int64)] = np.asarray(weights, dtype=np.int64)
+
+    def head(self, count: int) -> np.ndarray:
+        """
+        :return: read-only view of the weights of the slots range(count).
+        """
+        ans = self._values[:count]
+        ans.flags.writeable = False
+        return ans
+
+    def __getitem__(self, slot: int) -> int:
+        return int(self._values[slot])
+
+    def __setitem__(self, slot: int, weight: int):
+        self._values[slot] = weight
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes
@@ -0,0 +1,217 @@
+"""Benchmarks of graph generation, traversal and analysis at scale.
+
+Run all the benchmarks and save the results:
+    python benchmarks/run_benchmarks.py run --output results.json
+
+Run a subset on small graphs only:
+    python benchmarks/run_benchmarks.py run --only dfs scc --max-edges 100000 --output results.json
+
+Compare two result files (ratios > 1 mean the second run is slower):
+    python benchmarks/run_benchmarks.py compare old.json new.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from RandomGraph import (DirectionalGraph, UndirectionalGraph, find_articulation_points,  # noqa: E402
+                         make_dfs_trees)
+
+EDGE_COUNTS = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+AVERAGE_DEGREES = (2, 8, 32)  # average number of edges per node; sets the density of the generated graphs
+
+
+class Benchmark:
+    """A timed operation. setup builds the input outside of the measurement, run is measured."""
+
+    name: str
+    setup: Callable[[int, float, int], Any]  # (nodes, link_density_factor, seed) -> state passed to run
+    run: Callable[[Any], Any]
+    directed: bool
+    max_edges: int  # larger instances are skipped, because the operation is inherently slow
+
+    def __init__(self, name: str, setup: Callable[[int, float, int], Any], run: Callable[[Any], Any],
+                 directed: bool, max_edges: int = max(EDGE_COUNTS)):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.directed = directed
+        self.max_edges = max_edges
+
+
+def _all_dfs(graph) -> int:
+    discovered = {}
+    processed = {}
+    for node in graph.get_nodes():
+        if node not in discovered:
+            graph.dfs(node, discovered=discovered, processed=processed)
+    return len(discovered)
+
+
+def _text(graph) -> str:
+    return str(graph)
+
+
+BENCHMARKS = [
+    Benchmark("create_random_directed", lambda n, p, seed: (n, p, seed),
+              lambda args: DirectionalGraph.CreateRandom(args[0], args[1], seed=args[2]), directed=True),
+    Benchmark("create_random_undirected", lambda n, p, seed: (n, p, seed),
+              lambda args: UndirectionalGraph.CreateRandom(args[0], args[1], seed=args[2]), directed=False),
+    Benchmark("create_from_string_directed",
+              lambda n, p, seed: _text(DirectionalGraph.CreateRandom(n, p, seed=seed)),
+              DirectionalGraph.CreateFromString, directed=True),
+    Benchmark("create_from_string_undirected",
+              lambda n, p, seed: _text(UndirectionalGraph.CreateRandom(n, p, seed=seed)),
+              UndirectionalGraph.CreateFromString, directed=False),
+    Benchmark("dfs_directed", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              _all_dfs, directed=True),
+    Benchmark("dfs_undirected", lambda n, p, seed: UndirectionalGraph.CreateRandom(n, p, seed=seed),
+              _all_dfs, directed=False),
+    Benchmark("bfs_directed", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              lambda graph: graph.bfs(0), directed=True),
+    Benchmark("strongly_connected_components", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              lambda graph: graph.strongly_connected_components(), directed=True),
+    Benchmark("strongly_connected_components2", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              lambda graph: graph.strongly_connected_components2(), directed=True),
+    Benchmark("find_articulation_points", lambda n, p, seed: UndirectionalGraph.CreateRandom(n, p, seed=seed),
+              find_articulation_points, directed=False),
+    Benchmark("make_dfs_trees", lambda n, p, seed: UndirectionalGraph.CreateRandom(n, p, seed=seed),
+              make_dfs_trees, directed=False, max_edges=10 ** 5),
+    Benchmark("plot_directed", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              lambda graph: graph.plot(), directed=True, max_edges=10 ** 5),
+    Benchmark("write_dot_directed", lambda n, p, seed: DirectionalGraph.CreateRandom(n, p, seed=seed),
+              lambda graph: graph.write_dot(io.StringIO()), directed=True),
+]
+
+
+def graph_parameters(edges: int, degree: int, directed: bool) -> tuple[int, float]:
+    """
+    :return: tuple of (number of nodes, link_density_factor) of CreateRandom that give
+      the requested expected number of edges and average degree.
+    """
+    nodes = max(2, edges // degree)
+    pairs = nodes * (nodes - 1) if directed else nodes * (nodes - 1) // 2
+    p = min(1., edges / pairs)
+    return nodes, 2 * p
+
+
+def measure(benchmark: Benchmark, edges: int, degree: int, repeat: int, seed: int, memory: bool) -> dict:
+    nodes, density = graph_parameters(edges, degree, benchmark.directed)
+    timings = []
+    for _ in range(repeat):
+        state = benchmark.setup(nodes, density, seed)
+        gc.collect()
+        start = time.perf_counter()
+        benchmark.run(state)
+        timings.append(time.perf_counter() - start)
+        del state
+
+    peak = None
+    if memory:
+        state = benchmark.setup(nodes, density, seed)
+        gc.collect()
+        tracemalloc.start()
+        benchmark.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del state
+
+    return {"name": benchmark.name, "edges": edges, "degree": degree, "nodes": nodes,
+            "link_density_factor": density, "seconds": min(timings), "all_seconds": timings,
+            "peak_bytes": peak}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent).stdout.strip()
+    except OSError:
+        commit = None
+    return {"timestamp": datetime.now(timezone.utc).isoformat(), "python": sys.version.split()[0],
+            "numpy": np.__version__, "platform": platform.platform(), "commit": commit or None}
+
+
+def run(args):
+    selected = [b for b in BENCHMARKS if not args.only or any(name in b.name for name in args.only)]
+    results = []
+    for benchmark in selected:
+        for edges in args.edges:
+            if edges > min(args.max_edges, benchmark.max_edges):
+                continue
+            for degree in args.degrees:
+                result = measure(benchmark, edges, degree, args.repeat, args.seed, memory=not args.no_memory)
+                results.append(result)
+                peak = "" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 2 ** 20:10.1f} MiB"
+                print(f"{benchmark.name:32} edges={edges:>8} degree={degree:>3} "
+                      f"{result['seconds']:10.4f} s {peak}", flush=True)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=1)
+
+
+def _key(result: dict) -> tuple:
+    return result["name"], result["edges"], result["degree"]
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {_key(result): result for result in json.load(f)["results"]}
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    print(f"{'benchmark':32} {'edges':>8} {'degree':>6} {'before':>10} {'after':>10} {'ratio':>7} {'memory':>7}")
+    for result in current:
+        before = baseline.get(_key(result))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] > 0 else float("nan")
+        memory_ratio = ""
+        if result["peak_bytes"] and before["peak_bytes"]:
+            memory_ratio = f"{result['peak_bytes'] / before['peak_bytes']:7.2f}"
+        flag = "  <-- slower" if ratio > 1 + args.threshold else ""
+        print(f"{result['name']:32} {result['edges']:>8} {result['degree']:>6} {before['seconds']:10.4f} "
+              f"{result['seconds']:10.4f} {ratio:7.2f} {memory_ratio:>7}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--only", nargs="*", help="run only the benchmarks whose name contains any of these")
+    run_parser.add_argument("--edges", nargs="*", type=int, default=list(EDGE_COUNTS))
+    run_parser.add_argument("--max-edges", type=int, default=max(EDGE_COUNTS))
+    run_parser.add_argument("--degrees", nargs="*", type=int, default=list(AVERAGE_DEGREES))
+    run_parser.add_argument("--repeat", type=int, default=3, help="the best of this many runs is reported")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--no-memory", action="store_true", help="skip the (slower) peak memory measurement")
+    run_parser.set_defaults(function=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="flag benchmarks slower by more than this fraction")
+    compare_parser.set_defaults(function=compare)
+
+    args = parser.parse_args()
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
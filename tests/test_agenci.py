@@ -179,3 +179,31 @@ if __name__ == '__main__':
 
     ugraph = graph.plot(False)
     ugraph.view(filename="ugraph.dot", quiet_view=True, quiet=True)
+
+
+def brute_force_solve(graph: AgenciGraph) -> tuple[bool, int]:
+    nodes = graph.get_nodes()
+    revealed = {agent: graph._dfs(agent) for agent in graph.agents}
+    covered = set().union(*revealed.values())
+    if covered != nodes:
+        return False, min(nodes - covered)
+    best = None
+    agents = list(graph.agents)
+    for mask in range(1, 2 ** len(agents)):
+        chosen = [agent for k, agent in enumerate(agents) if mask >> k & 1]
+        if set().union(*(revealed[agent] for agent in chosen)) == nodes:
+            cost = sum(graph.agents[agent] for agent in chosen)
+            best = cost if best is None else min(best, cost)
+    return True, best
+
+
+def test_solve_examples():
+    assert AgenciGraph.CreateFromString("3\n2\n1 10\n2 20\n2\n1 3\n2 3").solve() == (True, 30)
+    assert AgenciGraph.CreateFromString("3\n2\n1 10\n2 20\n3\n1 3\n2 3\n3 2").solve() == (True, 10)
+    assert AgenciGraph.CreateFromString("4\n2\n1 10\n4 20\n1\n3 2").solve() == (False, 1)
+
+
+def test_solve_matches_brute_force():
+    for seed in range(20):
+        graph = AgenciGraph.CreateRandom(12, link_density_factor=0.25, agent_ratio=0.5, seed=seed)
+        assert graph.solve() == brute_force_solve(graph)
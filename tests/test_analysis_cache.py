@@ -0,0 +1,79 @@
+import pytest
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph
+from RandomGraph.algorithms import find_articulation_points
+from RandomGraph.analysis_cache import AnalysisCache, register_analysis
+
+calls = []
+
+
+@register_analysis("test_node_count")
+def _node_count(graph, offset: int = 0) -> int:
+    calls.append(offset)
+    return len(graph) + offset
+
+
+def test_memoized_until_mutation():
+    graph = DirectionalGraph()
+    graph.push_connections([0, 1, 2], [1, 2, 0])
+    version = graph.version
+    assert graph.condensation() is graph.condensation()
+    assert graph.reversed_graph is graph.reversed_graph
+    assert graph.strongly_connected_component_labels() is graph.strongly_connected_component_labels()
+
+    graph.push_connection(2, 3)
+    assert graph.version > version
+    assert len(graph.condensation()) == 2
+    assert 2 in graph.reversed_graph.get_children(3)
+
+
+def test_analyses_share_one_freeze(monkeypatch):
+    graph = DirectionalGraph.CreateRandom(40, link_density_factor=0.1, seed=2)
+    freezes = []
+    freeze = DirectionalGraph.freeze
+    monkeypatch.setattr(DirectionalGraph, "freeze", lambda self: freezes.append(self) or freeze(self))
+    graph.strongly_connected_component_labels()
+    graph.condensation()
+    graph.analysis("degrees")
+    assert len(freezes) == 1
+
+
+def test_params_and_eviction():
+    calls.clear()
+    graph = UndirectionalGraph()
+    graph.push_connection(0, 1)
+    graph._analyses = AnalysisCache(max_entries=2)
+    assert graph.analysis("test_node_count") == 2
+    assert graph.analysis("test_node_count", 1) == 3
+    assert graph.analysis("test_node_count") == 2
+    assert calls == [0, 1]
+    graph.analysis("test_node_count", 2)  # evicts offset 1, the least recently used
+    graph.analysis("test_node_count", 1)
+    assert calls == [0, 1, 2, 1]
+    graph.add_node(5)
+    assert graph.analysis("test_node_count") == 3
+    assert len(graph._analyses) == 1
+
+    with pytest.raises(ValueError):
+        graph.analysis("no such analysis")
+
+
+def test_cached_results_are_not_shared():
+    graph = UndirectionalGraph()
+    graph.push_connections([0, 1, 1], [1, 2, 3])
+    points = find_articulation_points(graph)
+    assert points == {1}
+    points.add(7)
+    assert find_articulation_points(graph) == {1}
+    graph.remove_connection(1, 3)
+    assert find_articulation_points(graph) == {1}
+    graph.remove_connection(0, 1)
+    assert find_articulation_points(graph) == set()
+
+
+def test_find_cut_nodes_after_mutation():
+    graph = DirectionalGraph()
+    graph.push_connections([0, 0, 1], [1, 2, 2])
+    assert graph.find_cut_nodes() == {1}
+    graph.push_connection(3, 2)
+    assert graph.find_cut_nodes() == {1, 3}
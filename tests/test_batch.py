@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from RandomGraph import AgenciGraph, DirectionalGraph, UndirectionalGraph, find_articulation_points
+from RandomGraph.batch import analyze_batch
+from RandomGraph.ensemble import GraphSpec, write_corpus
+
+
+def test_matches_single_graph_analyses():
+    agenci = [AgenciGraph.CreateRandom(80, link_density_factor=0.03, agent_ratio=0.3, seed=k) for k in range(6)]
+    assert analyze_batch(agenci, "agenci", processes=2) == [graph.solve() for graph in agenci]
+
+    undirected = [UndirectionalGraph.CreateRandom(60, link_density_factor=0.05, seed=k) for k in range(6)]
+    assert analyze_batch(undirected, "articulation_points", processes=2) == \
+        [find_articulation_points(graph) for graph in undirected]
+    sizes = analyze_batch(undirected, "biconnected_components", True, processes=0)
+    assert [result.separated_sizes for result in sizes] == \
+        [find_articulation_points(graph, with_separated_sizes=True) for graph in undirected]
+
+    directed = [DirectionalGraph.CreateRandom(70, link_density_factor=0.04, seed=k) for k in range(4)]
+    for graph, components in zip(directed, analyze_batch(directed, "strongly_connected_components", processes=2)):
+        assert np.array_equal(components.component_id, graph.strongly_connected_component_labels().component_id)
+
+    with pytest.raises(ValueError):
+        analyze_batch(directed, "no such analysis")
+    with pytest.raises(ValueError):
+        analyze_batch(directed, "reversed_graph")  # needs a DirectionalGraph, the workers get frozen graphs
+
+
+def test_corpus(tmp_path):
+    spec = GraphSpec(AgenciGraph, N=50, link_density_factor=0.05, agent_ratio=0.4)
+    write_corpus(spec, 5, tmp_path, seed=1, processes=0)
+    assert analyze_batch(tmp_path, "agenci", processes=2) == analyze_batch(tmp_path, "agenci", processes=0)
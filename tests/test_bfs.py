@@ -0,0 +1,63 @@
+from collections import deque
+
+import pytest
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, DenseGraph, IGraph
+
+
+def brute_force_distances(graph: IGraph, starts: list[int]) -> dict[int, int]:
+    distance = {i: 0 for i in starts}
+    queue = deque(starts)
+    while queue:
+        i = queue.popleft()
+        for j in graph.get_children(i):
+            if j not in distance:
+                distance[j] = distance[i] + 1
+                queue.append(j)
+    return distance
+
+
+def test_matches_brute_force():
+    for seed in range(4):
+        for graph in (DirectionalGraph.CreateRandom(150, link_density_factor=0.02, seed=seed),
+                      UndirectionalGraph.CreateRandom(150, link_density_factor=0.01, seed=seed)):
+            starts = [0, 7, 42]
+            result = graph.bfs(starts)
+            assert result.as_dict() == brute_force_distances(graph, starts)
+            for i in result.reached().tolist():
+                path = result.path_to(i)
+                assert path[0] in starts and path[-1] == i
+                assert len(path) == result.distance_to(i) + 1
+                assert all(b in graph.get_children(a) for a, b in zip(path, path[1:]))
+
+
+def test_depth_limit_and_targets():
+    graph = DirectionalGraph()
+    graph.push_connections(range(9), range(1, 10))
+    graph.push_connection(0, 5)
+    assert graph.bfs(0, max_depth=2).as_dict() == {0: 0, 1: 1, 5: 1, 2: 2, 6: 2}
+    result = graph.bfs(0, targets=[7, 9])
+    assert result.distance_to(7) == 3
+    assert result.distance_to(9) is None
+    assert result.path_to(7) == [0, 5, 6, 7]
+    assert graph.bfs(9, reverse=True).distance_to(0) == 5
+    with pytest.raises(ValueError):
+        graph.bfs(100)
+
+
+def test_frozen_adjacency_is_reused():
+    graph = UndirectionalGraph()
+    graph.push_connections([0, 1], [1, 2])
+    assert graph.analysis("frozen") is graph.analysis("frozen")
+    assert graph.bfs(0).distance_to(2) == 2
+    graph.push_connection(0, 2)
+    assert graph.bfs(0).distance_to(2) == 1
+
+
+def test_dense_graph():
+    graph = DenseGraph()
+    graph.push_connections([0, 1, 5], [1, 2, 6])
+    result = graph.bfs(1)
+    assert result.as_dict() == {0: 1, 1: 0, 2: 1}
+    assert result.path_to(2) == [1, 2]
+    assert graph.bfs([0, 5], max_depth=0).as_dict() == {0: 0, 5: 0}
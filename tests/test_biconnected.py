@@ -0,0 +1,103 @@
+from RandomGraph import UndirectionalGraph, find_articulation_points
+
+
+def component_count(graph: UndirectionalGraph, removed: set[int] = frozenset(), skip_edge=None) -> int:
+    seen = set(removed)
+    count = 0
+    for start in graph.get_nodes():
+        if start in seen:
+            continue
+        count += 1
+        seen.add(start)
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j in graph.get_children(i):
+                if j not in seen and {i, j} != skip_edge:
+                    seen.add(j)
+                    stack.append(j)
+    return count
+
+
+def brute_force_articulation_points(graph: UndirectionalGraph) -> set[int]:
+    base = component_count(graph)
+    return {i for i in graph.get_nodes() if component_count(graph, {i}) > base - (len(graph.get_children(i)) == 0)}
+
+
+def brute_force_bridges(graph: UndirectionalGraph) -> set[tuple[int, int]]:
+    base = component_count(graph)
+    return {(i, j) for i in graph.get_nodes() for j in graph.get_children(i)
+            if i < j and component_count(graph, skip_edge={i, j}) > base}
+
+
+def test_matches_brute_force():
+    for seed in range(8):
+        graph = UndirectionalGraph.CreateRandom(40, link_density_factor=0.1, seed=seed)
+        result = graph.biconnected_components()
+        assert result.articulation_points == brute_force_articulation_points(graph)
+        assert result.bridges == brute_force_bridges(graph)
+        assert find_articulation_points(graph) == result.articulation_points
+        for block in result.components:
+            assert len(block) >= 2
+        edges = {frozenset((i, j)) for i in graph.get_nodes() for j in graph.get_children(i)}
+        assert all(any(edge <= block for block in result.components) for edge in edges)
+
+
+def test_two_triangles_and_a_tail():
+    graph = UndirectionalGraph()
+    for i, j in [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 2), (4, 5)]:
+        graph.push_connection(i, j)
+    graph.add_node(6)
+    result = graph.biconnected_components()
+    assert result.articulation_points == {2, 4}
+    assert result.bridges == {(4, 5)}
+    assert sorted(sorted(block) for block in result.components) == [[0, 1, 2], [2, 3, 4], [4, 5]]
+
+    tree = result.block_cut_tree()
+    assert len(tree) == 5
+    assert component_count(tree) == 1
+    blocks = {frozenset(block): k for k, block in enumerate(result.components)}
+    cut = {a: len(result.components) + k for k, a in enumerate(result.cut_vertices())}
+    assert tree.get_children(cut[2]) == {blocks[frozenset({0, 1, 2})], blocks[frozenset({2, 3, 4})]}
+    assert tree.get_children(cut[4]) == {blocks[frozenset({2, 3, 4})], blocks[frozenset({4, 5})]}
+
+
+def test_long_path():
+    n = 200_000
+    graph = UndirectionalGraph()
+    graph.push_connections(range(n - 1), range(1, n))
+    result = graph.biconnected_components()
+    assert result.articulation_points == set(range(1, n - 1))
+    assert len(result.bridges) == n - 1
+    assert len(result.components) == n - 1
+
+
+def brute_force_separated_sizes(graph: UndirectionalGraph, i: int) -> list[int]:
+    rest = {i}
+    sizes = []
+    for start in graph.get_children(i):
+        if start in rest:
+            continue
+        part = {start}
+        stack = [start]
+        while stack:
+            for j in graph.get_children(stack.pop()):
+                if j not in part and j != i:
+                    part.add(j)
+                    stack.append(j)
+        rest |= part
+        sizes.append(len(part))
+    return sorted(sizes)
+
+
+def test_separated_sizes():
+    for seed in range(8):
+        graph = UndirectionalGraph.CreateRandom(50, link_density_factor=0.08, seed=seed)
+        sizes = find_articulation_points(graph, with_separated_sizes=True)
+        assert set(sizes) == find_articulation_points(graph)
+        for i, parts in sizes.items():
+            assert sorted(parts) == brute_force_separated_sizes(graph, i)
+        for parts in sizes.values():
+            parts.clear()  # the caller's copy, not the cached result
+        assert {i: sorted(parts) for i, parts in find_articulation_points(graph, with_separated_sizes=True).items()} \
+            == {i: brute_force_separated_sizes(graph, i) for i in sizes}
@@ -67,28 +67,28 @@ def RandomGraph() -> UndirectionalGraph:
 
 
 def solve(graph: UndirectionalGraph):
-    articulation_points = find_articulation_points(graph)
-
-    connection_counts = {}
+    separated_sizes = find_articulation_points(graph, with_separated_sizes=True)
 
     all_meetings = len(graph) * (len(graph) - 1)
 
+    connection_counts = {}
     for node in graph.get_nodes():
-    # for node in articulation_points:
-        if node in articulation_points:
-            discovered = {node: 1}
-            connection_count = 0
+        # Removing a node that is not an articulation point leaves all the other nodes connected
+        sizes = separated_sizes.get(node, [len(graph) - 1])
+        connection_counts[node] = all_meetings - sum(count * (count - 1) for count in sizes)
 
-            for child in graph.get_children(node):
-                if child not in discovered:
-                    count = graph.dfs(child, discovered=discovered)
-                    connection_count += (count * (count - 1))
+    return connection_counts
 
-            connection_counts[node] = all_meetings - connection_count
-        else:
-            connection_counts[node] = (len(graph) - 1) * 2
 
-    return connection_counts
+def test_example():
+    graph = GetExample("""5 5
+1 2
+2 3
+1 3
+3 4
+4 5""")
+    connection_counts = solve(graph)
+    assert [connection_counts[key] for key in sorted(graph.get_nodes())] == [8, 8, 16, 14, 8]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, DenseGraph
+from RandomGraph.digraph import DiGraph
+from RandomGraph.directional_tagged_graph import DirectionalTaggedGraph
+
+rng = np.random.default_rng(12)
+SRC = rng.integers(0, 50, 300)
+DST = rng.integers(0, 50, 300)
+
+
+def one_by_one(graph, costs=None, tags=None):
+    for k, (i, j) in enumerate(zip(SRC.tolist(), DST.tolist())):
+        graph.push_connection(i, j, **({} if costs is None else {"cost": costs[k]}),
+                              **({} if tags is None else {"tag": tags[k]}))
+    return graph
+
+
+def test_directional():
+    bulk = DirectionalGraph()
+    bulk.push_connections(SRC, DST)
+    single = one_by_one(DirectionalGraph())
+    assert bulk._graph == single._graph
+    assert bulk._reverse_graph == single._reverse_graph
+
+
+def test_weighted_directional():
+    costs = rng.integers(1, 9, len(SRC)).tolist()
+    bulk = DirectionalGraph(all_edge_weights_equal_one=False, edge_weights_are_symmetrical=False)
+    bulk.push_connections(SRC, DST, costs=costs)
+    single = one_by_one(DirectionalGraph(all_edge_weights_equal_one=False, edge_weights_are_symmetrical=False),
+                        costs=costs)
+    assert bulk == single
+    assert np.array_equal(bulk.freeze().edge_weights, single.freeze().edge_weights)
+
+
+def test_undirectional():
+    bulk = UndirectionalGraph()
+    bulk.add_nodes(range(60))
+    bulk.push_connections(SRC.tolist(), DST.tolist())
+    single = UndirectionalGraph()
+    for i in range(60):
+        single.add_node(i)
+    one_by_one(single)
+    assert bulk == single
+
+
+def test_dense():
+    bulk = DenseGraph()
+    bulk.push_connections(SRC, DST)
+    assert bulk == one_by_one(DenseGraph())
+
+
+def test_digraph():
+    costs = rng.integers(1, 9, len(SRC))
+    bulk = DiGraph()
+    bulk.push_connections(SRC, DST + 100, costs=costs)
+    single = DiGraph()
+    for i, j, cost in zip(SRC.tolist(), (DST + 100).tolist(), costs.tolist()):
+        single.push_connection(i, j, cost=cost)
+    assert bulk == single
+
+
+def test_tagged():
+    tags = ["solid" if k % 2 else "dotted" for k in range(len(SRC))]
+    bulk = DirectionalTaggedGraph()
+    bulk.push_connections(SRC, DST, tags=tags)
+    assert bulk == one_by_one(DirectionalTaggedGraph(), tags=tags)
+
+
+def test_add_node_keeps_edges():
+    graph = DirectionalGraph()
+    graph.push_connection(0, 1)
+    graph.add_node(0)
+    graph.add_nodes([1, 2])
+    assert graph.get_children(0) == {1}
+    assert graph.parents(1) == {0}
+    assert graph.get_nodes() == {0, 1, 2}
@@ -0,0 +1,66 @@
+import pytest
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, CSRGraph, ImmutableGraphError
+from RandomGraph.digraph import DiGraph
+
+
+def visit_order(graph, start: int) -> list[int]:
+    order = []
+
+    def process_vertex_early(node: int) -> bool:
+        order.append(node)
+        return False
+
+    graph.dfs(start, process_vertex_early=process_vertex_early)
+    return order
+
+
+def test_freeze_directional():
+    graph = DirectionalGraph.CreateRandom(60, link_density_factor=0.1, seed=1)
+    frozen = graph.freeze()
+    assert isinstance(frozen, CSRGraph)
+    assert len(frozen) == len(graph.get_nodes())
+    assert frozen.get_nodes() == graph.get_nodes()
+    for i in graph.get_nodes():
+        assert frozen.get_children(i) == graph.get_children(i)
+        assert frozen.parents(i) == graph.parents(i)
+    assert frozen.thaw()._graph == graph._graph
+    assert set(visit_order(frozen, 0)) == set(visit_order(graph, 0))
+
+
+def test_freeze_undirectional():
+    graph = UndirectionalGraph.CreateRandom(60, link_density_factor=0.1, seed=2)
+    frozen = graph.freeze()
+    assert frozen.edge_count == sum(len(graph.get_children(i)) for i in graph.get_nodes())
+    for i in graph.get_nodes():
+        assert frozen.get_children(i) == graph.get_children(i)
+    assert frozen.thaw() == graph
+
+
+def test_freeze_sparse_ids():
+    graph = UndirectionalGraph()
+    graph.push_connection(10, 30)
+    graph.push_connection(30, 20)
+    graph.add_node(5)
+    frozen = graph.freeze()
+    assert frozen.get_nodes() == {5, 10, 20, 30}
+    assert frozen.get_children(30) == {10, 20}
+    assert 7 not in frozen
+    assert frozen.dfs(10) == 3
+    with pytest.raises(ImmutableGraphError):
+        frozen.push_connection(5, 10)
+    with pytest.raises(TypeError):
+        frozen.remove_node(5)
+
+
+def test_freeze_digraph():
+    graph = DiGraph()
+    graph.push_connection(0, 2, cost=5)
+    graph.push_connection(1, 2, cost=7)
+    graph.push_connection(1, 3, cost=1)
+    frozen = graph.freeze()
+    assert frozen.get_connection_weight(1, 2) == 7
+    assert frozen.parents(2) == {0, 1}
+    thawed = frozen.thaw()
+    assert thawed == graph
+    assert thawed.vertex_side(3) == 1
@@ -0,0 +1,58 @@
+import numpy as np
+
+from RandomGraph import DenseGraph
+
+
+def partition(graph: DenseGraph) -> set[frozenset[int]]:
+    return {frozenset(group) for group in graph.groups()}
+
+
+def test_merging_groups():
+    graph = DenseGraph()
+    graph.push_connection(0, 1)
+    graph.push_connection(2, 3)
+    graph.push_connection(4, 5)
+    graph.push_connection(1, 2)  # used to delete a list entry and leave stale group ids behind
+    graph.push_connection(5, 6)
+    assert partition(graph) == {frozenset({0, 1, 2, 3}), frozenset({4, 5, 6})}
+    assert graph.get_children(6) == {4, 5}
+    assert len(graph) == 7
+
+
+def test_remove_node():
+    graph = DenseGraph()
+    for i in range(1, 5):
+        graph.push_connection(0, i)
+    graph.push_connection(10, 11)
+    graph.remove_node(0)
+    graph.remove_node(10)
+    assert partition(graph) == {frozenset({1, 2, 3, 4}), frozenset({11})}
+    graph.push_connection(4, 11)
+    assert graph.get_children(11) == {1, 2, 3, 4}
+    assert 0 not in graph
+    graph.add_node(0)  # a removed node comes back on its own
+    assert graph.group(0) == {0}
+    assert sorted(graph.nodes_array().tolist()) == [0, 1, 2, 3, 4, 11]
+
+
+def test_bulk_matches_single():
+    rng = np.random.default_rng(4)
+    src = rng.integers(0, 3000, 2500)
+    dst = rng.integers(0, 3000, 2500)
+    bulk = DenseGraph()
+    bulk.push_connections(src, dst)
+    single = DenseGraph()
+    for i, j in zip(src.tolist(), dst.tolist()):
+        single.push_connection(i, j)
+    assert bulk == single
+    assert sum(len(group) for group in bulk.groups()) == len(bulk)
+
+
+def test_long_chain():
+    n = 100_000
+    graph = DenseGraph()
+    graph.push_connections(np.arange(n - 1), np.arange(1, n))
+    assert len(graph.groups()) == 1
+    graph.push_connection(n, n + 1)
+    assert len(graph.groups()) == 2
+    assert len(graph.group(n - 1)) == n
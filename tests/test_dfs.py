@@ -0,0 +1,59 @@
+from RandomGraph import DirectionalGraph, UndirectionalGraph, EdgeType, make_dfs_trees
+
+
+def path_graph(graph, n: int):
+    for i in range(n - 1):
+        graph.push_connection(i, i + 1)
+    return graph
+
+
+def test_long_path_directional():
+    n = 200_000
+    graph = path_graph(DirectionalGraph(), n)
+    discovered, processed, parents = {}, {}, {}
+    assert graph.dfs(0, discovered=discovered, processed=processed, parents=parents) == n
+    assert len(processed) == n
+    assert parents[n - 1] == n - 2
+    assert processed[0] == 2 * n
+
+
+def test_long_path_undirectional():
+    n = 200_000
+    graph = path_graph(UndirectionalGraph(), n)
+    late = []
+    assert graph.dfs(n // 2, process_vertex_late=lambda node: late.append(node) and False) == n
+    assert len(late) == n
+    assert late[-1] == n // 2
+
+
+def test_edge_types_directional():
+    graph = DirectionalGraph()
+    for i, j in [(0, 1), (1, 2), (2, 0), (0, 2), (3, 2)]:
+        graph.push_connection(i, j)
+    edges = {}
+
+    def process_edge(parent: int, child: int, edge_type: EdgeType) -> bool:
+        edges[(parent, child)] = edge_type
+        return False
+
+    discovered, processed = {}, {}
+    graph.dfs(0, discovered=discovered, processed=processed, process_edge=process_edge)
+    graph.dfs(3, discovered=discovered, processed=processed, process_edge=process_edge)
+    assert edges[(0, 1)] == EdgeType.TREE
+    assert edges[(1, 2)] == EdgeType.TREE
+    assert edges[(2, 0)] == EdgeType.BACK
+    assert edges[(0, 2)] == EdgeType.FORWARD
+    assert edges[(3, 2)] == EdgeType.CROSS
+
+
+def test_early_termination():
+    graph = path_graph(UndirectionalGraph(), 10)
+    discovered = {}
+    graph.dfs(0, discovered=discovered, process_vertex_early=lambda node: node == 4)
+    assert set(discovered) == {0, 1, 2, 3, 4}
+
+
+def test_dfs_trees_of_directional_graph():
+    graph = DirectionalGraph.CreateRandom(30, link_density_factor=0.1, seed=5)
+    trees = make_dfs_trees(graph)
+    assert trees.get_nodes() == graph.get_nodes()
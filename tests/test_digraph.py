@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from RandomGraph import digraph
+from RandomGraph.digraph import DiGraph
+
+
+def one_by_one(costs: np.ndarray, mask: np.ndarray) -> DiGraph:
+    n_left, n_right = costs.shape
+    graph = DiGraph()
+    graph.add_nodes(range(n_left), 0)
+    graph.add_nodes(range(n_left, n_left + n_right), 1)
+    for u, v in zip(*np.nonzero(mask)):
+        graph.push_connection(int(u), int(v) + n_left, cost=int(costs[u, v]))
+    return graph
+
+
+def test_cost_matrix():
+    rng = np.random.default_rng(3)
+    costs = rng.integers(-5, 9, (30, 20))
+    mask = rng.random(costs.shape) < 0.3
+    graph = DiGraph.CreateFromCostMatrix(costs, mask)
+    assert graph == one_by_one(costs, mask)
+    assert graph.edge_count == mask.sum()
+    u, v = np.argwhere(mask)[0]
+    assert graph.get_connection_weight(int(u), int(v) + 30) == costs[u, v]
+    assert graph.parents(int(v) + 30) == {int(k) for k in np.flatnonzero(mask[:, v])}
+
+    full = DiGraph.CreateFromCostMatrix(costs, left=range(100, 130), right=range(20))
+    assert full.edge_count == 600
+    assert full.get_connection_weight(101, 2) == costs[1, 2]
+    assert full.vertex_side(0) == 1
+
+
+def test_edge_arrays():
+    graph = DiGraph.CreateFromEdgeArrays([0, 1, 1, 0], [5, 5, 6, 5], costs=[1, 2, 3, 4], right=[7])
+    assert graph.get_connection_weight(0, 5) == 4  # the last repeated edge counts
+    assert graph.edge_count == 3
+    assert graph.get_nodes() == {0, 1, 5, 6, 7}
+    with pytest.raises(ValueError):
+        graph.push_connections([5], [8])
+
+
+def test_remove():
+    rng = np.random.default_rng(4)
+    costs = rng.integers(0, 9, (40, 40))
+    mask = rng.random(costs.shape) < 0.2
+    graph = DiGraph.CreateFromCostMatrix(costs, mask)
+    graph.remove_nodes([3, 7, 41, 79])
+    expected = one_by_one(costs, mask)
+    for i in (3, 7, 41, 79):
+        expected.remove_node(i)
+    assert graph == expected
+    assert graph.get_children(3) == set() and 3 not in graph.get_nodes()
+
+    graph.push_connection(0, 41, cost=2)
+    graph.remove_connection(41, 0)
+    assert not graph.__contains__(0, 41)
+    with pytest.raises(KeyError):
+        graph.remove_connection(0, 41)
+
+    graph.remove_unconnected_nodes()
+    assert 41 not in graph.get_nodes()
+    assert all(graph.get_children(i) or graph.parents(i) for i in graph.get_nodes())
+
+
+def test_single_edges_match_dict(monkeypatch):
+    monkeypatch.setattr(digraph, "COMPACT_MIN", 8)  # merge often
+    rng = np.random.default_rng(8)
+    graph = DiGraph()
+    expected = {}
+    for step in range(3000):
+        i, j = int(rng.integers(0, 30)), int(rng.integers(30, 60))
+        if (i, j) in expected and rng.random() < 0.5:
+            graph.remove_connection(j, i)
+            del expected[(i, j)]
+        else:
+            graph.push_connection(i, j, cost=step)
+            expected[(i, j)] = step
+        assert graph.edge_count == len(expected)
+        assert graph.get_children(i) == {b for a, b in expected if a == i}
+        assert graph.__contains__(i, j) == ((i, j) in expected)
+    assert {(i, j): graph.get_connection_weight(i, j) for i, j in expected} == expected
+    src, dst = graph.edge_arrays()
+    assert set(zip(src.tolist(), dst.tolist())) == set(expected)
+
+
+def test_create_random():
+    graph = DiGraph.CreateRandom(300, 200, 0.05, seed=5)
+    assert graph == DiGraph.CreateRandom(300, 200, 0.05, seed=5)
+    assert len(graph) == 500
+    assert 0.04 < graph.edge_count / 60000 < 0.06
+    src, dst = graph.edge_arrays()
+    assert src.max() < 300 <= dst.min()
+
+    perfect = DiGraph.CreateRandom(300, 200, 0.001, seed=5, perfect=True)
+    assert len(perfect.maximum_matching()) == 200
+    assert len(perfect.planted_assignment) == 200
+    assert all(perfect.__contains__(i, j) for i, j in perfect.planted_assignment.as_dict().items())
+
+    for n_left, n_right in ((200, 300), (300, 200)):
+        planted = DiGraph.CreateRandom(n_left, n_right, 0.02, cost_distribution=lambda rng, size: rng.poisson(20, size),
+                                       seed=6, planted=True)
+        expected = planted.planted_assignment
+        assert expected.as_dict() != {k: n_left + k for k in range(len(expected))}
+        assignment = planted.min_cost_assignment()
+        assert assignment.as_dict() == expected.as_dict()
+        assert assignment.cost == expected.cost
+        # The planted edges are not all the cheapest of their rows
+        assert any(planted.get_connection_weight(i, j) > min(planted.get_connection_weight(i, k)
+                                                             for k in planted.get_children(i))
+                   for i, j in expected.as_dict().items())
+
+
+def test_planted_assignment_is_optimal():
+    for seed in range(400):
+        n_left, n_right = [(1, 4), (3, 2), (3, 3), (2, 5)][seed % 4]
+        planted = DiGraph.CreateRandom(n_left, n_right, 0.6, seed=seed, planted=True)
+        assignment = planted.min_cost_assignment()
+        assert assignment.cost == planted.planted_assignment.cost
+        assert assignment.as_dict() == planted.planted_assignment.as_dict()
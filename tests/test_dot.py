@@ -0,0 +1,80 @@
+import io
+import re
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, dot_writer
+from RandomGraph.directional_tagged_graph import DirectionalTaggedGraph
+
+
+def edges_of(dot: str, arrow: str) -> set[tuple[int, int]]:
+    return {(int(i), int(j)) for i, j in re.findall(rf"^(\d+) {arrow} (\d+)", dot, flags=re.MULTILINE)}
+
+
+def drawn_edges(dot: str) -> dict[tuple[int, int], str]:
+    """
+    :return: (tail, head) -> the attributes that differ from a plain arrow, of every edge of a DOT text.
+    """
+    edges = {}
+    for i, j, attributes in re.findall(r"^\s*(\d+) -> (\d+)(.*)$", dot.replace('"', ""), flags=re.MULTILINE):
+        edges[(int(i), int(j))] = " ".join(sorted(re.findall(r"dir=\w+|arrowhead=none", attributes)))
+    return edges
+
+
+def test_directed_edges_and_components():
+    graph = DirectionalGraph.CreateRandom(60, link_density_factor=0.08, seed=4)
+    out = io.StringIO()
+    graph.write_dot(out)
+    dot = out.getvalue()
+    assert dot.startswith("digraph {") and dot.rstrip().endswith("}")
+    expected = {(i, j) for i in graph.get_nodes() for j in graph.get_children(i)
+                if not (i in graph.get_children(j) and i < j)}
+    assert edges_of(dot, "->") == expected
+    sizes = graph.strongly_connected_component_labels().sizes
+    assert dot.count("filled") == int(sizes[sizes > 1].sum())
+
+
+def test_collapse_components(tmp_path):
+    graph = DirectionalGraph()
+    graph.push_connections([0, 1, 1, 2, 3], [1, 0, 2, 3, 2])
+    path = tmp_path / "graph.dot"
+    graph.write_dot(path, collapse_components=True)
+    dot = path.read_text()
+    assert dot.count("2 nodes") == 2
+    assert re.findall(r"^c\d+ -> c\d+$", dot, flags=re.MULTILINE) == ["c0 -> c1"]
+
+
+def test_neighbourhood():
+    graph = UndirectionalGraph()
+    graph.push_connections(range(9), range(1, 10))
+    out = io.StringIO()
+    graph.write_dot(out, around=[5], hops=2)
+    assert edges_of(out.getvalue(), "--") == {(3, 4), (4, 5), (5, 6), (6, 7)}
+
+
+def test_tags_become_styles():
+    graph = DirectionalTaggedGraph()
+    graph.push_connection(0, 1, tag="dotted")
+    graph.push_connection(1, 2)
+    out = io.StringIO()
+    graph.write_dot(out)
+    assert '0 -> 1 [style="dotted"]' in out.getvalue()
+    assert "1 -> 2\n" in out.getvalue()
+
+
+def test_small_blocks(monkeypatch):
+    graph = DirectionalGraph.CreateRandom(200, link_density_factor=0.05, seed=7)
+    whole = io.StringIO()
+    graph.write_dot(whole)
+    monkeypatch.setattr(dot_writer, "LINE_BLOCK", 5)
+    blocks = io.StringIO()
+    graph.write_dot(blocks)
+    assert blocks.getvalue() == whole.getvalue()
+
+
+def test_same_picture_as_plot():
+    small = DirectionalGraph()
+    # 0 -> 1 is a one-way edge inside the component {0, 1, 2}, 2 <-> 0 a mutual pair, 3 -> 3 a self-loop
+    small.push_connections([0, 1, 2, 0, 2, 3], [1, 2, 0, 2, 3, 3])
+    for graph in (small, DirectionalGraph.CreateRandom(60, link_density_factor=0.08, seed=9)):
+        out = io.StringIO()
+        graph.write_dot(out)
+        assert drawn_edges(out.getvalue()) == drawn_edges(graph.plot().source)
@@ -0,0 +1,25 @@
+from RandomGraph import AgenciGraph, UndirectionalGraph
+from RandomGraph.ensemble import GraphSpec, generate_ensemble, write_corpus, load_corpus
+from RandomGraph.storage import loads_graph, dumps_graph
+
+
+def test_reproducible_across_processes():
+    spec = GraphSpec(AgenciGraph, N=60, link_density_factor=0.05, agent_ratio=0.5)
+    pooled = list(generate_ensemble(spec, 6, seed=11, processes=2))
+    local = list(generate_ensemble(spec, 6, seed=11, processes=0))
+    assert pooled == local
+    assert len(set(local)) == 6
+    assert list(generate_ensemble(spec, 3, seed=11, processes=0)) == local[:3]
+
+    graph = loads_graph(local[0])
+    assert isinstance(graph, AgenciGraph)
+    assert len(graph.agents) == 30
+    assert dumps_graph(graph) == local[0]
+
+
+def test_corpus(tmp_path):
+    spec = GraphSpec(UndirectionalGraph, N=40, link_density_factor=0.1)
+    paths = write_corpus(spec, 4, tmp_path / "corpus", seed=3, processes=2)
+    assert len(paths) == 4
+    graphs = list(load_corpus(tmp_path / "corpus"))
+    assert graphs == [loads_graph(blob) for blob in generate_ensemble(spec, 4, seed=3, processes=0)]
@@ -0,0 +1,85 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph, incremental_scc
+
+
+def partition(graph: DirectionalGraph) -> set[frozenset[int]]:
+    return {frozenset(group.tolist()) for group in graph.freeze().strongly_connected_component_labels().members()}
+
+
+def check(graph: DirectionalGraph):
+    incremental = graph.incremental_scc
+    expected = partition(graph)
+    assert {frozenset(incremental.members(c)) for c in set(map(incremental.component_of, graph.get_nodes()))} \
+        == expected
+    labels = graph.strongly_connected_component_labels()
+    assert graph.strongly_connected_component_labels() is labels
+    positions = sorted(incremental._order.values())
+    assert positions == sorted(incremental._width)
+    assert all(p + incremental._width[p] <= q for p, q in zip(positions, positions[1:]))
+    assert {frozenset(group.tolist()) for group in labels.members()} == expected
+    component = labels.as_dict()
+    for i in graph.get_nodes():
+        for j in graph.get_children(i):
+            assert component[i] <= component[j]
+
+
+def test_random_insertions_and_deletions():
+    rng = np.random.default_rng(5)
+    graph = DirectionalGraph.CreateRandom(30, link_density_factor=0.03, seed=5)
+    graph.enable_incremental_scc()
+    check(graph)
+    for step in range(400):
+        i, j = rng.integers(0, 32, size=2).tolist()
+        if j in graph.get_nodes() and i in graph.get_nodes() and j in graph.get_children(i):
+            graph.remove_connection(i, j)
+        elif i != j:
+            graph.push_connection(i, j)
+        if step % 50 == 49:
+            victim = int(rng.integers(0, 32))
+            if victim in graph.get_nodes():
+                graph.remove_node(victim)
+        check(graph)
+
+
+def test_order_runs_out_of_room(monkeypatch):
+    monkeypatch.setattr(incremental_scc, "ORDER_GAP", 2)  # most splits have to spread the order
+    test_random_insertions_and_deletions()
+
+
+def test_split_into_more_parts_than_gap(monkeypatch):
+    monkeypatch.setattr(incremental_scc, "ORDER_GAP", 4)
+    n = 10
+    graph = DirectionalGraph()
+    incremental = graph.enable_incremental_scc()
+    graph.push_connections(list(range(n)), [(i + 1) % n for i in range(n)])
+    graph.remove_connection(n - 1, 0)  # the cycle falls apart into n components, more than ORDER_GAP
+    assert len(incremental) == n
+    assert len(set(incremental._order.values())) == n
+    check(graph)
+    graph.push_connection(0, 5)
+    graph.push_connection(7, 2)
+    check(graph)
+
+
+def test_cycle_merge_and_split():
+    graph = DirectionalGraph()
+    incremental = graph.enable_incremental_scc()
+    graph.push_connections([0, 1, 2], [1, 2, 3])
+    assert len(incremental) == 4
+    graph.push_connection(3, 0)
+    assert len(incremental) == 1
+    assert incremental.component_size(2) == 4
+    graph.remove_connection(1, 2)
+    assert len(incremental) == 4
+    assert not incremental.same_component(0, 3)
+    check(graph)
+
+
+def test_bulk_insertion_rebuilds():
+    graph = DirectionalGraph()
+    graph.add_nodes(range(5))
+    graph.enable_incremental_scc()
+    graph.push_connections(np.arange(100) % 10, (np.arange(100) + 1) % 10)
+    assert len(graph.incremental_scc) == 1
+    check(graph)
@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, AgenciGraph
+from RandomGraph.loaders import IntTokenReader
+
+
+def test_reader_across_chunk_boundaries():
+    values = np.arange(-500, 5000, 7)
+    text = "\n".join(" ".join(str(v) for v in row) for row in np.array_split(values, 50)).encode()
+    reader = IntTokenReader(io.BytesIO(text), chunk_size=13)
+    assert reader.read_int() == -500
+    assert np.array_equal(reader.read(len(values) - 1), values[1:])
+
+
+def test_reader_rejects_garbage():
+    reader = IntTokenReader(io.BytesIO(b"1 2 x 3"))
+    try:
+        reader.read(3)
+    except ValueError:
+        return
+    assert False
+
+
+def test_undirectional_round_trip(tmp_path):
+    graph = UndirectionalGraph.CreateRandom(300, link_density_factor=0.05, seed=3)
+    path = tmp_path / "graph.txt"
+    path.write_text(str(graph))
+    assert UndirectionalGraph.CreateFromFile(path) == graph
+    assert UndirectionalGraph.CreateFromFile(str(path)) == graph
+    with open(path, "rb") as f:
+        assert UndirectionalGraph.CreateFromFile(f) == graph
+
+
+def test_directional_round_trip(tmp_path):
+    graph = DirectionalGraph.CreateRandom(300, link_density_factor=0.05, seed=3)
+    path = tmp_path / "graph.txt"
+    path.write_text(str(graph))
+    assert DirectionalGraph.CreateFromFile(path)._graph == graph._graph
+
+
+def test_agenci_from_string():
+    graph = AgenciGraph.CreateFromString("""5
+7
+9 70
+2 40
+1 70
+6 0
+4 65
+8 10
+7 115
+4
+1 10
+2 1
+4 3
+4 6""")
+    assert graph.agents == {8: 70, 1: 40, 0: 70, 5: 0, 3: 65, 7: 10, 6: 115}
+    assert graph.get_children(0) == {9}
+    assert graph.get_children(3) == {2, 5}
+    assert AgenciGraph.CreateFromString(str(graph)).agents == graph.agents
@@ -0,0 +1,67 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from RandomGraph.digraph import DiGraph
+
+
+def random_digraph(n_left: int, n_right: int, density: float, seed: int, low: int = 0) -> DiGraph:
+    rng = np.random.default_rng(seed)
+    graph = DiGraph()
+    graph.add_nodes(range(n_left), 0)
+    graph.add_nodes(range(n_left, n_left + n_right), 1)
+    mask = rng.random((n_left, n_right)) < density
+    src, dst = np.nonzero(mask)
+    graph.push_connections(src, dst + n_left, costs=rng.integers(low, 20, len(src)))
+    return graph
+
+
+def brute_force(graph: DiGraph, n_left: int, n_right: int) -> tuple[int, int]:
+    """
+    :return: tuple of (size of the maximum matching, minimum cost of a matching of that size).
+    """
+    best = (0, 0)
+    rights = list(range(n_left, n_left + n_right)) + [None] * n_left
+    for assignment in set(itertools.permutations(rights, n_left)):
+        edges = [(i, j) for i, j in enumerate(assignment) if j is not None]
+        if all(graph.__contains__(i, j) for i, j in edges):
+            candidate = (len(edges), -sum(graph.get_connection_weight(i, j) for i, j in edges))
+            best = max(best, candidate)
+    return best[0], -best[1]
+
+
+def check_matching(graph: DiGraph, matching):
+    assert len(set(matching.left.tolist())) == len(matching) == len(set(matching.right.tolist()))
+    assert all(graph.__contains__(i, j) for i, j in matching.as_dict().items())
+
+
+def test_matches_brute_force():
+    for seed in range(30):
+        n_left, n_right = 1 + seed % 5, 1 + (seed // 5) % 5
+        graph = random_digraph(n_left, n_right, 0.5, seed, low=-5)
+        size, cost = brute_force(graph, n_left, n_right)
+        maximum = graph.maximum_matching()
+        check_matching(graph, maximum)
+        assert len(maximum) == size
+        assignment = graph.min_cost_assignment()
+        check_matching(graph, assignment)
+        assert (len(assignment), assignment.cost) == (size, cost)
+
+
+def test_large():
+    graph = random_digraph(400, 400, 0.05, 1)
+    maximum = graph.maximum_matching()
+    assignment = graph.min_cost_assignment(perfect=True)
+    check_matching(graph, assignment)
+    assert len(maximum) == len(assignment) == 400
+    assert assignment.cost == sum(graph.get_connection_weight(i, j) for i, j in assignment.as_dict().items())
+    assert graph.maximum_matching() is maximum
+
+
+def test_perfect():
+    graph = DiGraph()
+    graph.push_connections([0, 1], [2, 2])
+    assert len(graph.min_cost_assignment()) == 1
+    with pytest.raises(ValueError):
+        graph.min_cost_assignment(perfect=True)
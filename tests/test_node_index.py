@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, DenseGraph
+from RandomGraph.digraph import DiGraph
+from RandomGraph.node_index import NodeIndex
+
+
+def test_swap_remove():
+    index = NodeIndex(capacity=2)
+    index.add_many([5, 7, 5, 9])
+    assert index.add(11) == 3
+    assert list(index) == [5, 7, 9, 11]
+    index.remove(7)
+    assert len(index) == 3
+    assert index.position(11) == 1
+    assert index.array().tolist() == [5, 11, 9]
+    assert set(index.view()) == {5, 9, 11}
+    with pytest.raises(ValueError):
+        index.array()[0] = 1
+
+
+def test_graphs_keep_their_nodes():
+    for graph in (DirectionalGraph(), UndirectionalGraph()):
+        graph.add_node(10)
+        graph.push_connection(1, 2)
+        graph.push_connections(np.array([2, 3]), np.array([4, 1]))
+        assert graph.get_nodes() == {10, 1, 2, 3, 4}
+        assert len(graph) == 5
+        graph.remove_node(2)
+        assert graph.get_nodes() == {10, 1, 3, 4}
+        assert sorted(graph.nodes_array().tolist()) == [1, 3, 4, 10]
+        assert len(graph) == 4
+
+    graph = DiGraph()
+    graph.add_nodes([0, 1], 0)
+    graph.push_connection(0, 5, cost=3)
+    graph.push_connection(1, 5, cost=2)
+    graph.remove_node(5)
+    assert graph.get_nodes() == {0, 1}
+    assert graph.get_children(0) == set()
+
+    dense = DenseGraph()
+    dense.push_connections([1, 3], [2, 4])
+    dense.remove_node(3)
+    assert dense.get_nodes() == {1, 2, 4}
+    assert sorted(dense.nodes_array().tolist()) == [1, 2, 4]
+
+
+def test_len_of_random_graph():
+    graph = DirectionalGraph.CreateRandom(50, 0.1, seed=1)
+    assert len(graph) == 50
+    assert graph.get_nodes() == set(range(50))
@@ -0,0 +1,63 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph, AgenciGraph, UndirectionalGraph
+from RandomGraph.sampling import sample_directed_edges, sample_undirected_edges, make_rng
+
+
+def test_directed_edges_are_valid():
+    for p in (0.01, 0.3, 1.0):
+        src, dst = sample_directed_edges(50, p, make_rng(1))
+        assert np.all(src != dst)
+        assert np.all((0 <= dst) & (dst < 50))
+        pairs = set(zip(src.tolist(), dst.tolist()))
+        assert len(pairs) == len(src)
+    src, dst = sample_directed_edges(50, 1.0, make_rng(1))
+    assert len(src) == 50 * 49
+
+
+def test_directed_edge_density():
+    N = 2000
+    for p in (0.001, 0.05, 0.5):
+        src, _ = sample_directed_edges(N, p, make_rng(7))
+        expected = N * (N - 1) * p
+        assert abs(len(src) - expected) < 6 * np.sqrt(expected)
+
+
+def test_create_random_is_reproducible():
+    graph1 = DirectionalGraph.CreateRandom(100, link_density_factor=0.1, seed=42)
+    graph2 = DirectionalGraph.CreateRandom(100, link_density_factor=0.1, seed=42)
+    graph3 = DirectionalGraph.CreateRandom(100, link_density_factor=0.1, seed=43)
+    assert graph1._graph == graph2._graph
+    assert graph1._graph != graph3._graph
+    for i in graph1.get_nodes():
+        for j in graph1.get_children(i):
+            assert i in graph1.parents(j)
+
+
+def test_create_random_agenci():
+    graph = AgenciGraph.CreateRandom(30, link_density_factor=0.2, seed=3)
+    assert isinstance(graph, AgenciGraph)
+    assert len(graph.agents) == int(30 * 0.7)
+
+
+def test_undirected_edges_are_valid():
+    for p in (0.01, 0.3, 1.0):
+        src, dst = sample_undirected_edges(60, p, make_rng(5))
+        assert np.all(src < dst)
+        assert np.all(dst < 60)
+        assert len(set(zip(src.tolist(), dst.tolist()))) == len(src)
+    src, dst = sample_undirected_edges(60, 1.0, make_rng(5))
+    assert len(src) == 60 * 59 // 2
+    assert set(zip(src.tolist(), dst.tolist())) == {(i, j) for i in range(60) for j in range(i + 1, 60)}
+
+
+def test_create_random_undirected_is_reproducible():
+    graph1 = UndirectionalGraph.CreateRandom(200, link_density_factor=0.05, seed=11)
+    graph2 = UndirectionalGraph.CreateRandom(200, link_density_factor=0.05, seed=np.random.default_rng(11))
+    assert graph1 == graph2
+    assert str(graph1) == str(graph2)
+    assert len(graph1) == 200
+    for i in graph1.get_nodes():
+        assert i not in graph1.get_children(i)
+        for j in graph1.get_children(i):
+            assert i in graph1.get_children(j)
@@ -0,0 +1,87 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph, AgenciGraph, DenseGraph, CSRGraph
+
+
+def brute_force_components(graph: DirectionalGraph) -> set[frozenset[int]]:
+    reach = {i: graph._dfs(i) for i in graph.get_nodes()}
+    return {frozenset(j for j in reach[i] if i in reach[j]) for i in graph.get_nodes()}
+
+
+def test_matches_brute_force():
+    for seed in range(5):
+        graph = DirectionalGraph.CreateRandom(60, link_density_factor=0.06, seed=seed)
+        scc = graph.strongly_connected_component_labels()
+        assert {frozenset(group.tolist()) for group in scc.members()} == brute_force_components(graph)
+        assert scc.sizes.sum() == len(graph.get_nodes())
+
+
+def test_topological_numbering():
+    graph = DirectionalGraph.CreateRandom(300, link_density_factor=0.01, seed=9)
+    scc = graph.strongly_connected_component_labels()
+    component = scc.as_dict()
+    for i in graph.get_nodes():
+        for j in graph.get_children(i):
+            assert component[i] <= component[j]
+
+
+def test_long_cycle():
+    n = 200_000
+    graph = DirectionalGraph()
+    for i in range(n):
+        graph.push_connection(i, (i + 1) % n)
+    graph.push_connection(n, 0)
+    scc = graph.strongly_connected_component_labels()
+    assert len(scc) == 2
+    assert sorted(scc.sizes.tolist()) == [1, n]
+    assert scc.component_of(n) == 0
+
+
+def test_dense_graph_view():
+    graph = DirectionalGraph()
+    for i, j in [(0, 1), (1, 0), (1, 2), (2, 3), (3, 2)]:
+        graph.push_connection(i, j)
+    expected = DenseGraph()
+    expected.push_connection(0, 1)
+    expected.push_connection(2, 3)
+    assert graph.strongly_connected_components() == expected
+    assert graph.strongly_connected_components2() == expected
+
+
+def test_plot():
+    graph = AgenciGraph.CreateRandom(40, link_density_factor=0.1, seed=2)
+    assert "filled" in graph.plot().source
+    assert "filled" not in graph.plot(False).source
+    assert np.all(DirectionalGraph.CreateRandom(40, 0.1, seed=2).strongly_connected_component_labels().sizes > 0)
+
+
+def test_condensation():
+    for seed in range(5):
+        graph = DirectionalGraph.CreateRandom(80, link_density_factor=0.04, seed=seed)
+        condensation = graph.condensation()
+        component = condensation.components.as_dict()
+        expected = {(component[i], component[j]) for i in graph.get_nodes() for j in graph.get_children(i)
+                    if component[i] != component[j]}
+        src, dst = condensation.dag.edge_arrays()
+        assert len(src) == len(expected)
+        assert set(zip(src.tolist(), dst.tolist())) == expected
+        assert np.all(src < dst)  # the topological order is the numbering
+        rebuilt = CSRGraph.CreateFromEdgeArrays(np.arange(len(condensation)), src, dst)
+        assert condensation.dag == rebuilt
+        assert np.array_equal(condensation.dag.reverse_indices, rebuilt.reverse_indices)
+        assert condensation.weights.tolist() == condensation.components.sizes.tolist()
+        for c in condensation.sources().tolist():
+            assert all(component[p] == c for i in graph.get_nodes() if component[i] == c for p in graph.parents(i))
+
+
+def test_condensation_cache():
+    graph = DirectionalGraph()
+    graph.push_connections([0, 1, 1], [1, 0, 2])
+    condensation = graph.condensation()
+    assert graph.condensation() is condensation
+    assert len(condensation) == 2
+    assert condensation.sources().tolist() == [condensation.component_of(0)]
+    graph.push_connection(2, 0)
+    assert graph.condensation() is not condensation
+    assert len(graph.condensation()) == 1
+    assert graph.condensation().weights.tolist() == [3]
@@ -0,0 +1,77 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph, UndirectionalGraph, AgenciGraph, DenseGraph, CSRGraph, load_graph
+from RandomGraph.digraph import DiGraph
+from RandomGraph.directional_tagged_graph import DirectionalTaggedGraph
+
+
+def test_directional(tmp_path):
+    graph = DirectionalGraph.CreateRandom(200, link_density_factor=0.05, seed=1)
+    graph.save(tmp_path / "g.bin")
+    for mmap in (True, False):
+        loaded = DirectionalGraph.load(tmp_path / "g.bin", mmap=mmap)
+        assert loaded._graph == graph._graph
+        assert loaded._reverse_graph == graph._reverse_graph
+    frozen = CSRGraph.load(tmp_path / "g.bin")
+    assert isinstance(frozen.indices, np.memmap)
+    assert frozen == graph.freeze()
+
+
+def test_weighted_directional(tmp_path):
+    graph = DirectionalGraph(all_node_weights_equal_one=False, all_edge_weights_equal_one=False,
+                             edge_weights_are_symmetrical=False)
+    graph.add_node(0, 3)
+    graph.add_node(1, 4)
+    graph.push_connection(0, 1, cost=7)
+    graph.push_connection(1, 0, cost=2)
+    graph.save(tmp_path / "g.bin")
+    loaded = DirectionalGraph.load(tmp_path / "g.bin")
+    assert loaded.get_connection_weight(0, 1) == 7
+    assert loaded.get_connection_weight(1, 0) == 2
+    assert loaded.get_node_weight(1) == 4
+
+
+def test_undirectional(tmp_path):
+    graph = UndirectionalGraph.CreateRandom(200, link_density_factor=0.05, seed=2)
+    graph.save(tmp_path / "g.bin")
+    assert UndirectionalGraph.load(tmp_path / "g.bin") == graph
+    assert load_graph(tmp_path / "g.bin") == graph
+
+
+def test_agenci(tmp_path):
+    graph = AgenciGraph.CreateRandom(50, link_density_factor=0.1, seed=3)
+    graph.save(tmp_path / "g.bin")
+    loaded = load_graph(tmp_path / "g.bin", mmap=False)
+    assert isinstance(loaded, AgenciGraph)
+    assert loaded.agents == graph.agents
+    assert loaded._graph == graph._graph
+
+
+def test_tagged(tmp_path):
+    graph = DirectionalTaggedGraph()
+    graph.push_connection(0, 1, tag="solid")
+    graph.push_connection(1, 2, tag="dotted")
+    graph.push_connection(2, 3)
+    graph.save(tmp_path / "g.bin")
+    assert DirectionalTaggedGraph.load(tmp_path / "g.bin") == graph
+
+
+def test_digraph(tmp_path):
+    graph = DiGraph()
+    graph.push_connection(0, 10, cost=4)
+    graph.push_connection(1, 10, cost=5)
+    graph.push_connection(1, 11, cost=6)
+    graph.add_node(12, 1)
+    graph.save(tmp_path / "g.bin")
+    loaded = load_graph(tmp_path / "g.bin")
+    assert loaded == graph
+    assert loaded.vertex_side(12) == 1
+
+
+def test_dense(tmp_path):
+    graph = DenseGraph()
+    graph.push_connection(0, 1)
+    graph.push_connection(1, 2)
+    graph.add_node(5)
+    graph.save(tmp_path / "g.bin")
+    assert DenseGraph.load(tmp_path / "g.bin") == graph
@@ -0,0 +1,60 @@
+import numpy as np
+
+from RandomGraph import DirectionalGraph
+
+
+def test_symmetrical_pair_shares_a_slot():
+    graph = DirectionalGraph(all_edge_weights_equal_one=False, edge_weights_are_symmetrical=True)
+    graph.push_connection(0, 1, cost=5)
+    graph.push_connection(1, 0, cost=7)
+    assert graph.get_connection_weight(0, 1) == graph.get_connection_weight(1, 0) == 7
+    assert graph._edge_slots == {0: {1: 0}}
+    graph.remove_connection(0, 1)
+    assert graph.get_connection_weight(1, 0) == 7
+    graph.remove_connection(1, 0)
+    assert graph._edge_slots == {0: {}}
+    graph.push_connection(2, 3, cost=4)
+    assert graph._edge_slots[2] == {3: 0}  # the released slot is reused
+
+
+def test_matches_dictionary_model():
+    rng = np.random.default_rng(5)
+    graph = DirectionalGraph(all_node_weights_equal_one=False, all_edge_weights_equal_one=False,
+                             edge_weights_are_symmetrical=False)
+    node_weights, edge_weights = {}, {}
+    for step in range(400):
+        i, j = rng.integers(0, 30, 2).tolist()
+        action = rng.integers(0, 4)
+        if action == 0:
+            graph.push_connection(i, j, cost=step)
+            edge_weights[(i, j)] = step
+            node_weights.setdefault(i, 1)
+            node_weights.setdefault(j, 1)
+        elif action == 1:
+            graph.add_node(i, weight=step)
+            node_weights[i] = step
+        elif action == 2 and i in node_weights:
+            graph.remove_node(i)
+            del node_weights[i]
+            edge_weights = {edge: weight for edge, weight in edge_weights.items() if i not in edge}
+        elif action == 3 and (i, j) in edge_weights:
+            graph.remove_connection(i, j)
+            del edge_weights[(i, j)]
+    assert {i: graph.get_node_weight(i) for i in graph.get_nodes()} == node_weights
+    assert {(i, j): graph.get_connection_weight(i, j) for i in graph.get_nodes()
+            for j in graph.get_children(i)} == edge_weights
+    reversed_graph = graph.reversed_graph
+    assert all(reversed_graph.get_connection_weight(j, i) == weight for (i, j), weight in edge_weights.items())
+
+    frozen = graph.freeze()
+    assert frozen.thaw() == graph
+    assert dict(zip(frozen.nodes.tolist(), frozen.node_weights.tolist())) == node_weights
+
+
+def test_unweighted_flag():
+    graph = DirectionalGraph(all_edge_weights_equal_one=False)
+    graph.push_connections([0, 1], [1, 2], costs=[1, 1])
+    assert not graph.all_edge_weights_must_be_one
+    graph.push_connection(2, 3, cost=4)
+    assert graph.get_connection_weight(2, 3) == 4
+    assert graph.get_node_weight(3) == 1